@@ -0,0 +1,38 @@
+"""Add full-text search vector to records
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Primary keys rank above data fields; provenance metadata is not searchable.
+    op.execute(
+        """
+        ALTER TABLE records ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('german'::regconfig, coalesce(primary_key, '')), 'A')
+            || setweight(
+                jsonb_to_tsvector('german'::regconfig, data_json - '_source', '["string", "numeric"]'),
+                'B'
+            )
+        ) STORED
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_records_search_vector_approved "
+        "ON records USING gin (search_vector) WHERE status = 'approved'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_records_search_vector_approved")
+    op.execute("ALTER TABLE records DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,42 @@
+"""Add trigram indexes for fuzzy record lookup
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_records_primary_key_trgm_approved "
+        "ON records USING gin (lower(primary_key) gin_trgm_ops) WHERE status = 'approved'"
+    )
+    # Must stay identical to FUZZY_LOOKUP_EXPRESSION in app/services/knowledge_search.py,
+    # otherwise the planner cannot use the index.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_records_lookup_values_trgm_approved
+        ON records USING gin (
+            lower(
+                coalesce(data_json ->> 'artnr', '') || ' ' ||
+                coalesce(data_json ->> 'product_id', '') || ' ' ||
+                coalesce(data_json ->> 'title', '') || ' ' ||
+                coalesce(data_json ->> 'name', '')
+            ) gin_trgm_ops
+        )
+        WHERE status = 'approved'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_records_lookup_values_trgm_approved")
+    op.execute("DROP INDEX IF EXISTS ix_records_primary_key_trgm_approved")
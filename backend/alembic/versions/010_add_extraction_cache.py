@@ -0,0 +1,54 @@
+"""Add extraction result cache
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extraction_cache",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("schema_type", sa.String(100), nullable=False),
+        sa.Column("doc_type", sa.String(100), nullable=False),
+        sa.Column("model", sa.String(255), nullable=False),
+        sa.Column("prompt_version", sa.String(50), nullable=False),
+        sa.Column("result_json", postgresql.JSONB(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_extraction_cache_last_used_at", "extraction_cache", ["last_used_at"])
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'jokari_backend') THEN
+                DROP POLICY IF EXISTS extraction_cache_jokari_backend_all ON public.extraction_cache;
+                CREATE POLICY extraction_cache_jokari_backend_all
+                ON public.extraction_cache
+                FOR ALL
+                TO jokari_backend
+                USING (true)
+                WITH CHECK (true);
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP POLICY IF EXISTS extraction_cache_jokari_backend_all ON public.extraction_cache;")
+    op.drop_index("ix_extraction_cache_last_used_at", table_name="extraction_cache")
+    op.drop_table("extraction_cache")
@@ -0,0 +1,21 @@
+"""Add record extraction model
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "011"
+down_revision = "010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE records ADD COLUMN IF NOT EXISTS extraction_model VARCHAR(255)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE records DROP COLUMN IF EXISTS extraction_model")
@@ -0,0 +1,61 @@
+"""Add extraction checkpoints and document parse hash
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "012"
+down_revision = "011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE documents ADD COLUMN IF NOT EXISTS parse_hash VARCHAR(64)")
+    op.create_table(
+        "extraction_checkpoints",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "document_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("parse_hash", sa.String(64), nullable=False),
+        sa.Column("unit_key", sa.String(64), nullable=False),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+        sa.Column("candidates_json", postgresql.JSONB(), nullable=False),
+        sa.Column("usage_json", postgresql.JSONB(), nullable=True),
+        sa.Column("model", sa.String(255), nullable=True),
+        sa.Column("used_stub", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint("document_id", "parse_hash", "unit_key", name="uq_extraction_checkpoints_unit"),
+    )
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'jokari_backend') THEN
+                DROP POLICY IF EXISTS extraction_checkpoints_jokari_backend_all ON public.extraction_checkpoints;
+                CREATE POLICY extraction_checkpoints_jokari_backend_all
+                ON public.extraction_checkpoints
+                FOR ALL
+                TO jokari_backend
+                USING (true)
+                WITH CHECK (true);
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP POLICY IF EXISTS extraction_checkpoints_jokari_backend_all ON public.extraction_checkpoints;")
+    op.drop_table("extraction_checkpoints")
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS parse_hash")
@@ -0,0 +1,23 @@
+"""Add pipeline metrics to documents and jobs
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE documents ADD COLUMN IF NOT EXISTS metrics_json JSONB")
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS metrics_json JSONB")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS metrics_json")
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS metrics_json")
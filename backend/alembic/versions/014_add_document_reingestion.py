@@ -0,0 +1,28 @@
+"""Add document version link and section hashes for re-ingestion
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "014"
+down_revision = "013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS previous_document_id UUID "
+        "REFERENCES documents(id) ON DELETE SET NULL"
+    )
+    op.execute("ALTER TABLE documents ADD COLUMN IF NOT EXISTS section_hashes_json JSONB")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_documents_previous_document_id ON documents (previous_document_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_documents_previous_document_id")
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS section_hashes_json")
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS previous_document_id")
@@ -161,3 +161,11 @@ async def get_recent_activity(
             for log in logs
         ]
     }
+
+
+@router.get("/llm-gateway")
+async def get_llm_gateway_metrics():
+    """Get rate-limit, queue-wait and throttling metrics of this process's LLM gateway."""
+    from app.extractors.llm_gateway import get_llm_gateway
+
+    return get_llm_gateway().metrics()
@@ -4,16 +4,18 @@ from sqlalchemy import func
 from uuid import UUID
 from typing import Optional
 from app.database import get_db
-from app.models.document import Document, Department, DocumentStatus
+from app.models.document import Document, Department, DocType, DocumentStatus
 from app.models.audit_log import AuditLog
 from app.models.chunk import Chunk
-from app.models.record import Record
+from app.models.record import Record, RecordStatus
 from app.auth import AuthenticatedUser, require_admin, user_identifier
 from app.schemas.document import (
     DocumentResponse,
     DocumentListResponse,
     DocumentStatusResponse
 )
+from app.services.pipeline_metrics import summarize_pipeline_metrics
+from app.services.search_index import remove_records
 
 router = APIRouter()
 
@@ -49,6 +51,21 @@ async def list_documents(
     )
 
 
+@router.get("/metrics")
+async def get_pipeline_metrics(
+    doc_type: Optional[DocType] = None,
+    limit: int = Query(default=500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Get p50/p90/p95 of ingestion stage timings and token usage per doc type over the latest documents."""
+    query = db.query(Document.doc_type, Document.metrics_json).filter(Document.metrics_json.isnot(None))
+    if doc_type:
+        query = query.filter(Document.doc_type == doc_type)
+    rows = query.order_by(Document.uploaded_at.desc()).limit(limit).all()
+
+    return summarize_pipeline_metrics([(row.doc_type.value, row.metrics_json) for row in rows])
+
+
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: UUID,
@@ -157,7 +174,12 @@ async def delete_document(
     db: Session = Depends(get_db),
     current_user: AuthenticatedUser = Depends(require_admin),
 ):
-    """Delete a document and all associated data."""
+    """
+    Delete a document and all associated data.
+
+    This includes records carried forward from a previous version when the
+    document was re-ingested; they belong to the newest version.
+    """
     document = db.query(Document).filter(Document.id == document_id).first()
     if not document:
         raise HTTPException(status_code=404, detail="Dokument nicht gefunden")
@@ -179,8 +201,18 @@ async def delete_document(
     )
     db.add(audit)
 
+    # Approved records are searchable; search must forget them once they are deleted.
+    approved_record_ids = [
+        row.id
+        for row in db.query(Record.id).filter(
+            Record.document_id == document_id,
+            Record.status == RecordStatus.APPROVED,
+        )
+    ]
+
     # Delete from database (cascades to chunks, records, etc.)
     db.delete(document)
     db.commit()
+    remove_records(approved_record_ids)
 
     return {"message": "Dokument gelöscht", "document_id": str(document_id)}
@@ -6,14 +6,14 @@ from datetime import datetime
 from app.database import get_db
 from app.models.document import Department
 from app.models.record import Record, RecordStatus
-from app.models.evidence import Evidence
 from app.models.proposed_update import ProposedUpdate, UpdateStatus
 from app.models.audit_log import AuditLog
 from app.models.attachment import RecordAttachment
 from app.schemas.record import RecordResponse, RecordListResponse, RecordUpdate, EvidenceResponse
 from app.schemas.review import ReviewAction, ProposedUpdateResponse
 from app.auth import AuthenticatedUser, get_current_user, user_identifier
-from app.services.source_metadata import attach_source_metadata
+from app.services.search_index import sync_approved_records
+from app.services.record_hydration import hydrate_records
 
 router = APIRouter()
 
@@ -58,7 +58,7 @@ async def list_review_queue(
     # Paginate
     offset = (page - 1) * limit
     records = query.offset(offset).limit(limit).all()
-    attach_source_metadata(db, records)
+    hydrate_records(db, records, evidence=True, attachments=True)
 
     return RecordListResponse(
         records=[RecordResponse.model_validate(r) for r in records],
@@ -74,25 +74,10 @@ async def get_record(
     db: Session = Depends(get_db)
 ):
     """Get a single record with evidence and attachments."""
-    from app.services.storage import get_storage_service
-
     record = db.query(Record).filter(Record.id == record_id).first()
     if not record:
         raise HTTPException(status_code=404, detail="Record nicht gefunden")
-    attach_source_metadata(db, [record])
-
-    # Load evidence
-    evidence = db.query(Evidence).filter(Evidence.record_id == record_id).all()
-    record.evidence_items = evidence
-
-    # Load attachments with URLs
-    attachments = db.query(RecordAttachment).filter(RecordAttachment.record_id == record_id).all()
-    storage = get_storage_service()
-
-    # Add URL to each attachment
-    for att in attachments:
-        att.url = storage.get_file_url(att.file_path)
-    record.attachments = attachments
+    hydrate_records(db, [record], evidence=True, attachments=True, attachment_urls=True)
 
     return RecordResponse.model_validate(record)
 
@@ -125,6 +110,7 @@ async def approve_record(
     )
     db.add(audit)
     db.commit()
+    sync_approved_records([record])
 
     return {"message": "Record genehmigt", "record_id": str(record_id)}
 
@@ -154,6 +140,7 @@ async def reject_record(
     )
     db.add(audit)
     db.commit()
+    sync_approved_records([record])
 
     return {"message": "Record abgelehnt", "record_id": str(record_id)}
 
@@ -206,6 +193,7 @@ async def update_record(
     )
     db.add(audit)
     db.commit()
+    sync_approved_records([record])
 
     return {"message": "Record aktualisiert", "record_id": str(record_id)}
 
@@ -1,13 +1,16 @@
+import time
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.database import get_db
 from app.models.document import Department
 from app.models.record import Record, RecordStatus
-from app.models.evidence import Evidence
-from app.schemas.search import SearchResponse, SearchResult
+from app.schemas.search import SearchResponse, SearchResult, SuggestResponse, SuggestResult
 from app.schemas.record import EvidenceResponse
-from app.services.source_metadata import attach_source_metadata
+from app.services.knowledge_search import search_records
+from app.services.record_hydration import hydrate_records
+from app.services.search_cache import get_search_cache, search_cache_key
+from app.services.suggest_index import get_suggest_index
 
 router = APIRouter()
 
@@ -18,94 +21,106 @@ async def search_knowledge(
     department: Optional[Department] = None,
     schema_type: Optional[str] = Query(default=None, alias="schema"),
     limit: int = Query(default=10, ge=1, le=100),
+    mode: str = Query(default="lexical", regex="^(lexical|semantic|hybrid|fuzzy)$"),
+    min_similarity: Optional[float] = Query(default=None, ge=0.0, le=1.0),
     db: Session = Depends(get_db)
 ):
     """
     Search approved knowledge records.
 
     This endpoint is designed for AI agents to query structured knowledge.
-    Only APPROVED records are returned.
+    Only APPROVED records are returned. `mode=semantic` ranks records by
+    embedding similarity of their evidence chunks instead of keyword matches;
+    `mode=hybrid` fuses both rankings so exact article numbers and fuzzy
+    questions are answered in one call. `mode=fuzzy` tolerates typos in
+    article numbers and product names and returns trigram near-matches with
+    similarity >= `min_similarity`. Repeated queries are answered from a
+    result cache that is invalidated by every review action touching
+    approved records.
     """
-    # Build base query - ONLY approved records
-    query = db.query(Record).filter(Record.status == RecordStatus.APPROVED)
-
-    if department:
-        query = query.filter(Record.department == department)
-    if schema_type:
-        query = query.filter(Record.schema_type == schema_type)
-
-    # Simple text search in data_json
-    # In production, this should use full-text search or vector similarity
-    search_term = q.lower()
-
-    # Get all matching records
-    all_records = query.all()
-
-    # Score and filter by relevance
-    scored_results = []
-    for record in all_records:
-        score = _calculate_relevance(record, search_term)
-        if score > 0:
-            # Load evidence
-            evidence = db.query(Evidence).filter(Evidence.record_id == record.id).all()
-
-            scored_results.append({
-                "record": record,
-                "evidence": evidence,
-                "score": score
-            })
-
-    # Sort by score and limit
-    scored_results.sort(key=lambda x: x["score"], reverse=True)
-    scored_results = scored_results[:limit]
+    started = time.perf_counter()
+    department_value = department.value if department else None
+    cache = get_search_cache()
+    cache_key = search_cache_key(q, department_value, schema_type, limit, mode, min_similarity)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        return cached.model_copy(update={"query": q, "timings_ms": {"cache": elapsed_ms}})
+    generation = cache.generation
+
+    # Backends only rank APPROVED records; the hydration query re-checks the
+    # status so a record rejected in another process is never returned.
+    hits, timings = await search_records(
+        db,
+        q,
+        mode=mode,
+        department=department_value,
+        schema_type=schema_type,
+        limit=limit,
+        min_similarity=min_similarity,
+    )
 
-    attach_source_metadata(db, [item["record"] for item in scored_results])
+    records_by_id = {}
+    if hits:
+        records = db.query(Record).filter(
+            Record.id.in_([record_id for record_id, _ in hits]),
+            Record.status == RecordStatus.APPROVED,
+        ).all()
+        records_by_id = {record.id: record for record in records}
+
+    scored_results = [
+        (records_by_id[record_id], score)
+        for record_id, score in hits
+        if record_id in records_by_id
+    ]
+    hydrate_records(db, [record for record, _ in scored_results], evidence=True)
 
     # Build response
     results = []
-    for item in scored_results:
-        record = item["record"]
+    for record, score in scored_results:
         results.append(SearchResult(
             record_id=record.id,
             department=record.department,
             schema_type=record.schema_type,
             primary_key=record.primary_key,
             data_json=record.data_json,
-            evidence=[EvidenceResponse.model_validate(e) for e in item["evidence"]],
-            relevance_score=item["score"],
+            evidence=[EvidenceResponse.model_validate(e) for e in record.evidence_items],
+            relevance_score=score,
             source_metadata=getattr(record, "source_metadata", None),
         ))
 
-    return SearchResponse(
+    response = SearchResponse(
         results=results,
         total=len(results),
-        query=q
+        query=q,
+        mode=mode,
+        timings_ms=timings,
     )
+    cache.put(cache_key, response, generation)
+    return response
 
 
-def _calculate_relevance(record: Record, search_term: str) -> float:
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest_knowledge(
+    prefix: str = Query(..., min_length=1, description="Eingegebener Anfang"),
+    department: Optional[Department] = None,
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
     """
-    Calculate relevance score for a record.
+    Autocomplete primary keys, titles, names and article numbers of approved records.
 
-    Simple implementation - in production use vector similarity.
+    Served from an in-memory prefix index without touching the database once
+    it is loaded; meant to be called on every keystroke.
     """
-    score = 0.0
-    data_str = str(record.data_json).lower()
-
-    # Check primary key
-    if search_term in record.primary_key.lower():
-        score += 2.0
-
-    # Check data fields
-    if search_term in data_str:
-        # Count occurrences
-        occurrences = data_str.count(search_term)
-        score += min(occurrences * 0.5, 3.0)  # Cap at 3.0
+    index = get_suggest_index()
+    index.ensure_loaded(db)
+    suggestions = index.suggest(prefix, department=department.value if department else None, limit=limit)
 
-    # Boost by completeness
-    score *= (0.5 + record.completeness_score * 0.5)
-
-    return round(score, 2)
+    return SuggestResponse(
+        suggestions=[SuggestResult.model_validate(suggestion) for suggestion in suggestions],
+        prefix=prefix,
+    )
 
 
 @router.get("/{record_id}")
@@ -119,8 +134,6 @@ async def get_knowledge_record(
     Only APPROVED records are returned.
     """
     from uuid import UUID
-    from app.models.attachment import RecordAttachment
-    from app.services.storage import get_storage_service
 
     try:
         rid = UUID(record_id)
@@ -136,22 +149,16 @@ async def get_knowledge_record(
     if not record:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Record nicht gefunden oder nicht genehmigt")
-    attach_source_metadata(db, [record])
-
-    # Load evidence
-    evidence = db.query(Evidence).filter(Evidence.record_id == rid).all()
+    hydrate_records(db, [record], evidence=True, attachments=True, attachment_urls=True)
 
-    # Load attachments with URLs
-    attachments = db.query(RecordAttachment).filter(RecordAttachment.record_id == rid).all()
-    storage = get_storage_service()
     attachment_list = []
-    for att in attachments:
+    for att in record.attachments:
         attachment_list.append({
             "id": str(att.id),
             "filename": att.filename,
             "file_type": att.file_type,
             "file_size": att.file_size,
-            "url": storage.get_file_url(att.file_path),
+            "url": att.url,
             "source_url": att.source_url,
             "content_hash": att.content_hash,
         })
@@ -166,7 +173,7 @@ async def get_knowledge_record(
         "version": record.version,
         "created_at": record.created_at.isoformat() if record.created_at else None,
         "updated_at": record.updated_at.isoformat() if record.updated_at else None,
-        "evidence": [EvidenceResponse.model_validate(e) for e in evidence],
+        "evidence": [EvidenceResponse.model_validate(e) for e in record.evidence_items],
         "attachments": attachment_list,
         "source_metadata": getattr(record, "source_metadata", None),
     }
@@ -1,9 +1,10 @@
+import asyncio
 import traceback
 
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from app.database import get_db, SessionLocal
 from app.models.document import Document, Department, DocType, Confidentiality, DocumentStatus
@@ -18,11 +19,17 @@ router = APIRouter()
 
 
 def process_document_background(document_id: str):
-    """Background task to process a document."""
+    """
+    Background task to process a document.
+
+    FastAPI runs sync tasks in its threadpool. The async pipeline gets its own
+    event loop there, so stub extraction, triage and aggregation never block
+    the server's loop.
+    """
     db = SessionLocal()
     try:
         service = IngestionService(db)
-        service.process_document(UUID(document_id))
+        asyncio.run(service.process_document_async(UUID(document_id)))
     except Exception as e:
         print(f"Error processing document {document_id}: {e}")
         traceback.print_exc()
@@ -39,6 +46,7 @@ async def upload_documents(
     version_date: datetime = Form(...),
     owner: str = Form(...),
     confidentiality: Confidentiality = Form(default=Confidentiality.INTERNAL),
+    previous_document_id: Optional[UUID] = Form(default=None),
     db: Session = Depends(get_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ):
@@ -46,6 +54,11 @@ async def upload_documents(
     Upload multiple documents for processing.
 
     Returns list of created document IDs and their processing job IDs.
+
+    An upload linked to a previous version, explicitly or by matching
+    filename, is re-ingested incrementally: only added and changed sections
+    are extracted. Records of unchanged sections, approved ones included,
+    move to the new document and are deleted together with it.
     """
     # Validate department/doc_type combination
     registry = get_schema_registry()
@@ -55,6 +68,15 @@ async def upload_documents(
             detail=f"Dokumenttyp '{doc_type}' ist nicht gültig für Abteilung '{department}'"
         )
 
+    if previous_document_id is not None:
+        if len(files) != 1:
+            raise HTTPException(
+                status_code=400,
+                detail="Eine Vorgängerversion kann nur für eine einzelne Datei angegeben werden"
+            )
+        if not db.query(Document.id).filter(Document.id == previous_document_id).first():
+            raise HTTPException(status_code=404, detail="Vorgängerdokument nicht gefunden")
+
     storage = get_storage_service()
     settings = get_settings()
     results = []
@@ -82,6 +104,11 @@ async def upload_documents(
                 file.content_type
             )
 
+            previous_id = previous_document_id
+            if previous_id is None and settings.incremental_reingestion_enabled:
+                previous = _find_previous_version(db, file.filename, department, doc_type)
+                previous_id = previous.id if previous else None
+
             # Create document record
             document = Document(
                 filename=file.filename,
@@ -91,7 +118,8 @@ async def upload_documents(
                 owner=owner,
                 confidentiality=confidentiality,
                 status=DocumentStatus.UPLOADING,
-                file_path=file_path
+                file_path=file_path,
+                previous_document_id=previous_id,
             )
             db.add(document)
             db.commit()
@@ -107,6 +135,7 @@ async def upload_documents(
                     "department": department.value,
                     "filename": file.filename,
                     "owner": owner,
+                    "previous_document_id": str(previous_id) if previous_id else None,
                 }
             )
             db.add(audit)
@@ -118,7 +147,8 @@ async def upload_documents(
             results.append({
                 "document_id": str(document.id),
                 "filename": file.filename,
-                "status": "processing"
+                "status": "processing",
+                "previous_document_id": str(previous_id) if previous_id else None,
             })
 
         except Exception as e:
@@ -134,6 +164,21 @@ async def upload_documents(
     }
 
 
+def _find_previous_version(
+    db: Session,
+    filename: str,
+    department: Department,
+    doc_type: DocType,
+) -> Document | None:
+    """Latest successfully ingested document with the same filename, department and doc type."""
+    return db.query(Document).filter(
+        Document.filename == filename,
+        Document.department == department,
+        Document.doc_type == doc_type,
+        Document.status.in_([DocumentStatus.PENDING_REVIEW, DocumentStatus.COMPLETED]),
+    ).order_by(Document.uploaded_at.desc()).first()
+
+
 @router.get("/doc-types")
 async def get_doc_types():
     """Get available document types grouped by department."""
@@ -14,9 +14,27 @@ class Settings(BaseSettings):
     # LLM
     anthropic_api_key: str = ""
     anthropic_model: str = "claude-sonnet-4-6"
+    anthropic_fast_model: str = "claude-haiku-4-5"  # empty disables tiered routing
+    llm_fast_model_doc_types: str = "faq,product_spec,compatibility_matrix,safety_notes"
+    llm_escalation_min_confidence: float = 0.7
+    llm_fast_model_max_unit_tokens: int = 1500
     llm_provider: str = "stub"  # stub | claude
-    llm_timeout_seconds: float = 120.0
+    llm_timeout_seconds: float = 120.0  # per API call; rate-limit waits and backoff excluded
+    llm_requests_per_minute: int = 50  # per process, 0 disables the limit
+    llm_tokens_per_minute: int = 40000  # per process, 0 disables the limit
+    llm_max_retries: int = 4
+    llm_backoff_base_seconds: float = 1.0
+    llm_backoff_max_seconds: float = 60.0
     llm_extraction_concurrency: int = 3
+    ingestion_worker_concurrency: int = 1  # documents in flight per worker process
+    ingestion_streaming_enabled: bool = True  # parse, chunk and extract PDFs window by window
+    ingestion_stream_window_chunks: int = 64
+    ingestion_stream_windows_in_flight: int = 2
+    extraction_cache_enabled: bool = True
+    extraction_cache_max_entries: int = 50000
+    extraction_cache_max_age_days: int = 90
+    extraction_checkpoints_enabled: bool = True  # retries resume after the last completed unit
+    incremental_reingestion_enabled: bool = True  # link re-uploads by filename, extract changed sections only; unchanged records move to the re-upload
     claude_multi_record_confidence: float = 0.85
     claude_partial_record_confidence: float = 0.5
     claude_single_record_confidence: float = 0.9
@@ -28,15 +46,43 @@ class Settings(BaseSettings):
     stub_single_valid_confidence: float = 0.6
     stub_single_invalid_confidence: float = 0.3
 
+    # Embeddings
+    embedding_provider: str = "hashing"  # hashing | http
+    embedding_dimensions: int = 1536
+    embedding_api_url: str = ""
+    embedding_api_key: str = ""
+    embedding_model: str = ""
+    embedding_batch_size: int = 128
+    embedding_timeout_seconds: float = 30.0
+
     # Parsing and chunking
     docx_fallback_confidence: float = 0.7
     pdf_parser_confidence: float = 0.7
     extraction_grouping_min_chunks: int = 12
+    extraction_triage_enabled: bool = True  # skip TOC/media units, handle key-value units heuristically
+    extraction_unit_token_budget: int = 2000  # 0 disables packing of small units
+    extraction_unit_token_budgets: str = ""  # per schema, e.g. "ProductSpec:1500,FAQ:3000"
     record_confidence_needs_review_threshold: float = 0.5
     sales_doc_type_mismatch_section_threshold: int = 3
     sales_doc_type_mismatch_filename_markers: str = "vertriebsschulung,schulung,training"
     stale_processing_minutes: int = 20
 
+    # Search
+    search_backend: str = "index"  # index | postgres
+    search_text_config: str = "german"
+    semantic_search_candidate_chunks: int = 100
+    semantic_search_ef_search: int = 40
+    semantic_search_ivfflat_probes: int = 10
+    hybrid_search_lexical_depth: int = 50
+    hybrid_search_semantic_depth: int = 50
+    hybrid_search_rrf_k: int = 60
+    fuzzy_search_min_similarity: float = 0.3
+    search_index_max_age_seconds: int = 300
+    search_bm25_k1: float = 1.2
+    search_bm25_b: float = 0.75
+    search_cache_max_entries: int = 1024  # 0 disables the result cache
+    search_cache_ttl_seconds: int = 60
+
     # Upload
     allowed_upload_extensions: str = ".docx,.md,.markdown,.csv,.xlsx,.xls,.pdf"
 
@@ -67,6 +113,26 @@ class Settings(BaseSettings):
             if extension.strip()
         ]
 
+    @property
+    def llm_fast_model_doc_types_list(self) -> list[str]:
+        return [
+            doc_type.strip().lower()
+            for doc_type in self.llm_fast_model_doc_types.split(",")
+            if doc_type.strip()
+        ]
+
+    @property
+    def extraction_unit_token_budgets_map(self) -> dict[str, int]:
+        budgets = {}
+        for item in self.extraction_unit_token_budgets.split(","):
+            schema_type, _, budget = item.partition(":")
+            if schema_type.strip() and budget.strip():
+                budgets[schema_type.strip()] = int(budget)
+        return budgets
+
+    def extraction_unit_token_budget_for(self, schema_type: str) -> int:
+        return self.extraction_unit_token_budgets_map.get(schema_type, self.extraction_unit_token_budget)
+
     @property
     def sales_doc_type_mismatch_filename_markers_list(self) -> list[str]:
         return [
@@ -6,6 +6,7 @@ from app.extractors.base import (
 )
 from app.extractors.stub import LocalStubExtractor
 from app.extractors.claude import ClaudeExtractor
+from app.extractors.routing import RoutingExtractor
 from app.extractors.factory import get_extractor
 
 __all__ = [
@@ -15,5 +16,6 @@ __all__ = [
     "EvidencePointer",
     "LocalStubExtractor",
     "ClaudeExtractor",
+    "RoutingExtractor",
     "get_extractor"
 ]
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Type, Any, Optional
 from pydantic import BaseModel
 
@@ -48,11 +49,26 @@ class ExtractionResult:
     confidence: float = 0.0
     needs_review: bool = False
     raw_response: Optional[str] = None
+    # Model that produced the result; None for heuristic extraction.
+    model: Optional[str] = None
+    # Token usage of the LLM calls behind this result, e.g. `input_tokens`,
+    # `output_tokens`, `cache_read_input_tokens`, `cache_creation_input_tokens`.
+    usage: dict[str, int] = field(default_factory=dict)
 
 
 class LLMExtractor(ABC):
     """Abstract base class for LLM-based extraction."""
 
+    # Extractors that set both values get their results cached by
+    # content hash (see app/services/extraction_cache.py). Bump
+    # `prompt_version` whenever prompts or result parsing change.
+    prompt_version: Optional[str] = None
+    model: Optional[str] = None
+    # Extractors that time out each API call themselves (via the LLM gateway)
+    # are not timed out as a whole by ingestion, so rate-limit queueing and
+    # retry backoff do not count against `llm_timeout_seconds`.
+    enforces_call_timeout: bool = False
+
     @abstractmethod
     async def extract(
         self,
@@ -95,18 +111,24 @@ class LLMExtractor(ABC):
 
     def _get_schema_description(self, schema: Type[BaseModel]) -> str:
         """Generate a description of the schema for the LLM."""
-        lines = [f"Schema: {schema.__name__}"]
+        return describe_schema(schema)
+
+
+@lru_cache(maxsize=None)
+def describe_schema(schema: Type[BaseModel]) -> str:
+    """Schema description for prompts; schema classes are static, so it is built once per class."""
+    lines = [f"Schema: {schema.__name__}"]
 
-        if schema.__doc__:
-            lines.append(f"Description: {schema.__doc__}")
+    if schema.__doc__:
+        lines.append(f"Description: {schema.__doc__}")
 
-        lines.append("\nFields:")
-        for field_name, field_info in schema.model_fields.items():
-            field_type = str(field_info.annotation)
-            required = field_info.is_required()
-            description = field_info.description or ""
+    lines.append("\nFields:")
+    for field_name, field_info in schema.model_fields.items():
+        field_type = str(field_info.annotation)
+        required = field_info.is_required()
+        description = field_info.description or ""
 
-            req_str = "required" if required else "optional"
-            lines.append(f"  - {field_name} ({field_type}, {req_str}): {description}")
+        req_str = "required" if required else "optional"
+        lines.append(f"  - {field_name} ({field_type}, {req_str}): {description}")
 
-        return "\n".join(lines)
+    return "\n".join(lines)
@@ -1,6 +1,8 @@
 from __future__ import annotations
+import asyncio
 import json
 import re
+from functools import lru_cache
 from typing import Type, Optional, List
 from pydantic import BaseModel
 import anthropic
@@ -9,9 +11,84 @@ from app.extractors.base import (
     ExtractionContext,
     ExtractionResult,
     ExtractedRecord,
-    EvidencePointer
+    EvidencePointer,
+    describe_schema
 )
 from app.config import get_settings
+from app.extractors.llm_gateway import get_llm_gateway
+
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+# Minimum prompt length (tokens) Anthropic caches, by model-name substring; a
+# shorter prefix marked with `cache_control` is processed uncached at full
+# price. Values as documented for prompt caching; the first match wins.
+PROMPT_CACHE_MIN_TOKENS = (
+    ("haiku-4-5", 4096),
+    ("opus-4-5", 4096),
+    ("haiku", 2048),
+)
+DEFAULT_PROMPT_CACHE_MIN_TOKENS = 1024
+
+
+def prompt_cache_min_tokens(model: str) -> int:
+    for marker, min_tokens in PROMPT_CACHE_MIN_TOKENS:
+        if marker in model:
+            return min_tokens
+    return DEFAULT_PROMPT_CACHE_MIN_TOKENS
+
+
+def is_cacheable_prefix(prefix: str, model: str) -> bool:
+    # German prose and JSON schema text run at roughly three characters per token.
+    return len(prefix) // 3 >= prompt_cache_min_tokens(model)
+
+
+@lru_cache(maxsize=None)
+def schema_json(schema: Type[BaseModel]) -> str:
+    return json.dumps(schema.model_json_schema(), ensure_ascii=False, indent=2)
+
+
+@lru_cache(maxsize=None)
+def _static_system_prompt(schema: Type[BaseModel], doc_type_instructions: str) -> str:
+    return f"""Du bist ein präziser Daten-Extraktions-Assistent für die Jokari Knowledge Hub Plattform.
+
+Deine Aufgabe ist es, strukturierte Informationen aus Dokumenten zu extrahieren.
+
+SCHEMA ZU EXTRAHIEREN:
+{describe_schema(schema)}
+
+JSON SCHEMA:
+{schema_json(schema)}
+
+FACHLICHE AUSRICHTUNG:
+{doc_type_instructions}
+
+WICHTIGE REGELN:
+1. Extrahiere NUR Informationen, die explizit im Text vorhanden sind
+2. Erfinde KEINE Daten - wenn eine Information fehlt, lasse das Feld leer oder null
+3. Zitiere relevante Textpassagen als Beleg (evidence)
+4. Antworte NUR mit validem JSON im angegebenen Format
+5. Bei Listen: Extrahiere alle relevanten Einträge
+6. Bei fehlenden Pflichtfeldern: Setze sie auf leere Strings oder leere Listen
+7. Wenn dir nur ein Chunk eines groesseren Dokuments vorliegt, extrahiere nur Entitaeten, die in diesem Chunk fachlich ausreichend belegt sind
+8. Erzeuge KEINE Records fuer Inhaltsverzeichnisse, Trennerseiten, reine Bildplatzhalter oder leere Abschnittstitel
+9. Lege bei Multi-Record-Dokumenten pro fachlich klar abgegrenztem Abschnitt genau einen eigenen Record an
+
+AUSGABEFORMAT:
+Wenn das Dokument MEHRERE Entitäten enthält (z.B. mehrere Produkte, FAQs etc.):
+Antworte mit einem JSON-Objekt mit Schlüssel "records" - einer Liste von Objekten, jedes mit "data" und "evidence".
+
+Wenn das Dokument EINE einzelne Entität enthält:
+Antworte mit einem JSON-Objekt mit:
+- "data": Die extrahierten Daten gemäß Schema
+- "evidence": Eine Liste von Objekten mit "field" und "excerpt" für jeden belegten Wert
+"""
 
 
 class ClaudeExtractor(LLMExtractor):
@@ -20,11 +97,15 @@ class ClaudeExtractor(LLMExtractor):
     Uses Anthropic API for structured extraction.
     """
 
-    def __init__(self):
+    prompt_version = "3"
+    enforces_call_timeout = True
+
+    def __init__(self, model: Optional[str] = None):
         settings = get_settings()
         self.settings = settings
-        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
-        self.model = settings.anthropic_model or "claude-sonnet-4-6"
+        self.gateway = get_llm_gateway()
+        self.model = model or settings.anthropic_model or "claude-sonnet-4-6"
+        # Attempts for unparseable or invalid answers; API errors are retried by the gateway.
         self.max_retries = 2
 
     async def extract(
@@ -35,18 +116,16 @@ class ClaudeExtractor(LLMExtractor):
     ) -> ExtractionResult:
         """Extract structured data using Claude."""
 
-        schema_description = self._get_schema_description(schema)
-        json_schema = schema.model_json_schema()
-
-        system_prompt = self._build_system_prompt(schema_description, json_schema, context)
+        system_prompt = self._build_system_prompt(schema, context)
         user_prompt = self._build_user_prompt(text, context)
 
         errors = []
         last_response = None
+        usage: dict[str, int] = {}
 
         for attempt in range(self.max_retries + 1):
             try:
-                response = await self.client.messages.create(
+                response = await self.gateway.create_message(
                     model=self.model,
                     max_tokens=4096,
                     temperature=0,
@@ -55,6 +134,7 @@ class ClaudeExtractor(LLMExtractor):
                         {"role": "user", "content": user_prompt}
                     ]
                 )
+                self._add_usage(usage, response)
 
                 last_response = self._extract_text_blocks(response)
 
@@ -95,7 +175,9 @@ class ClaudeExtractor(LLMExtractor):
                             evidence=[],
                             confidence=self.settings.claude_multi_record_confidence,
                             needs_review=False,
-                            raw_response=last_response
+                            raw_response=last_response,
+                            usage=usage,
+                            model=self.model
                         )
 
                 # Single record response
@@ -120,7 +202,9 @@ class ClaudeExtractor(LLMExtractor):
                         evidence=evidence,
                         confidence=self.settings.claude_single_record_confidence,
                         needs_review=False,
-                        raw_response=last_response
+                        raw_response=last_response,
+                        usage=usage,
+                        model=self.model
                     )
                 else:
                     errors.extend([f"Versuch {attempt + 1}: {e}" for e in validation_errors])
@@ -129,8 +213,13 @@ class ClaudeExtractor(LLMExtractor):
                     if attempt < self.max_retries:
                         user_prompt = self._build_retry_prompt(text, validation_errors, last_response)
 
+            except asyncio.TimeoutError:
+                # Ingestion handles timeouts (stub fallback or a failed unit).
+                raise
             except anthropic.APIError as e:
                 errors.append(f"Versuch {attempt + 1}: API Fehler - {str(e)}")
+                # The gateway has already backed off and retried; more attempts would add load.
+                break
             except Exception as e:
                 errors.append(f"Versuch {attempt + 1}: Fehler - {str(e)}")
 
@@ -142,15 +231,25 @@ class ClaudeExtractor(LLMExtractor):
             evidence=[],
             confidence=self.settings.claude_failure_confidence,
             needs_review=True,
-            raw_response=last_response
+            raw_response=last_response,
+            usage=usage,
+            model=self.model
         )
 
     def _build_system_prompt(
         self,
-        schema_description: str,
-        json_schema: dict,
+        schema: Type[BaseModel],
         context: ExtractionContext
-    ) -> str:
+    ) -> list[dict]:
+        """
+        System prompt as a static prefix plus per-unit context.
+
+        The prefix only depends on schema, department and doc type, so it is
+        identical for all units of a document. It is marked for prompt caching
+        only when it reaches the model's minimum cacheable length; most
+        schema prefixes (roughly 900-1700 tokens) only qualify on models with
+        a 1024-token minimum, not on Haiku.
+        """
         context_lines = [
             f"- Abteilung: {context.department}",
             f"- Dokumenttyp: {context.doc_type}",
@@ -163,44 +262,19 @@ class ClaudeExtractor(LLMExtractor):
         if context.document_version:
             context_lines.append(f"- Dokumentversion: {context.document_version}")
 
-        specific_instructions = self._build_doc_type_instructions(context)
-
-        return f"""Du bist ein präziser Daten-Extraktions-Assistent für die Jokari Knowledge Hub Plattform.
-
-Deine Aufgabe ist es, strukturierte Informationen aus Dokumenten zu extrahieren.
-
-KONTEXT:
-{chr(10).join(context_lines)}
-
-SCHEMA ZU EXTRAHIEREN:
-{schema_description}
-
-JSON SCHEMA:
-{json.dumps(json_schema, ensure_ascii=False, indent=2)}
-
-FACHLICHE AUSRICHTUNG:
-{specific_instructions}
-
-WICHTIGE REGELN:
-1. Extrahiere NUR Informationen, die explizit im Text vorhanden sind
-2. Erfinde KEINE Daten - wenn eine Information fehlt, lasse das Feld leer oder null
-3. Zitiere relevante Textpassagen als Beleg (evidence)
-4. Antworte NUR mit validem JSON im angegebenen Format
-5. Bei Listen: Extrahiere alle relevanten Einträge
-6. Bei fehlenden Pflichtfeldern: Setze sie auf leere Strings oder leere Listen
-7. Wenn dir nur ein Chunk eines groesseren Dokuments vorliegt, extrahiere nur Entitaeten, die in diesem Chunk fachlich ausreichend belegt sind
-8. Erzeuge KEINE Records fuer Inhaltsverzeichnisse, Trennerseiten, reine Bildplatzhalter oder leere Abschnittstitel
-9. Lege bei Multi-Record-Dokumenten pro fachlich klar abgegrenztem Abschnitt genau einen eigenen Record an
-
-AUSGABEFORMAT:
-Wenn das Dokument MEHRERE Entitäten enthält (z.B. mehrere Produkte, FAQs etc.):
-Antworte mit einem JSON-Objekt mit Schlüssel "records" - einer Liste von Objekten, jedes mit "data" und "evidence".
-
-Wenn das Dokument EINE einzelne Entität enthält:
-Antworte mit einem JSON-Objekt mit:
-- "data": Die extrahierten Daten gemäß Schema
-- "evidence": Eine Liste von Objekten mit "field" und "excerpt" für jeden belegten Wert
-"""
+        prefix = {"type": "text", "text": _static_system_prompt(schema, self._build_doc_type_instructions(context))}
+        if is_cacheable_prefix(prefix["text"], self.model):
+            prefix["cache_control"] = {"type": "ephemeral"}
+        return [prefix, {"type": "text", "text": f"KONTEXT:\n{chr(10).join(context_lines)}"}]
+
+    def _add_usage(self, totals: dict[str, int], response) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        for field in USAGE_FIELDS:
+            value = getattr(usage, field, None)
+            if isinstance(value, int):
+                totals[field] = totals.get(field, 0) + value
 
     def _build_doc_type_instructions(self, context: ExtractionContext) -> str:
         if context.department == "sales" and context.doc_type == "training_module":
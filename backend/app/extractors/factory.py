@@ -1,6 +1,7 @@
 from app.extractors.base import LLMExtractor
 from app.extractors.stub import LocalStubExtractor
 from app.extractors.claude import ClaudeExtractor
+from app.extractors.routing import RoutingExtractor
 from app.config import get_settings
 
 
@@ -11,6 +12,16 @@ def get_extractor() -> LLMExtractor:
     if settings.llm_provider == "claude":
         if not settings.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY nicht konfiguriert")
-        return ClaudeExtractor()
+        full = ClaudeExtractor()
+        fast_doc_types = set(settings.llm_fast_model_doc_types_list)
+        if settings.anthropic_fast_model and fast_doc_types:
+            return RoutingExtractor(
+                fast=ClaudeExtractor(model=settings.anthropic_fast_model),
+                full=full,
+                fast_doc_types=fast_doc_types,
+                min_confidence=settings.llm_escalation_min_confidence,
+                max_fast_unit_tokens=settings.llm_fast_model_max_unit_tokens,
+            )
+        return full
     else:
         return LocalStubExtractor()
@@ -0,0 +1,252 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import Optional
+
+import anthropic
+
+from app.config import get_settings
+
+
+# Transient API failures that are retried with backoff. 529 is Anthropic's
+# "overloaded" status.
+_RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+_THROTTLE_STATUS_CODES = {429, 529}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute`.
+
+    The level may drop below zero (reservations that must wait, or usage above
+    the estimate); later callers then wait until the debt is refilled.
+    Thread-safe, so one bucket can serve several event loops.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, clock=time.monotonic):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._clock = clock
+        self._level = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` and return the seconds to wait before it may be used."""
+        with self._lock:
+            self._refill()
+            # Requests larger than the bucket would never fit; they wait for a full bucket.
+            amount = min(amount, self.capacity)
+            self._level -= amount
+            if self._level >= 0:
+                return 0.0
+            return -self._level / self.rate_per_second
+
+    def adjust(self, amount: float) -> None:
+        """Correct an earlier reservation by `amount` (negative returns tokens)."""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - amount)
+
+
+class LLMGateway:
+    """
+    Process-wide entry point for Anthropic Messages API calls.
+
+    Every call first takes one request from the requests-per-minute bucket and
+    its estimated tokens from the tokens-per-minute bucket; the estimate is
+    corrected with the reported usage afterwards. 429/529 and other transient
+    errors are retried with full-jitter exponential backoff, honouring
+    `retry-after`; a throttled response pauses all callers of the process, not
+    just the one that hit the limit. `request_timeout_seconds` limits each API
+    call, not the time spent queued or backing off. Clients are shared per
+    event loop with the SDK's own retries disabled.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        requests_per_minute: int = 50,
+        tokens_per_minute: int = 40000,
+        max_retries: int = 4,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+        request_timeout_seconds: Optional[float] = None,
+    ):
+        self.api_key = api_key
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.request_timeout_seconds = request_timeout_seconds
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, anthropic.AsyncAnthropic]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._metrics = {
+            "requests": 0,
+            "retries": 0,
+            "throttled": 0,
+            "failures": 0,
+            "queue_wait_seconds": 0.0,
+            "max_queue_wait_seconds": 0.0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+        }
+
+    def client(self) -> anthropic.AsyncAnthropic:
+        # httpx connection pools are bound to the loop they were created on.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0)
+                self._clients[loop] = client
+            return client
+
+    async def create_message(self, **kwargs):
+        """
+        `messages.create` with rate limiting and retries.
+
+        Raises the last API error, or `asyncio.TimeoutError` when a single call
+        exceeds `request_timeout_seconds`.
+        """
+        estimated_tokens = self._estimate_tokens(kwargs)
+        attempt = 0
+        while True:
+            await self._acquire(estimated_tokens)
+            try:
+                response = await asyncio.wait_for(
+                    self.client().messages.create(**kwargs),
+                    timeout=self.request_timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                self._count("failures")
+                raise
+            except anthropic.APIError as exc:
+                if self.tokens is not None:
+                    # Failed calls consume no input or output tokens.
+                    self.tokens.adjust(-estimated_tokens)
+                status_code = getattr(exc, "status_code", None)
+                retryable = status_code in _RETRYABLE_STATUS_CODES or isinstance(exc, anthropic.APIConnectionError)
+                if status_code in _THROTTLE_STATUS_CODES:
+                    self._count("throttled")
+                if not retryable or attempt >= self.max_retries:
+                    self._count("failures")
+                    raise
+                delay = self._backoff_delay(attempt, exc)
+                if status_code in _THROTTLE_STATUS_CODES:
+                    self._pause(delay)
+                attempt += 1
+                self._count("retries")
+                await asyncio.sleep(delay)
+                continue
+
+            self._record_usage(response, estimated_tokens)
+            return response
+
+    def metrics(self) -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["paused_for_seconds"] = round(max(self._paused_until - time.monotonic(), 0.0), 3)
+        return metrics
+
+    async def _acquire(self, estimated_tokens: int) -> None:
+        wait_seconds = max(self._paused_until - time.monotonic(), 0.0)
+        if self.requests is not None:
+            wait_seconds = max(wait_seconds, self.requests.reserve(1))
+        if self.tokens is not None:
+            estimated_tokens = min(estimated_tokens, self.tokens.capacity)
+            wait_seconds = max(wait_seconds, self.tokens.reserve(estimated_tokens))
+
+        with self._lock:
+            self._metrics["requests"] += 1
+            self._metrics["queue_wait_seconds"] += wait_seconds
+            self._metrics["max_queue_wait_seconds"] = max(self._metrics["max_queue_wait_seconds"], wait_seconds)
+        if wait_seconds > 0:
+            try:
+                await asyncio.sleep(wait_seconds)
+            except asyncio.CancelledError:
+                # The call never starts; later callers must not wait for its reservation.
+                if self.requests is not None:
+                    self.requests.adjust(-1)
+                if self.tokens is not None:
+                    self.tokens.adjust(-estimated_tokens)
+                raise
+
+    def _backoff_delay(self, attempt: int, exc: anthropic.APIError) -> float:
+        retry_after = _retry_after_seconds(exc)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max_seconds)
+        ceiling = min(self.backoff_base_seconds * (2 ** attempt), self.backoff_max_seconds)
+        return random.uniform(0, ceiling)
+
+    def _pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _record_usage(self, response, estimated_tokens: int) -> None:
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "input_tokens", None) or 0
+        output_tokens = getattr(usage, "output_tokens", None) or 0
+        if self.tokens is not None and usage is not None:
+            self.tokens.adjust(input_tokens + output_tokens - estimated_tokens)
+        with self._lock:
+            self._metrics["input_tokens"] += input_tokens
+            self._metrics["output_tokens"] += output_tokens
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def _estimate_tokens(self, kwargs: dict) -> int:
+        """Rough upper estimate: four characters per prompt token plus `max_tokens`."""
+        characters = 0
+        system = kwargs.get("system") or ""
+        if isinstance(system, str):
+            characters += len(system)
+        else:
+            characters += sum(len(block.get("text", "")) for block in system)
+        for message in kwargs.get("messages", []):
+            content = message.get("content", "")
+            if isinstance(content, str):
+                characters += len(content)
+            else:
+                characters += sum(len(block.get("text", "")) for block in content)
+        return characters // 4 + int(kwargs.get("max_tokens", 0))
+
+
+def _retry_after_seconds(exc: anthropic.APIError) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+@lru_cache()
+def get_llm_gateway() -> LLMGateway:
+    settings = get_settings()
+    return LLMGateway(
+        api_key=settings.anthropic_api_key,
+        requests_per_minute=settings.llm_requests_per_minute,
+        tokens_per_minute=settings.llm_tokens_per_minute,
+        max_retries=settings.llm_max_retries,
+        backoff_base_seconds=settings.llm_backoff_base_seconds,
+        backoff_max_seconds=settings.llm_backoff_max_seconds,
+        request_timeout_seconds=max(float(settings.llm_timeout_seconds), 1.0),
+    )
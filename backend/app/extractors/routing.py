@@ -0,0 +1,65 @@
+from typing import Optional, Type
+
+from pydantic import BaseModel
+
+from app.extractors.base import ExtractionContext, ExtractionResult, LLMExtractor
+
+
+class RoutingExtractor(LLMExtractor):
+    """
+    Tiered extraction: a fast model first, the full model on escalation.
+
+    Units of doc types in `fast_doc_types` go to the fast extractor unless
+    they exceed `max_fast_unit_tokens`. Its result is kept when it is valid
+    and every record reaches `min_confidence`; otherwise the unit is
+    extracted again by the full extractor. Other doc types go to the full
+    extractor directly.
+    """
+
+    def __init__(
+        self,
+        fast: LLMExtractor,
+        full: LLMExtractor,
+        fast_doc_types: set[str],
+        min_confidence: float = 0.7,
+        max_fast_unit_tokens: int = 1500,
+    ):
+        self.fast = fast
+        self.full = full
+        self.fast_doc_types = fast_doc_types
+        self.min_confidence = min_confidence
+        self.max_fast_unit_tokens = max_fast_unit_tokens
+        self.prompt_version = full.prompt_version
+        self.enforces_call_timeout = all(
+            getattr(extractor, "enforces_call_timeout", False) for extractor in (fast, full)
+        )
+        # Part of the extraction cache key; results depend on both models.
+        self.model = f"{fast.model}>{full.model}"
+
+    async def extract(
+        self,
+        text: str,
+        schema: Type[BaseModel],
+        context: ExtractionContext
+    ) -> ExtractionResult:
+        if context.doc_type not in self.fast_doc_types or len(text) // 4 > self.max_fast_unit_tokens:
+            return await self.full.extract(text, schema, context)
+
+        result = await self.fast.extract(text, schema, context)
+        if not self.should_escalate(result):
+            return result
+
+        escalated = await self.full.extract(text, schema, context)
+        for field, tokens in result.usage.items():
+            escalated.usage[field] = escalated.usage.get(field, 0) + tokens
+        return escalated
+
+    def max_unit_tokens(self, doc_type: str) -> Optional[int]:
+        """Largest unit the fast model takes for `doc_type`; packing stays below it."""
+        return self.max_fast_unit_tokens if doc_type in self.fast_doc_types else None
+
+    def should_escalate(self, result: ExtractionResult) -> bool:
+        if not result.valid or not (result.records or result.data):
+            return True
+        confidences = [record.confidence for record in result.records] or [result.confidence]
+        return min(confidences) < self.min_confidence
@@ -12,6 +12,8 @@ from app.models.external_import import (
 )
 from app.models.job import Job, JobStatus, JobType
 from app.models.attachment import RecordAttachment
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.models.extraction_checkpoint import ExtractionCheckpoint
 
 __all__ = [
     "Document",
@@ -24,4 +26,6 @@ __all__ = [
     "Job",
     "JobStatus",
     "JobType",
+    "ExtractionCacheEntry",
+    "ExtractionCheckpoint",
 ]
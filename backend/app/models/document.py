@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -66,6 +66,11 @@ class Document(Base):
     status = Column(SQLEnum(DocumentStatus, values_callable=lambda x: [e.value for e in x], create_constraint=False, native_enum=False), nullable=False, default=DocumentStatus.UPLOADING)
     file_path = Column(String(1000), nullable=True)
     error_message = Column(Text, nullable=True)
+    parse_hash = Column(String(64), nullable=True)  # sha256 of the parsed content the chunks were built from
+    metrics_json = Column(JSONB, nullable=True)  # stage timings and token usage of the last ingestion run
+    # Re-ingestion: the version this upload replaces and the content hash per section path
+    previous_document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="SET NULL"), nullable=True)
+    section_hashes_json = Column(JSONB, nullable=True)
     uploaded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     # Relationships
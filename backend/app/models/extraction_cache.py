@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.database import Base
+
+
+class ExtractionCacheEntry(Base):
+    __tablename__ = "extraction_cache"
+
+    # sha256 over unit text, schema, doc type, department, prompt version and model
+    cache_key = Column(String(64), primary_key=True)
+    schema_type = Column(String(100), nullable=False)
+    doc_type = Column(String(100), nullable=False)
+    model = Column(String(255), nullable=False)
+    prompt_version = Column(String(50), nullable=False)
+    result_json = Column(JSONB, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_extraction_cache_last_used_at", "last_used_at"),
+    )
+
+    def __repr__(self):
+        return f"<ExtractionCacheEntry {self.schema_type}:{self.cache_key[:12]}>"
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.database import Base
+
+
+class ExtractionCheckpoint(Base):
+    __tablename__ = "extraction_checkpoints"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    parse_hash = Column(String(64), nullable=False)
+    # sha256 over unit position, section path, text and extractor model
+    unit_key = Column(String(64), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    candidates_json = Column(JSONB, nullable=False)
+    usage_json = Column(JSONB, nullable=True)
+    model = Column(String(255), nullable=True)
+    used_stub = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("document_id", "parse_hash", "unit_key", name="uq_extraction_checkpoints_unit"),
+    )
+
+    def __repr__(self):
+        return f"<ExtractionCheckpoint {self.document_id}:{self.chunk_index}>"
@@ -49,6 +49,7 @@ class Job(Base):
     idempotency_key = Column(String(500), nullable=True, unique=True)
     payload_json = Column(JSONB, nullable=False, default=dict)
     result_json = Column(JSONB, nullable=True)
+    metrics_json = Column(JSONB, nullable=True)  # pipeline metrics of the last attempt
     error_message = Column(Text, nullable=True)
     attempts = Column(Integer, nullable=False, default=0)
     max_attempts = Column(Integer, nullable=False, default=3)
@@ -27,8 +27,11 @@ class Record(Base):
     completeness_score = Column(Float, nullable=False, default=0.0)
     status = Column(SQLEnum(RecordStatus, values_callable=lambda x: [e.value for e in x], create_constraint=False, native_enum=False), nullable=False, default=RecordStatus.PENDING)
     version = Column(Integer, nullable=False, default=1)
+    extraction_model = Column(String(255), nullable=True)  # LLM model, "stub" for heuristics
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Postgres additionally maintains a generated `search_vector` tsvector column
+    # (migration 007). It is not mapped so the model stays portable to SQLite.
 
     # Relationships
     document = relationship("Document", back_populates="records")
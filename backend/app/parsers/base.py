@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Optional
 
 
 @dataclass
@@ -18,7 +18,8 @@ class ParsedSection:
 class ParsedDocument:
     """Result of parsing a document."""
     raw_text: str
-    sections: list[ParsedSection] = field(default_factory=list)
+    # A lazy iterable for documents from `DocumentParser.stream`.
+    sections: Iterable[ParsedSection] = field(default_factory=list)
     metadata: dict = field(default_factory=dict)
     confidence: float = 1.0  # Lower for PDF, uncertain parses
     file_type: str = ""
@@ -28,11 +29,24 @@ class ParsedDocument:
 class DocumentParser(ABC):
     """Abstract base class for document parsers."""
 
+    # True if `stream` yields sections while the file is still being read.
+    supports_streaming = False
+
     @abstractmethod
     def parse(self, file_path: str) -> ParsedDocument:
         """Parse a document and return structured content."""
         pass
 
+    def stream(self, file_path: str) -> ParsedDocument:
+        """
+        Parse a document with `sections` as a single-use iterator.
+
+        Streaming parsers leave `raw_text` empty, so only the current section
+        has to be held in memory. Parsers without native support return the
+        fully parsed document.
+        """
+        return self.parse(file_path)
+
     @abstractmethod
     def supports(self, file_extension: str) -> bool:
         """Check if this parser supports the given file extension."""
@@ -1,4 +1,5 @@
 import re
+from typing import Iterator
 
 import pdfplumber
 
@@ -10,46 +11,29 @@ class PdfParser(DocumentParser):
     """Parser for PDF documents with lightweight section detection."""
 
     _HEADING_PATTERN = re.compile(r"^(?:\d+(?:[.)]\d+)*[.)]?\s+)?[A-ZÄÖÜ][A-Za-zÄÖÜäöüß0-9/+.\- ]{2,100}$")
+    _WARNING = (
+        "PDF-Extraktion: Nur Textinhalte werden extrahiert. "
+        "Formatierung, Tabellen und Bilder werden möglicherweise nicht korrekt erfasst."
+    )
+
+    supports_streaming = True
 
     def supports(self, file_extension: str) -> bool:
         return file_extension.lower() == ".pdf"
 
     def parse(self, file_path: str) -> ParsedDocument:
         settings = get_settings()
-        warnings: list[str] = [
-            "PDF-Extraktion: Nur Textinhalte werden extrahiert. "
-            "Formatierung, Tabellen und Bilder werden möglicherweise nicht korrekt erfasst."
-        ]
+        warnings: list[str] = [self._WARNING]
         sections: list[ParsedSection] = []
         raw_text_parts: list[str] = []
-        current_offset = 0
         metadata = {}
 
         try:
             with pdfplumber.open(file_path) as pdf:
-                if pdf.metadata:
-                    if pdf.metadata.get("Title"):
-                        metadata["title"] = pdf.metadata["Title"]
-                    if pdf.metadata.get("Author"):
-                        metadata["author"] = pdf.metadata["Author"]
-                    if pdf.metadata.get("CreationDate"):
-                        metadata["created"] = pdf.metadata["CreationDate"]
-
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    page_text = page.extract_text()
-                    if not page_text:
-                        continue
-
-                    normalized_page = self._normalize_page_text(page_text)
-                    if not normalized_page:
-                        continue
-
+                metadata.update(self._read_metadata(pdf))
+                for normalized_page, page_sections in self._iter_pages(pdf):
                     raw_text_parts.append(normalized_page)
-                    page_sections = self._split_page_sections(normalized_page, page_num, current_offset)
                     sections.extend(page_sections)
-                    current_offset += len(normalized_page) + 2
-
-                metadata["page_count"] = len(pdf.pages)
 
         except Exception as exc:
             warnings.append(f"Fehler beim Lesen der PDF: {exc}")
@@ -84,6 +68,53 @@ class PdfParser(DocumentParser):
             warnings=warnings,
         )
 
+    def stream(self, file_path: str) -> ParsedDocument:
+        """Yield the sections page by page; a read error fails the stream instead of returning an empty document."""
+        return ParsedDocument(
+            raw_text="",
+            sections=self._iter_file_sections(file_path),
+            metadata={},
+            confidence=get_settings().pdf_parser_confidence,
+            file_type="pdf",
+            warnings=[self._WARNING],
+        )
+
+    def _iter_file_sections(self, file_path: str) -> Iterator[ParsedSection]:
+        try:
+            with pdfplumber.open(file_path) as pdf:
+                for _normalized_page, page_sections in self._iter_pages(pdf):
+                    yield from page_sections
+        except Exception as exc:
+            raise RuntimeError(f"Fehler beim Lesen der PDF: {exc}") from exc
+
+    def _read_metadata(self, pdf) -> dict:
+        metadata = {}
+        if pdf.metadata:
+            if pdf.metadata.get("Title"):
+                metadata["title"] = pdf.metadata["Title"]
+            if pdf.metadata.get("Author"):
+                metadata["author"] = pdf.metadata["Author"]
+            if pdf.metadata.get("CreationDate"):
+                metadata["created"] = pdf.metadata["CreationDate"]
+        metadata["page_count"] = len(pdf.pages)
+        return metadata
+
+    def _iter_pages(self, pdf) -> Iterator[tuple[str, list[ParsedSection]]]:
+        """Normalized text and sections per non-empty page; pages are flushed from pdfplumber's cache once read."""
+        current_offset = 0
+        for page_num, page in enumerate(pdf.pages, start=1):
+            page_text = page.extract_text()
+            page.flush_cache()
+            if not page_text:
+                continue
+
+            normalized_page = self._normalize_page_text(page_text)
+            if not normalized_page:
+                continue
+
+            yield normalized_page, self._split_page_sections(normalized_page, page_num, current_offset)
+            current_offset += len(normalized_page) + 2
+
     def _normalize_page_text(self, text: str) -> str:
         normalized_lines = []
         for line in text.splitlines():
@@ -24,6 +24,8 @@ class DocumentResponse(BaseModel):
     status: DocumentStatus
     file_path: Optional[str] = None
     error_message: Optional[str] = None
+    metrics_json: Optional[dict] = None
+    previous_document_id: Optional[UUID] = None
     uploaded_at: datetime
 
     class Config:
@@ -60,6 +60,7 @@ class RecordResponse(BaseModel):
     completeness_score: float
     status: RecordStatus
     version: int
+    extraction_model: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     evidence_items: list[EvidenceResponse] = []
@@ -27,3 +27,21 @@ class SearchResponse(BaseModel):
     results: list[SearchResult]
     total: int
     query: str
+    mode: str = "lexical"
+    timings_ms: dict[str, float] = {}
+
+
+class SuggestResult(BaseModel):
+    record_id: UUID
+    text: str
+    field: str
+    department: Department
+    schema_type: str
+
+    class Config:
+        from_attributes = True
+
+
+class SuggestResponse(BaseModel):
+    suggestions: list[SuggestResult]
+    prefix: str
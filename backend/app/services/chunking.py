@@ -1,6 +1,6 @@
 from dataclasses import dataclass
-import hashlib
 import re
+from typing import Iterator
 
 from app.parsers.base import ParsedDocument, ParsedSection
 
@@ -41,24 +41,24 @@ class ChunkingService:
 
     def create_chunks(self, parsed_doc: ParsedDocument) -> list[TextChunk]:
         """Create chunks from a parsed document."""
-        chunks: list[TextChunk] = []
+        return list(self.iter_chunks(parsed_doc))
+
+    def iter_chunks(self, parsed_doc: ParsedDocument) -> Iterator[TextChunk]:
+        """Yield the chunks of each section as soon as the section is read; `sections` may be lazy."""
         chunk_index = 0
 
         for section in parsed_doc.sections:
             section_chunks = self._chunk_section(section, chunk_index, parsed_doc.confidence)
-            chunks.extend(section_chunks)
+            yield from section_chunks
             chunk_index += len(section_chunks)
 
-        if not chunks and parsed_doc.raw_text:
-            raw_chunks = self._split_text(
+        if not chunk_index and parsed_doc.raw_text:
+            yield from self._split_text(
                 parsed_doc.raw_text,
                 "",
                 0,
                 parsed_doc.confidence,
             )
-            chunks.extend(raw_chunks)
-
-        return chunks
 
     def _chunk_section(
         self,
@@ -100,15 +100,23 @@ class ChunkingService:
         chunks: list[TextChunk] = []
         chunk_idx = start_index
         current_blocks: list[_TextBlock] = []
+        # Length of the current blocks joined with "\n\n", kept in step with `current_blocks`.
+        current_length = 0
+
+        def add_current(block: _TextBlock):
+            nonlocal current_length
+            current_length += len(block.text) + (2 if current_blocks else 0)
+            current_blocks.append(block)
 
         def flush_current():
-            nonlocal current_blocks, chunk_idx
+            nonlocal current_blocks, current_length, chunk_idx
             if not current_blocks:
                 return
 
             chunk_text = "\n\n".join(block.text for block in current_blocks).strip()
             if not chunk_text:
                 current_blocks = []
+                current_length = 0
                 return
 
             start_offset = current_blocks[0].start_offset
@@ -125,6 +133,7 @@ class ChunkingService:
             )
             chunk_idx += 1
             current_blocks = []
+            current_length = 0
 
         for block in blocks:
             if len(block.text) > self.max_chars:
@@ -143,74 +152,67 @@ class ChunkingService:
                     chunk_idx += 1
                 continue
 
-            candidate_size = self._combined_length(current_blocks + [block])
+            candidate_size = current_length + len(block.text) + (2 if current_blocks else 0)
             if candidate_size <= self.max_chars or not current_blocks:
-                current_blocks.append(block)
+                add_current(block)
                 continue
 
             flush_current()
             if chunks:
                 overlap_block = self._build_overlap_block(chunks[-1], text, base_offset)
                 if overlap_block:
-                    current_blocks.append(overlap_block)
+                    add_current(overlap_block)
 
-            current_blocks.append(block)
+            add_current(block)
 
         flush_current()
 
         return chunks
 
     def _build_blocks(self, text: str, base_offset: int) -> list[_TextBlock]:
+        """Split text into paragraph blocks in a single pass; offsets are tracked, not searched for."""
         normalized = text.replace("\r\n", "\n").replace("\r", "\n")
-        lines = normalized.split("\n")
+        raw_lines = normalized.split("\n")
+        lines = [raw_line.strip() for raw_line in raw_lines]
+
+        # next_lines[index] is the first non-empty line after `index`.
+        next_lines: list[str | None] = [None] * len(lines)
+        upcoming: str | None = None
+        for index in range(len(lines) - 1, -1, -1):
+            next_lines[index] = upcoming
+            if lines[index]:
+                upcoming = lines[index]
+
         blocks: list[_TextBlock] = []
         current_lines: list[str] = []
-        current_start: int | None = None
-        search_cursor = 0
+        current_start = 0
+        line_start = 0
 
         def flush_block():
-            nonlocal current_lines, current_start
-            block_text = "\n".join(current_lines).strip()
-            if not block_text:
-                current_lines = []
-                current_start = None
+            if not current_lines:
                 return
-
-            block_position = normalized.find(block_text, current_start if current_start is not None else search_cursor)
-            if block_position < 0:
-                block_position = current_start if current_start is not None else search_cursor
-
+            block_text = "\n".join(current_lines)
             blocks.append(
                 _TextBlock(
                     text=block_text,
-                    start_offset=base_offset + block_position,
-                    end_offset=base_offset + block_position + len(block_text),
+                    start_offset=base_offset + current_start,
+                    end_offset=base_offset + current_start + len(block_text),
                 )
             )
-            current_lines = []
-            current_start = None
+            current_lines.clear()
 
-        for index, raw_line in enumerate(lines):
-            line = raw_line.strip()
-            next_line = next((candidate.strip() for candidate in lines[index + 1 :] if candidate.strip()), None)
+        for raw_line, line, next_line in zip(raw_lines, lines, next_lines):
+            line_position = line_start + len(raw_line) - len(raw_line.lstrip())
+            line_start += len(raw_line) + 1
 
             if not line:
                 flush_block()
                 continue
 
-            line_position = normalized.find(line, search_cursor)
-            if line_position >= 0:
-                search_cursor = line_position + len(line)
-
             if self._is_heading_like(line, next_line):
                 flush_block()
-                current_lines = [line]
-                current_start = line_position if line_position >= 0 else search_cursor
-                continue
-
-            if current_start is None:
-                current_start = line_position if line_position >= 0 else search_cursor
-
+            if not current_lines:
+                current_start = line_position
             current_lines.append(line)
 
         flush_block()
@@ -293,11 +295,6 @@ class ChunkingService:
             end_offset=base_offset + overlap_position + len(overlap_text),
         )
 
-    def _combined_length(self, blocks: list[_TextBlock]) -> int:
-        if not blocks:
-            return 0
-        return sum(len(block.text) for block in blocks) + max(0, (len(blocks) - 1) * 2)
-
     def _is_heading_like(self, line: str, next_line: str | None) -> bool:
         if len(line) < 3 or len(line) > 100:
             return False
@@ -306,15 +303,3 @@ class ChunkingService:
         if not next_line or len(next_line) < 30:
             return False
         return bool(self._HEADING_PATTERN.match(line))
-
-    def generate_dummy_embedding(self, text: str) -> list[float]:
-        """Generate a dummy embedding for development."""
-        hash_bytes = hashlib.sha256(text.encode()).digest()
-
-        embedding = []
-        for index in range(1536):
-            byte_index = index % len(hash_bytes)
-            value = (hash_bytes[byte_index] / 255.0) * 2 - 1
-            embedding.append(value)
-
-        return embedding
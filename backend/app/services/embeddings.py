@@ -0,0 +1,113 @@
+import hashlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+import httpx
+import numpy as np
+
+from app.config import get_settings
+from app.services.search_index import tokenize
+
+
+class EmbeddingProvider(ABC):
+    """Turns texts into fixed-size embedding vectors for `chunks.embedding`."""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    @abstractmethod
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed all texts in one call. Returns a float32 array of shape (len(texts), dimensions)."""
+        pass
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic offline provider based on the hashing trick.
+
+    Every token is hashed to a signed bucket; rows are L2-normalized, so cosine
+    similarity reflects token overlap. Needs no network access, which makes it
+    the default for development, tests and air-gapped installs.
+    """
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        bucket_cache: dict[str, tuple[int, float]] = {}
+
+        for row, text in enumerate(texts):
+            tokens = tokenize(text or "")
+            if not tokens:
+                continue
+            buckets = [bucket_cache.get(token) or self._bucket(token, bucket_cache) for token in tokens]
+            indices = np.fromiter((bucket[0] for bucket in buckets), dtype=np.int64, count=len(buckets))
+            signs = np.fromiter((bucket[1] for bucket in buckets), dtype=np.float32, count=len(buckets))
+            np.add.at(matrix[row], indices, signs)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def _bucket(self, token: str, cache: dict[str, tuple[int, float]]) -> tuple[int, float]:
+        digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+        bucket = (digest % self.dimensions, 1.0 if digest >> 63 else -1.0)
+        cache[token] = bucket
+        return bucket
+
+
+class HttpEmbeddingProvider(EmbeddingProvider):
+    """Model-backed provider for OpenAI-compatible `/embeddings` APIs (e.g. Voyage AI, OpenAI, TEI)."""
+
+    def __init__(
+        self,
+        dimensions: int,
+        api_url: str,
+        api_key: str,
+        model: str,
+        batch_size: int = 128,
+        timeout_seconds: float = 30.0,
+    ):
+        super().__init__(dimensions)
+        if not api_url or not model:
+            raise ValueError("EMBEDDING_API_URL und EMBEDDING_MODEL muessen konfiguriert sein")
+        self.api_url = api_url
+        self.model = model
+        self.batch_size = max(batch_size, 1)
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.client = httpx.Client(headers=headers, timeout=timeout_seconds)
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            response = self.client.post(self.api_url, json={"model": self.model, "input": batch})
+            response.raise_for_status()
+            items = sorted(response.json()["data"], key=lambda item: item["index"])
+            vectors = np.asarray([item["embedding"] for item in items], dtype=np.float32)
+            if vectors.shape != (len(batch), self.dimensions):
+                raise ValueError(
+                    f"Embedding-Antwort hat Form {vectors.shape}, erwartet {(len(batch), self.dimensions)}"
+                )
+            matrix[start:start + len(batch)] = vectors
+
+        return matrix
+
+
+@lru_cache()
+def get_embedding_provider() -> EmbeddingProvider:
+    """Get the configured embedding provider."""
+    settings = get_settings()
+
+    if settings.embedding_provider == "http":
+        return HttpEmbeddingProvider(
+            dimensions=settings.embedding_dimensions,
+            api_url=settings.embedding_api_url,
+            api_key=settings.embedding_api_key,
+            model=settings.embedding_model,
+            batch_size=settings.embedding_batch_size,
+            timeout_seconds=settings.embedding_timeout_seconds,
+        )
+    return HashingEmbeddingProvider(dimensions=settings.embedding_dimensions)
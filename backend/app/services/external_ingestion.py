@@ -44,6 +44,7 @@ from app.schemas.external_ingestion import (
 from app.schemas.knowledge.registry import get_schema_registry
 from app.services.completeness import CompletenessService
 from app.services.merge import MergeService
+from app.services.search_index import sync_approved_records
 from app.services.storage import get_storage_service
 
 
@@ -1068,6 +1069,8 @@ class ExternalKnowledgeImportService:
             self.db.rollback()
             raise
 
+        sync_approved_records([record])
+
         return ExternalImportResponse(
             import_id=external_import.id,
             record_id=record.id,
@@ -0,0 +1,158 @@
+import hashlib
+import threading
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.extractors.base import EvidencePointer, ExtractedRecord, ExtractionContext, ExtractionResult
+from app.models.extraction_cache import ExtractionCacheEntry
+
+
+def extraction_cache_key(
+    text: str,
+    schema_type: str,
+    doc_type: str,
+    department: str,
+    prompt_version: str,
+    model: str,
+) -> str:
+    """Content address of an extraction request."""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, department, doc_type, schema_type, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def serialize_result(result: ExtractionResult, context: ExtractionContext) -> dict:
+    """Store evidence chunk indexes relative to the unit so hits can be reused at another position."""
+    payload = asdict(result)
+    payload["raw_response"] = None
+    payload["usage"] = {}
+    pointers = list(payload["evidence"])
+    for record in payload["records"]:
+        pointers.extend(record["evidence"])
+    for pointer in pointers:
+        if pointer["chunk_index"] is not None:
+            pointer["chunk_index"] -= context.chunk_index
+    return payload
+
+
+def deserialize_result(payload: dict, context: ExtractionContext) -> ExtractionResult:
+    def pointers(items: list[dict]) -> list[EvidencePointer]:
+        return [
+            EvidencePointer(
+                **{
+                    **item,
+                    "chunk_index": None if item["chunk_index"] is None else item["chunk_index"] + context.chunk_index,
+                }
+            )
+            for item in items
+        ]
+
+    records = [
+        ExtractedRecord(**{**record, "evidence": pointers(record["evidence"])})
+        for record in payload["records"]
+    ]
+    return ExtractionResult(**{**payload, "records": records, "evidence": pointers(payload["evidence"])})
+
+
+class ExtractionCache:
+    """
+    Persistent, content-addressed cache of LLM extraction results.
+
+    Rows live in `extraction_cache`; lookups for a whole document are one
+    `IN` query. Entries unused for `max_age_days` are removed, and beyond
+    `max_entries` the least recently used entries go first. Hit and miss
+    counters are per process; `hit_count` on the row is cumulative.
+    """
+
+    def __init__(self, max_entries: int = 50000, max_age_days: int = 90):
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, db: Session, keys: list[str]) -> dict[str, dict]:
+        """Return stored payloads by key and mark them as used."""
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+
+        entries = db.query(ExtractionCacheEntry).filter(ExtractionCacheEntry.cache_key.in_(unique_keys)).all()
+        now = datetime.utcnow()
+        for entry in entries:
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_used_at = now
+        db.commit()
+
+        found = {entry.cache_key: entry.result_json for entry in entries}
+        with self._lock:
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, db: Session, entries: list[dict], evict: bool = True) -> None:
+        """Store `{cache_key, schema_type, doc_type, model, prompt_version, result_json}` dicts, then evict."""
+        if not entries:
+            return
+
+        keys = [entry["cache_key"] for entry in entries]
+        existing = {
+            row[0]
+            for row in db.query(ExtractionCacheEntry.cache_key).filter(ExtractionCacheEntry.cache_key.in_(keys)).all()
+        }
+        now = datetime.utcnow()
+        for entry in {entry["cache_key"]: entry for entry in entries}.values():
+            if entry["cache_key"] in existing:
+                continue
+            db.add(ExtractionCacheEntry(**entry, hit_count=0, created_at=now, last_used_at=now))
+        db.commit()
+        if evict:
+            self.evict(db)
+
+    def evict(self, db: Session) -> int:
+        removed = 0
+        if self.max_age_days > 0:
+            cutoff = datetime.utcnow() - timedelta(days=self.max_age_days)
+            removed += db.query(ExtractionCacheEntry).filter(
+                ExtractionCacheEntry.last_used_at < cutoff
+            ).delete(synchronize_session=False)
+
+        if self.max_entries > 0:
+            overflow = db.query(ExtractionCacheEntry).count() - self.max_entries
+            if overflow > 0:
+                oldest = (
+                    db.query(ExtractionCacheEntry.cache_key)
+                    .order_by(ExtractionCacheEntry.last_used_at.asc())
+                    .limit(overflow)
+                    .subquery()
+                )
+                removed += db.query(ExtractionCacheEntry).filter(
+                    ExtractionCacheEntry.cache_key.in_(oldest.select())
+                ).delete(synchronize_session=False)
+
+        db.commit()
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+@lru_cache()
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Get the extraction cache, or None when it is disabled."""
+    settings = get_settings()
+    if not settings.extraction_cache_enabled:
+        return None
+    return ExtractionCache(
+        max_entries=settings.extraction_cache_max_entries,
+        max_age_days=settings.extraction_cache_max_age_days,
+    )
@@ -0,0 +1,121 @@
+import hashlib
+from dataclasses import asdict
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.extractors.base import EvidencePointer
+from app.models.extraction_checkpoint import ExtractionCheckpoint
+
+
+class ParseHasher:
+    """Incremental `compute_parse_hash` for sections that are streamed."""
+
+    def __init__(self, raw_text: str = ""):
+        self._digest = hashlib.sha256()
+        self._digest.update((raw_text or "").encode("utf-8"))
+
+    def update(self, section) -> None:
+        for part in (section.path or "", section.title or "", section.content or ""):
+            self._digest.update(b"\x00")
+            self._digest.update(part.encode("utf-8"))
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def compute_parse_hash(parsed_doc) -> str:
+    """Fingerprint of the parsed content; chunks and checkpoints are only reused for the same hash."""
+    hasher = ParseHasher(parsed_doc.raw_text)
+    for section in getattr(parsed_doc, "sections", None) or []:
+        hasher.update(section)
+    return hasher.hexdigest()
+
+
+def compute_file_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def checkpoint_key(unit: dict, schema_type: str, model: str, prompt_version: str) -> str:
+    """Identity of an extraction unit within one parse of a document."""
+    digest = hashlib.sha256()
+    for part in (
+        prompt_version,
+        model,
+        schema_type,
+        str(unit["chunk_index"]),
+        unit.get("section_path") or "",
+        unit["text"],
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def serialize_candidates(candidates: list[dict]) -> list[dict]:
+    return [
+        {**candidate, "evidence_pointers": [asdict(pointer) for pointer in candidate.get("evidence_pointers") or []]}
+        for candidate in candidates
+    ]
+
+
+def deserialize_candidates(payload: list[dict]) -> list[dict]:
+    return [
+        {**candidate, "evidence_pointers": [EvidencePointer(**pointer) for pointer in candidate["evidence_pointers"]]}
+        for candidate in payload
+    ]
+
+
+class ExtractionCheckpointStore:
+    """
+    Per-unit extraction progress of a document.
+
+    A checkpoint holds the normalized candidates and the token usage of one
+    completed extraction unit, bound to the parse hash of the document. A
+    retried ingestion job skips every unit that already has a checkpoint;
+    after the records are persisted the checkpoints are removed.
+    """
+
+    def load(self, db: Session, document_id: UUID, parse_hash: str) -> dict[str, ExtractionCheckpoint]:
+        checkpoints = db.query(ExtractionCheckpoint).filter(
+            ExtractionCheckpoint.document_id == document_id,
+            ExtractionCheckpoint.parse_hash == parse_hash,
+        ).all()
+        return {checkpoint.unit_key: checkpoint for checkpoint in checkpoints}
+
+    def save(
+        self,
+        db: Session,
+        document_id: UUID,
+        parse_hash: str,
+        unit_key: str,
+        chunk_index: int,
+        candidates: list[dict],
+        usage: dict,
+        model: str | None,
+        used_stub: bool,
+    ) -> None:
+        db.add(
+            ExtractionCheckpoint(
+                document_id=document_id,
+                parse_hash=parse_hash,
+                unit_key=unit_key,
+                chunk_index=chunk_index,
+                candidates_json=serialize_candidates(candidates),
+                usage_json=dict(usage or {}),
+                model=model,
+                used_stub=used_stub,
+            )
+        )
+        db.commit()
+
+    def clear(self, db: Session, document_id: UUID) -> int:
+        removed = db.query(ExtractionCheckpoint).filter(
+            ExtractionCheckpoint.document_id == document_id
+        ).delete(synchronize_session=False)
+        db.commit()
+        return removed
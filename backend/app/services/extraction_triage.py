@@ -0,0 +1,76 @@
+import re
+from dataclasses import dataclass
+
+
+SKIP = "skip"
+CHEAP = "cheap"
+FULL = "full"
+
+_MEDIA_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".mp4", ".tif", ".tiff")
+_MEDIA_PREFIXES = ("titelbild:", "anwendungsbilder:", "medien:")
+_TOC_TITLES = {"inhalt", "inhaltsverzeichnis", "agenda", "contents", "table of contents"}
+
+_MEDIA_FILE = re.compile(r"\S+\.(?:jpe?g|png|gif|webp|mp4|tiff?)\b", re.IGNORECASE)
+_PLACEHOLDER_LINE = re.compile(r"^\[?\s*(?:bild|abbildung|grafik|foto|image|video)\b[^\n]{0,80}\]?$", re.IGNORECASE)
+# "Einleitung ........ 3": a dot leader marks a TOC line on its own.
+_TOC_LINE = re.compile(r"^.{2,120}?(?:\.{2,}|…+)\s*\d{1,4}$")
+# "2.1 Kabeltypen    12", "1. Einleitung": only TOC lines below a TOC title,
+# a spec table ("Länge   130") looks the same.
+_TOC_ENTRY = re.compile(r"^(?:.{2,120}?(?:\.{2,}|…+|\s{2,}|\t)\s*\d{1,4}|\d+(?:\.\d+)*\.?\s+[^.:;!?]{2,80})$")
+_KEY_VALUE_LINE = re.compile(r"^[\wÄÖÜäöüß .\-/()]{1,40}:\s*\S")
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class TriageDecision:
+    action: str  # skip | cheap | full
+    reason: str
+
+
+def is_media_like_section(section_name: str) -> bool:
+    normalized = section_name.strip().lower()
+    return normalized.startswith(_MEDIA_PREFIXES) or normalized.endswith(_MEDIA_EXTENSIONS)
+
+
+def triage_unit(text: str, section_path: str | None = None) -> TriageDecision:
+    """
+    Classify an extraction unit before any LLM call.
+
+    `skip`: empty units, media and image placeholder sections, tables of
+    contents (dot-leader lines, or entry lines below a TOC title) and
+    divider pages, which the prompt tells the model to ignore
+    anyway. `cheap`: units made of `Feld: Wert` lines that the heuristic
+    extractor can usually handle. Everything else is `full`.
+    """
+    lines = [line.strip() for line in (text or "").splitlines() if line.strip()]
+    if not lines:
+        return TriageDecision(SKIP, "empty")
+
+    section_names = [part.strip() for part in (section_path or "").split(">") if part.strip()]
+    content_lines = [
+        line for line in lines
+        if not _PLACEHOLDER_LINE.match(line) and _MEDIA_FILE.sub("", line).strip(" ,;-|")
+    ]
+    if not content_lines:
+        return TriageDecision(SKIP, "media")
+    if section_names and is_media_like_section(section_names[-1]) and len(" ".join(content_lines)) < 40:
+        return TriageDecision(SKIP, "media")
+
+    if section_names and section_names[-1].lower() in _TOC_TITLES:
+        if sum(1 for line in lines if _TOC_ENTRY.match(line)) >= 0.6 * len(lines):
+            return TriageDecision(SKIP, "table_of_contents")
+    elif len(lines) >= 3 and sum(1 for line in lines if _TOC_LINE.match(line)) >= 0.6 * len(lines):
+        return TriageDecision(SKIP, "table_of_contents")
+
+    content = " ".join(content_lines)
+    if (
+        len(_WORD.findall(content)) < 4
+        and not any(character.isdigit() for character in content)
+        and not any(_KEY_VALUE_LINE.match(line) for line in content_lines)
+    ):
+        return TriageDecision(SKIP, "divider")
+
+    if len(content_lines) >= 2 and sum(1 for line in content_lines if _KEY_VALUE_LINE.match(line)) >= 0.8 * len(content_lines):
+        return TriageDecision(CHEAP, "key_value")
+
+    return TriageDecision(FULL, "content")
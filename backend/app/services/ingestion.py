@@ -1,6 +1,10 @@
 import asyncio
+import functools
 import os
-from uuid import UUID
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from uuid import UUID, uuid4
 
 from sqlalchemy.orm import Session
 
@@ -14,9 +18,29 @@ from app.models.evidence import Evidence
 from app.models.record import Record, RecordStatus
 from app.parsers import get_parser
 from app.schemas.knowledge.registry import get_schema_registry
-from app.services.chunking import ChunkingService
+from app.services.chunk_store import bulk_insert_chunks
+from app.services.chunking import ChunkingService, TextChunk
 from app.services.completeness import CompletenessService
+from app.services.embeddings import get_embedding_provider
+from app.services.extraction_cache import (
+    deserialize_result,
+    extraction_cache_key,
+    get_extraction_cache,
+    serialize_result,
+)
+from app.services.extraction_checkpoints import (
+    ExtractionCheckpointStore,
+    ParseHasher,
+    checkpoint_key,
+    compute_file_hash,
+    compute_parse_hash,
+    deserialize_candidates,
+)
+from app.services.extraction_triage import CHEAP, SKIP, is_media_like_section, triage_unit
 from app.services.merge import MergeService
+from app.services.pipeline_metrics import PipelineMetrics
+from app.services.reingestion import SectionDiff, SectionHasher, compute_section_hashes, diff_sections
+from app.services.search_index import sync_approved_records
 from app.services.storage import get_storage_service
 
 
@@ -34,35 +58,49 @@ class IngestionService:
         self.db = db
         self.storage = get_storage_service()
         self.chunking = ChunkingService()
+        self.embeddings = get_embedding_provider()
         self.completeness = CompletenessService()
         self.merge = MergeService()
         self.registry = get_schema_registry()
+        self.checkpoints = ExtractionCheckpointStore()
+        self.metrics = PipelineMetrics()
+        # Only set while `process_document_async` runs, see `_db`.
+        self._db_executor: ThreadPoolExecutor | None = None
+        # Only set while a streamed document is extracted, see `_extract_units`.
+        self._unit_semaphore: asyncio.Semaphore | None = None
 
     def process_document(self, document_id: UUID):
         """Run the full ingestion pipeline for a document."""
+        self.metrics = PipelineMetrics()
         document = self.db.query(Document).filter(Document.id == document_id).first()
         if not document:
             raise ValueError(f"Dokument nicht gefunden: {document_id}")
 
         try:
             self._update_status(document, DocumentStatus.PARSING)
-            parsed_doc = self._parse_document(document)
+            if self._should_stream(document):
+                chunk_count = self._get_event_loop().run_until_complete(self._process_streaming(document))
+            else:
+                parsed_doc = self._parse_document(document)
 
-            chunks = self._create_chunks(document, parsed_doc)
+                chunks = self._create_chunks(document, parsed_doc)
+                chunk_count = len(chunks)
 
-            self._update_status(document, DocumentStatus.EXTRACTING)
-            self._extract_records(document, chunks, parsed_doc.raw_text)
+                self._update_status(document, DocumentStatus.EXTRACTING)
+                self._extract_records(document, chunks, parsed_doc.raw_text)
 
+            self._record_metrics(document)
             self._update_status(document, DocumentStatus.PENDING_REVIEW)
             self._create_audit_log(
                 "ingestion_complete",
                 "Document",
                 document.id,
-                {"chunks_created": len(chunks)},
+                {"chunks_created": chunk_count},
             )
         except Exception as exc:
             self._safe_rollback()
             try:
+                self._record_metrics(document)
                 self._update_status(document, DocumentStatus.EXTRACTION_FAILED, str(exc))
                 self._create_audit_log(
                     "ingestion_failed",
@@ -74,6 +112,83 @@ class IngestionService:
                 self._safe_rollback()
             raise
 
+    async def process_document_async(self, document_id: UUID):
+        """
+        Run the full ingestion pipeline for a document as a coroutine.
+
+        The session stays synchronous: every database call runs on one thread
+        owned by this service, download and parsing run on the default thread
+        pool, and only the LLM calls run on the event loop. A single process can
+        thereby overlap the extraction of several documents.
+        """
+        self.metrics = PipelineMetrics()
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingestion-db")
+        # Keep loaded attributes across commits so that reading the document on
+        # the event loop never triggers a lazy refresh outside the DB thread.
+        expire_on_commit = self.db.expire_on_commit
+        self.db.expire_on_commit = False
+        try:
+            document = await self._db(
+                lambda: self.db.query(Document).filter(Document.id == document_id).first()
+            )
+            if not document:
+                raise ValueError(f"Dokument nicht gefunden: {document_id}")
+
+            try:
+                await self._db(self._update_status, document, DocumentStatus.PARSING)
+                if self._should_stream(document):
+                    chunk_count = await self._process_streaming(document)
+                else:
+                    parsed_doc = await asyncio.to_thread(self._parse_file, document.file_path)
+
+                    chunks = await self._db(self._create_chunks, document, parsed_doc)
+                    chunk_count = len(chunks)
+
+                    await self._db(self._update_status, document, DocumentStatus.EXTRACTING)
+                    await self._extract_records_async(document, chunks, parsed_doc.raw_text)
+
+                await self._db(self._record_metrics, document)
+                await self._db(self._update_status, document, DocumentStatus.PENDING_REVIEW)
+                await self._db(
+                    self._create_audit_log,
+                    "ingestion_complete",
+                    "Document",
+                    document_id,
+                    {"chunks_created": chunk_count},
+                )
+            except Exception as exc:
+                await self._db(self._safe_rollback)
+                try:
+                    await self._db(self._record_metrics, document)
+                    await self._db(self._update_status, document, DocumentStatus.EXTRACTION_FAILED, str(exc))
+                    await self._db(
+                        self._create_audit_log,
+                        "ingestion_failed",
+                        "Document",
+                        document_id,
+                        {"error": str(exc)},
+                    )
+                except Exception:
+                    await self._db(self._safe_rollback)
+                raise
+        finally:
+            executor, self._db_executor = self._db_executor, None
+            executor.shutdown(wait=True)
+            self.db.expire_on_commit = expire_on_commit
+
+    async def _db(self, func, *args, **kwargs):
+        """
+        Run a database call of the pipeline.
+
+        Inside `process_document_async` calls go to the service's single DB
+        thread, so the session is never used concurrently and the event loop
+        never blocks on it. In the synchronous pipeline they run inline.
+        """
+        if self._db_executor is None:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, functools.partial(func, *args, **kwargs))
+
     def _update_status(self, document: Document, status: DocumentStatus, error: str = None):
         """Update document status."""
         document.status = status
@@ -81,134 +196,549 @@ class IngestionService:
             document.error_message = error
         self.db.commit()
 
+    def _record_metrics(self, document: Document) -> None:
+        """Attach the stage timings of this run to the document; committed with the final status."""
+        document.metrics_json = self.metrics.as_dict()
+
     def _parse_document(self, document: Document):
         """Parse the document file."""
-        temp_path = self.storage.download_to_temp(document.file_path)
+        return self._parse_file(document.file_path)
+
+    def _parse_file(self, file_path: str):
+        with self.metrics.stage("download"):
+            temp_path = self.storage.download_to_temp(file_path)
 
         try:
-            parser = get_parser(temp_path)
-            return parser.parse(temp_path)
+            with self.metrics.stage("parse"):
+                parser = get_parser(temp_path)
+                return parser.parse(temp_path)
         finally:
             if os.path.exists(temp_path):
                 os.remove(temp_path)
 
-    def _create_chunks(self, document: Document, parsed_doc) -> list[Chunk]:
-        """Create and store chunks."""
-        text_chunks = self.chunking.create_chunks(parsed_doc)
-        db_chunks = []
+    def _should_stream(self, document: Document) -> bool:
+        """Stream parsers with native support; re-ingestion needs the full parse for its section diff."""
+        if not get_settings().ingestion_streaming_enabled or getattr(document, "previous_document_id", None):
+            return False
+        try:
+            return get_parser(getattr(document, "file_path", None) or "").supports_streaming
+        except ValueError:
+            return False
+
+    async def _process_streaming(self, document: Document) -> int:
+        """
+        Parse, chunk, store and extract a document as one pipeline.
+
+        The parser yields sections, which are chunked into windows of about
+        `ingestion_stream_window_chunks` chunks. Each window is stored and its
+        extraction units are dispatched as soon as the window is complete,
+        while the next one is read. At most `ingestion_stream_windows_in_flight`
+        windows are extracted at a time, so memory is bounded by the window
+        size instead of the document size. Checkpoints are keyed by the file
+        hash, because the parse hash is only known at the end. Returns the
+        number of chunks.
+        """
+        with self.metrics.stage("download"):
+            temp_path = await asyncio.to_thread(self.storage.download_to_temp, document.file_path)
+        try:
+            return await self._stream_file(document, temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    async def _stream_file(self, document: Document, temp_path: str) -> int:
+        settings = get_settings()
+        parsed_doc = get_parser(temp_path).stream(temp_path)
+        parse_hasher = ParseHasher(parsed_doc.raw_text)
+        section_hasher = SectionHasher()
+
+        def hashed(sections):
+            for section in sections:
+                parse_hasher.update(section)
+                section_hasher.update(section)
+                yield section
+
+        parsed_doc.sections = hashed(parsed_doc.sections)
+        windows = self._iter_chunk_windows(
+            self.chunking.iter_chunks(parsed_doc),
+            max(settings.ingestion_stream_window_chunks, 1),
+        )
+        checkpoint_hash = (
+            await asyncio.to_thread(compute_file_hash, temp_path) if settings.extraction_checkpoints_enabled else None
+        )
 
+        await self._db(self._discard_chunks, document)
+        await self._db(self._update_status, document, DocumentStatus.EXTRACTING)
+
+        extractor = get_extractor()
+        schema = self.registry.get_schema(document.doc_type)
+        chunk_refs: list[Chunk] = []
+        seen_units: list[dict] = []
+        batches: list[dict] = []
+        in_flight: list[asyncio.Future] = []
+        max_in_flight = max(settings.ingestion_stream_windows_in_flight, 1)
+        # One LLM concurrency limit for all windows of the document.
+        self._unit_semaphore = asyncio.Semaphore(max(int(settings.llm_extraction_concurrency), 1))
+        try:
+            while True:
+                with self.metrics.stage("parse"):
+                    window = await asyncio.to_thread(next, windows, None)
+                if window is None:
+                    break
+
+                chunks = await self._db(self._store_chunks, document, window)
+                # Evidence linking needs only ids; the texts leave memory with the window.
+                chunk_refs.extend(Chunk(id=chunk.id, chunk_index=chunk.chunk_index) for chunk in chunks)
+                units = self._build_extraction_units(document, chunks, "")
+                seen_units.extend(
+                    {"chunk_index": unit["chunk_index"], "section_path": unit["section_path"]} for unit in units
+                )
+                if self._should_fail_fast_for_doc_type_mismatch(document, seen_units):
+                    raise RuntimeError(self._build_no_records_error(document, seen_units))
+
+                in_flight.append(asyncio.ensure_future(
+                    self._extract_batch(extractor, schema, document, units, checkpoint_hash)
+                ))
+                while len(in_flight) >= max_in_flight:
+                    batches.append(await in_flight.pop(0))
+            while in_flight:
+                batches.append(await in_flight.pop(0))
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            await asyncio.to_thread(windows.close)
+            raise
+        finally:
+            self._unit_semaphore = None
+
+        document.parse_hash = parse_hasher.hexdigest()
+        document.section_hashes_json = section_hasher.hexdigests()
+        await self._db(self.db.commit)
+        await self._finish_extraction(document, batches, seen_units, chunk_refs, None, bool(checkpoint_hash))
+        return len(chunk_refs)
+
+    def _iter_chunk_windows(self, text_chunks, window_size: int):
+        """
+        Group streamed chunks into windows of at least `window_size` chunks.
+
+        A window closes at the next root section boundary, so root-section
+        extraction units are not cut apart, or at twice the size.
+        """
+        window: list[TextChunk] = []
         for text_chunk in text_chunks:
-            embedding = self.chunking.generate_dummy_embedding(text_chunk.text)
+            if window and (
+                len(window) >= 2 * window_size
+                or (
+                    len(window) >= window_size
+                    and self._root_section(text_chunk.section_path) != self._root_section(window[-1].section_path)
+                )
+            ):
+                yield window
+                window = []
+            window.append(text_chunk)
+        if window:
+            yield window
+
+    def _root_section(self, section_path: str | None) -> str:
+        return (section_path or "").split(" > ", 1)[0].strip()
 
-            chunk = Chunk(
+    def _create_chunks(self, document: Document, parsed_doc) -> list[Chunk]:
+        """
+        Create and store chunks with one multi-row insert per batch.
+
+        A retry that parses to the same content reuses the chunks of the
+        previous attempt instead of embedding and inserting them again. If the
+        content changed, the old chunks and extraction checkpoints are dropped.
+        """
+        parse_hash = compute_parse_hash(parsed_doc)
+        if document.parse_hash == parse_hash:
+            chunks = self._load_chunks(document)
+            if chunks:
+                return chunks
+        else:
+            # Chunks of an earlier attempt, possibly a partial streamed one, belong to other content.
+            self._discard_chunks(document)
+            self.checkpoints.clear(self.db, document.id)
+
+        with self.metrics.stage("chunk"):
+            text_chunks = self.chunking.create_chunks(parsed_doc)
+        document.parse_hash = parse_hash
+        document.section_hashes_json = compute_section_hashes(parsed_doc)
+        return self._store_chunks(document, text_chunks)
+
+    def _store_chunks(self, document: Document, text_chunks: list[TextChunk]) -> list[Chunk]:
+        """Embed and insert chunks, then commit together with pending document changes."""
+        with self.metrics.stage("embed"):
+            embeddings = self.embeddings.embed_batch([text_chunk.text for text_chunk in text_chunks])
+        with self.metrics.stage("chunk_insert"):
+            chunk_ids = bulk_insert_chunks(self.db, document.id, text_chunks, embeddings)
+            self.db.commit()
+
+        # Detached chunks carry what extraction and evidence linking need; the
+        # embeddings are not kept in memory.
+        return [
+            Chunk(
+                id=chunk_ids[text_chunk.chunk_index],
                 document_id=document.id,
                 section_path=text_chunk.section_path,
                 text=text_chunk.text,
-                embedding=embedding,
                 confidence=text_chunk.confidence,
                 start_offset=text_chunk.start_offset,
                 end_offset=text_chunk.end_offset,
                 chunk_index=text_chunk.chunk_index,
             )
-            self.db.add(chunk)
-            db_chunks.append(chunk)
+            for text_chunk in text_chunks
+        ]
 
+    def _discard_chunks(self, document: Document) -> None:
+        self.db.query(Chunk).filter(Chunk.document_id == document.id).delete(synchronize_session=False)
         self.db.commit()
-        return db_chunks
+
+    def _load_chunks(self, document: Document) -> list[Chunk]:
+        """Stored chunks of a document as detached objects, without embeddings."""
+        rows = (
+            self.db.query(
+                Chunk.id,
+                Chunk.section_path,
+                Chunk.text,
+                Chunk.confidence,
+                Chunk.start_offset,
+                Chunk.end_offset,
+                Chunk.chunk_index,
+            )
+            .filter(Chunk.document_id == document.id)
+            .order_by(Chunk.chunk_index.asc())
+            .all()
+        )
+        return [
+            Chunk(
+                id=row.id,
+                document_id=document.id,
+                section_path=row.section_path,
+                text=row.text,
+                confidence=row.confidence,
+                start_offset=row.start_offset,
+                end_offset=row.end_offset,
+                chunk_index=row.chunk_index,
+            )
+            for row in rows
+        ]
 
     def _extract_records(self, document: Document, chunks: list[Chunk], full_text: str):
         """Extract structured records from document chunks and merge duplicate findings."""
+        loop = self._get_event_loop()
+        loop.run_until_complete(self._extract_records_async(document, chunks, full_text))
+
+    async def _extract_records_async(self, document: Document, chunks: list[Chunk], full_text: str):
         extractor = get_extractor()
         schema = self.registry.get_schema(document.doc_type)
-        extraction_units = self._build_extraction_units(document, chunks, full_text)
-        aggregated_records: list[dict] = []
-        aggregated_index: dict[str, int] = {}
-        stub_fallback_count = 0
+        section_diff = await self._db(self._load_section_diff, document)
+        if section_diff is None:
+            extraction_units = self._build_extraction_units(document, chunks, full_text)
+        else:
+            # Re-ingestion: only added and changed sections go to extraction.
+            changed_chunks = [chunk for chunk in chunks if section_diff.needs_extraction(chunk.section_path)]
+            extraction_units = (
+                self._build_extraction_units(document, changed_chunks, full_text) if changed_chunks else []
+            )
 
         if self._should_fail_fast_for_doc_type_mismatch(document, extraction_units):
             raise RuntimeError(self._build_no_records_error(document, extraction_units))
 
-        loop = self._get_event_loop()
+        parse_hash = getattr(document, "parse_hash", None)
+        checkpoint_hash = parse_hash if parse_hash and get_settings().extraction_checkpoints_enabled else None
+        batch = await self._extract_batch(extractor, schema, document, extraction_units, checkpoint_hash)
+        await self._finish_extraction(document, [batch], extraction_units, chunks, section_diff, bool(checkpoint_hash))
 
-        for unit in extraction_units:
-            context = self._build_context(
-                document=document,
-                unit=unit,
-                chunk_total=len(extraction_units),
-            )
-            result, used_stub = self._extract_unit(
-                extractor=extractor,
-                schema=schema,
-                context=context,
-                text=unit["text"],
-                loop=loop,
+    async def _extract_batch(
+        self,
+        extractor,
+        schema,
+        document: Document,
+        extraction_units: list[dict],
+        checkpoint_hash: str | None = None,
+    ) -> dict:
+        """
+        Triage, pack and extract a list of section units.
+
+        Returns the per-unit outcomes together with the unit counts of the
+        batch. With a `checkpoint_hash`, units completed by an earlier attempt
+        are taken from their checkpoints and every new unit is checkpointed as
+        soon as it finishes.
+        """
+        with self.metrics.stage("triage"):
+            llm_units, cheap_results, skipped_units = await self._triage_units(
+                extractor, schema, document, extraction_units
             )
-            if used_stub:
-                stub_fallback_count += 1
+        packed_units = self._pack_extraction_units(
+            llm_units, self._unit_token_budget(extractor, schema, document)
+        )
 
-            candidates = self._normalize_result(
-                document=document,
-                default_schema_type=schema.__name__,
-                result=result,
-                context=context,
-            )
+        model_name = getattr(extractor, "model", None) or "stub"
+        unit_keys = [
+            checkpoint_key(unit, schema.__name__, model_name, getattr(extractor, "prompt_version", None) or "")
+            for unit in packed_units
+        ] if checkpoint_hash else [None] * len(packed_units)
+        checkpoints = (
+            await self._db(self.checkpoints.load, self.db, document.id, checkpoint_hash) if checkpoint_hash else {}
+        )
 
-            for candidate in candidates:
-                self._aggregate_record(candidate, aggregated_records, aggregated_index)
+        outcomes: list[dict] = []
+        pending_units: list[dict] = []
+        pending_keys: list[str | None] = []
+        for unit, unit_key in zip(packed_units, unit_keys):
+            checkpoint = checkpoints.get(unit_key) if checkpoint_hash else None
+            if checkpoint is None:
+                pending_units.append(unit)
+                pending_keys.append(unit_key)
+                continue
+            outcomes.append({
+                "chunk_index": unit["chunk_index"],
+                "candidates": deserialize_candidates(checkpoint.candidates_json),
+                "usage": dict(checkpoint.usage_json or {}),
+                "model": checkpoint.model or "stub",
+                "used_stub": checkpoint.used_stub,
+                "from_cache": False,
+                "resumed": True,
+            })
+
+        async def on_unit_done(position: int, context, result, used_stub: bool, from_cache: bool):
+            unit = pending_units[position]
+            outcome = self._unit_outcome(document, schema, unit, context, result, used_stub, from_cache)
+            outcomes.append(outcome)
+            if checkpoint_hash:
+                await self._db(
+                    self.checkpoints.save,
+                    self.db,
+                    document.id,
+                    checkpoint_hash,
+                    pending_keys[position],
+                    unit["chunk_index"],
+                    outcome["candidates"],
+                    outcome["usage"],
+                    getattr(result, "model", None),
+                    used_stub,
+                )
 
-        if not aggregated_records:
+        with self.metrics.stage("extract"):
+            await self._extract_units(extractor, schema, document, pending_units, on_unit_done=on_unit_done)
+        outcomes.extend(
+            self._unit_outcome(document, schema, unit, context, result, used_stub, from_cache)
+            for unit, context, result, used_stub, from_cache in cheap_results
+        )
+        return {
+            "outcomes": outcomes,
+            "extraction_units": len(packed_units),
+            "section_units": len(extraction_units),
+            "cheap_units": len(cheap_results),
+            "skipped": skipped_units,
+        }
+
+    async def _finish_extraction(
+        self,
+        document: Document,
+        batches: list[dict],
+        extraction_units: list[dict],
+        chunks: list[Chunk],
+        section_diff: SectionDiff | None,
+        clear_checkpoints: bool,
+    ):
+        """Aggregate the outcomes of all batches in unit order, persist the records and write the audit log."""
+        aggregated_records: list[dict] = []
+        aggregated_index: dict[str, int] = {}
+        stub_fallback_count = 0
+        cached_unit_count = 0
+        resumed_unit_count = 0
+        llm_usage: dict[str, int] = {}
+        unit_models: dict[str, int] = {}
+        outcomes = [outcome for batch in batches for outcome in batch["outcomes"]]
+        with self.metrics.stage("aggregate"):
+            # Aggregate in unit order, independent of completion order.
+            for outcome in sorted(outcomes, key=lambda item: item["chunk_index"]):
+                if outcome["used_stub"]:
+                    stub_fallback_count += 1
+                if outcome["from_cache"]:
+                    cached_unit_count += 1
+                if outcome.get("resumed"):
+                    # Tokens of resumed units were counted by the attempt that spent them.
+                    resumed_unit_count += 1
+                else:
+                    for field, tokens in outcome["usage"].items():
+                        llm_usage[field] = llm_usage.get(field, 0) + tokens
+                unit_models[outcome["model"]] = unit_models.get(outcome["model"], 0) + 1
+
+                for candidate in outcome["candidates"]:
+                    self._aggregate_record(candidate, aggregated_records, aggregated_index)
+
+        if not aggregated_records and section_diff is None:
             raise RuntimeError(self._build_no_records_error(document, extraction_units))
 
-        # Start the write phase with a clean session after potentially long LLM calls.
-        self._safe_rollback()
-        records_created = 0
-        for candidate in aggregated_records:
-            try:
-                self._create_record_from_extraction(
-                    document=document,
-                    data=candidate["data"],
-                    schema_type=candidate["schema_type"],
-                    evidence_pointers=candidate["evidence_pointers"],
-                    chunks=chunks,
-                    confidence=candidate["confidence"],
-                    needs_review=candidate["needs_review"],
-                    source_section=candidate["source_section"],
-                )
-                records_created += 1
-            except Exception as exc:
-                self._safe_rollback()
-                record_label = (
-                    candidate["data"].get("title")
-                    or candidate["data"].get("name")
-                    or candidate["source_section"]
-                    or candidate["schema_type"]
-                )
-                raise RuntimeError(
-                    f"Fehler beim Persistieren von Record '{record_label}': {exc}"
-                ) from exc
+        # The rollback below expires the document; reading it on the event loop
+        # afterwards would lazy-load outside the DB thread.
+        document_id = document.id
+        previous_document_id = getattr(document, "previous_document_id", None)
+        with self.metrics.stage("persist"):
+            # Start the write phase with a clean session after potentially long LLM calls.
+            await self._db(self._safe_rollback)
+            records_created = await self._db(self._persist_records, document, aggregated_records, chunks)
+            if clear_checkpoints:
+                await self._db(self.checkpoints.clear, self.db, document_id)
+            carried_forward = (
+                await self._db(self._carry_forward_records, document, section_diff) if section_diff is not None else 0
+            )
 
         if stub_fallback_count:
-            self._create_audit_log(
+            await self._db(
+                self._create_audit_log,
                 "extraction_fallback_used",
                 "Document",
-                document.id,
+                document_id,
                 {"provider": "stub", "units": stub_fallback_count},
             )
 
-        self._create_audit_log(
-            "records_extracted",
-            "Document",
-            document.id,
-            {
-                "records_created": records_created,
-                "extraction_units": len(extraction_units),
-            },
-        )
+        skipped_units = [skipped for batch in batches for skipped in batch["skipped"]]
+        details = {
+            "records_created": records_created,
+            "extraction_units": sum(batch["extraction_units"] for batch in batches),
+            "section_units": sum(batch["section_units"] for batch in batches),
+            "cached_extraction_units": cached_unit_count,
+            "resumed_extraction_units": resumed_unit_count,
+            "cheap_extraction_units": sum(batch["cheap_units"] for batch in batches),
+            "skipped_units": len(skipped_units),
+            "skipped": skipped_units[:50],
+            "llm_usage": llm_usage,
+            "extraction_models": unit_models,
+        }
+        if len(batches) > 1:
+            details["streamed_batches"] = len(batches)
+        if section_diff is not None:
+            details["reingestion"] = {
+                "previous_document_id": str(previous_document_id),
+                "sections": section_diff.as_dict(),
+                "carried_forward_records": carried_forward,
+            }
+        await self._db(self._create_audit_log, "records_extracted", "Document", document_id, details)
+
+    def _load_section_diff(self, document: Document) -> SectionDiff | None:
+        """Section diff against the previous version, or None for a full ingestion."""
+        previous_document_id = getattr(document, "previous_document_id", None)
+        current_hashes = getattr(document, "section_hashes_json", None)
+        if previous_document_id is None or current_hashes is None:
+            return None
+
+        row = self.db.query(Document.section_hashes_json).filter(Document.id == previous_document_id).first()
+        if row is None or row[0] is None:
+            # The previous version predates section hashes.
+            return None
+        return diff_sections(row[0], current_hashes)
+
+    def _carry_forward_records(self, document: Document, section_diff: SectionDiff) -> int:
+        """
+        Move the records of unchanged sections from the previous version to this one.
+
+        They keep their status and evidence, so unchanged content needs no new
+        review. Their evidence is re-pointed to the chunks of this version, so
+        deleting the previous version does not take it along. Records of
+        changed or removed sections stay with the previous version.
+
+        Carried records belong to this version from now on: deleting it
+        deletes them too, including approved ones.
+        """
+        records = self.db.query(Record).filter(
+            Record.document_id == document.previous_document_id,
+            Record.status != RecordStatus.REJECTED,
+        ).all()
+        carried = [
+            record for record in records
+            if section_diff.is_unaffected((record.data_json or {}).get("_source_section"))
+        ]
+        for record in carried:
+            record.document_id = document.id
+        if carried:
+            self._repoint_evidence(document, [record.id for record in carried])
+        self.db.commit()
+        # Search responses carry the source document of each record.
+        sync_approved_records(carried)
+        return len(carried)
+
+    def _repoint_evidence(self, document: Document, record_ids: list[UUID]) -> None:
+        """Move evidence of carried records onto the chunk of this version with the same section path."""
+        chunks_by_path: dict[str, list[Chunk]] = {}
+        for chunk in self.db.query(Chunk).filter(Chunk.document_id == document.id).order_by(Chunk.chunk_index):
+            chunks_by_path.setdefault(chunk.section_path or "", []).append(chunk)
+
+        rows = self.db.query(Evidence.id, Evidence.excerpt, Chunk.section_path, Chunk.text).outerjoin(
+            Chunk, Evidence.chunk_id == Chunk.id
+        ).filter(Evidence.record_id.in_(record_ids)).all()
+        for evidence_id, excerpt, section_path, chunk_text in rows:
+            candidates = chunks_by_path.get(section_path or "", [])
+            target = (
+                next((chunk for chunk in candidates if chunk.text == chunk_text), None)
+                or next((chunk for chunk in candidates if excerpt and excerpt in chunk.text), None)
+                or (candidates[0] if candidates else None)
+            )
+            # Without a matching chunk the evidence keeps its excerpt but no longer hangs on the old chunk.
+            self.db.query(Evidence).filter(Evidence.id == evidence_id).update(
+                {Evidence.chunk_id: target.id if target else None},
+                synchronize_session=False,
+            )
+
+    def _unit_outcome(self, document: Document, schema, unit: dict, context, result, used_stub: bool, from_cache: bool) -> dict:
+        """Attribute evidence of a finished unit and normalize its result into record candidates."""
+        self._attribute_evidence(result, unit)
+        return {
+            "chunk_index": unit["chunk_index"],
+            "candidates": self._normalize_result(
+                document=document,
+                default_schema_type=schema.__name__,
+                result=result,
+                context=context,
+            ),
+            "usage": dict(getattr(result, "usage", None) or {}),
+            "model": getattr(result, "model", None) or "stub",
+            "used_stub": used_stub,
+            "from_cache": from_cache,
+        }
+
+    async def _triage_units(self, extractor, schema, document: Document, units: list[dict]) -> tuple:
+        """
+        Route section units before any LLM call.
+
+        Returns the units that need the LLM, `(unit, context, result, used_stub,
+        from_cache)` tuples for `cheap` units the heuristic extractor handled
+        with a valid result, and a description of every skipped unit. Only
+        extractors with a `model` are triaged; heuristic extraction is free.
+        """
+        if not getattr(extractor, "model", None) or not get_settings().extraction_triage_enabled:
+            return units, [], []
+
+        llm_units: list[dict] = []
+        cheap_results: list[tuple] = []
+        skipped_units: list[dict] = []
+        for unit in units:
+            decision = triage_unit(unit["text"], unit.get("section_path"))
+            if decision.action == SKIP:
+                skipped_units.append({
+                    "chunk_index": unit["chunk_index"],
+                    "section_path": unit.get("section_path") or "",
+                    "reason": decision.reason,
+                })
+                continue
+            if decision.action == CHEAP:
+                context = self._build_context(document=document, unit=unit, chunk_total=len(units))
+                result = await LocalStubExtractor().extract(unit["text"], schema, context)
+                if result.valid and (result.records or result.data):
+                    cheap_results.append((unit, context, result, False, False))
+                    continue
+            llm_units.append(unit)
+
+        return llm_units, cheap_results, skipped_units
 
     def _build_extraction_units(self, document: Document, chunks: list[Chunk], full_text: str) -> list[dict]:
         settings = get_settings()
         if not chunks:
-            return [{"text": full_text, "section_path": "", "chunk_index": 0}]
+            return [{"text": full_text, "section_path": "", "chunk_index": 0, "chunk_spans": [(0, 0, len(full_text))]}]
 
         should_group = (
             self._has_hierarchical_section_paths(chunks)
@@ -224,11 +754,13 @@ class IngestionService:
 
         if len(chunks) == 1:
             chunk = chunks[0]
+            text = chunk.text or full_text
             return [
                 {
-                    "text": chunk.text or full_text,
+                    "text": text,
                     "section_path": chunk.section_path or "",
                     "chunk_index": chunk.chunk_index,
+                    "chunk_spans": [(chunk.chunk_index, 0, len(text))],
                 }
             ]
 
@@ -237,6 +769,7 @@ class IngestionService:
                 "text": chunk.text,
                 "section_path": chunk.section_path or "",
                 "chunk_index": chunk.chunk_index,
+                "chunk_spans": [(chunk.chunk_index, 0, len(chunk.text))],
             }
             for chunk in sorted(chunks, key=lambda item: item.chunk_index)
             if chunk.text and chunk.text.strip()
@@ -274,27 +807,153 @@ class IngestionService:
                 root_section,
                 {
                     "text_parts": [],
+                    "chunk_indexes": [],
                     "section_path": root_section,
                     "chunk_index": chunk.chunk_index,
                 },
             )
             group["text_parts"].append(text)
+            group["chunk_indexes"].append(chunk.chunk_index)
 
         units = []
         for root_section, group in grouped.items():
-            combined_text = "\n\n".join(group["text_parts"]).strip()
-            if not combined_text:
-                continue
+            combined_text = "\n\n".join(group["text_parts"])
             units.append(
                 {
                     "text": combined_text,
                     "section_path": group["section_path"],
                     "chunk_index": group["chunk_index"],
+                    "chunk_spans": self._join_spans(
+                        [
+                            [(chunk_index, 0, len(text))]
+                            for chunk_index, text in zip(group["chunk_indexes"], group["text_parts"])
+                        ],
+                        [len(text) for text in group["text_parts"]],
+                        separator_length=2,
+                    ),
                 }
             )
 
         return units
 
+    def _unit_token_budget(self, extractor, schema, document: Document) -> int:
+        """Packing budget of a batch; 0 disables packing."""
+        # Packing saves LLM calls; heuristic extraction needs the units as they are.
+        if not getattr(extractor, "model", None):
+            return 0
+        budget = get_settings().extraction_unit_token_budget_for(schema.__name__)
+        # Units packed above the fast model's cap would all go to the full model.
+        max_unit_tokens = getattr(extractor, "max_unit_tokens", None)
+        cap = max_unit_tokens(document.doc_type.value) if max_unit_tokens else None
+        return min(budget, cap) if cap and budget > 0 else budget
+
+    def _pack_extraction_units(self, units: list[dict], token_budget: int) -> list[dict]:
+        """
+        Pack adjacent units into units of at most `token_budget` tokens.
+
+        Only units below the same root section are packed; units without a
+        hierarchical path (CSV rows, flat FAQ sections) count as siblings below
+        the document root. Each packed part is introduced by its section path
+        and `chunk_spans` records which characters belong to which chunk, so
+        evidence can be attributed afterwards. Units above the budget stay as
+        they are.
+        """
+        if token_budget <= 0 or len(units) < 2:
+            return units
+
+        budget_chars = token_budget * 4
+        packed: list[dict] = []
+        batch: list[dict] = []
+        batch_chars = 0
+        batch_boundary = None
+
+        def flush():
+            if len(batch) == 1:
+                packed.append(batch[0])
+            elif batch:
+                packed.append(self._merge_units(batch, batch_boundary))
+
+        for unit in units:
+            section_path = unit.get("section_path") or ""
+            boundary = section_path.split(" > ")[0].strip() if " > " in section_path else ""
+            # "### <path>\n" header plus the "\n\n" separator, as `_merge_units` writes them.
+            unit_chars = (len(section_path) + 5 if section_path else 0) + len(unit["text"]) + 2
+            if batch and (boundary != batch_boundary or batch_chars + unit_chars > budget_chars):
+                flush()
+                batch, batch_chars = [], 0
+            batch.append(unit)
+            batch_chars += unit_chars
+            batch_boundary = boundary
+        flush()
+
+        return packed
+
+    def _merge_units(self, units: list[dict], section_path: str) -> dict:
+        parts = []
+        part_spans = []
+        for unit in units:
+            header = f"### {unit['section_path']}\n" if unit.get("section_path") else ""
+            parts.append(f"{header}{unit['text']}")
+            part_spans.append([
+                (chunk_index, start + len(header), end + len(header))
+                for chunk_index, start, end in unit["chunk_spans"]
+            ])
+        return {
+            "text": "\n\n".join(parts),
+            "section_path": section_path,
+            "chunk_index": units[0]["chunk_index"],
+            "chunk_spans": self._join_spans(part_spans, [len(part) for part in parts], separator_length=2),
+        }
+
+    def _join_spans(
+        self,
+        part_spans: list[list[tuple[int, int, int]]],
+        part_lengths: list[int],
+        separator_length: int,
+    ) -> list[tuple[int, int, int]]:
+        """Shift per-part `(chunk_index, start, end)` spans to offsets in the joined text."""
+        spans = []
+        offset = 0
+        for spans_of_part, length in zip(part_spans, part_lengths):
+            spans.extend((chunk_index, start + offset, end + offset) for chunk_index, start, end in spans_of_part)
+            offset += length + separator_length
+        return spans
+
+    def _attribute_evidence(self, result, unit: dict) -> None:
+        """
+        Point evidence of a multi-chunk unit at the chunk it was found in.
+
+        Extractors attribute all evidence to the unit's first chunk. Offsets
+        (or, without offsets, the excerpt position) are looked up in the unit's
+        `chunk_spans`; offsets are made relative to that chunk.
+        """
+        spans = unit.get("chunk_spans") or []
+        if len(spans) < 2:
+            return
+
+        ends = [end for _chunk_index, _start, end in spans]
+        pointers = list(result.evidence)
+        for record in result.records:
+            pointers.extend(record.evidence)
+
+        for pointer in pointers:
+            if pointer.chunk_index != unit["chunk_index"]:
+                continue
+            position = pointer.start_offset
+            if position is None and pointer.excerpt:
+                position = unit["text"].find(pointer.excerpt)
+                if position < 0:
+                    continue
+            if position is None:
+                continue
+            # Section headers and separators count towards the following chunk.
+            chunk_index, start, _end = spans[min(bisect_right(ends, position), len(spans) - 1)]
+            pointer.chunk_index = chunk_index
+            if pointer.start_offset is not None:
+                pointer.start_offset = max(pointer.start_offset - start, 0)
+            if pointer.end_offset is not None:
+                pointer.end_offset = max(pointer.end_offset - start, 0)
+
     def _build_no_records_error(self, document: Document, extraction_units: list[dict]) -> str:
         base_message = "Keine fachlich brauchbaren Records extrahiert."
         settings = get_settings()
@@ -339,13 +998,7 @@ class IngestionService:
         )
 
     def _is_media_like_training_section(self, section_name: str) -> bool:
-        normalized = section_name.lower()
-        return (
-            normalized.startswith("titelbild:")
-            or normalized.startswith("anwendungsbilder:")
-            or normalized.startswith("medien:")
-            or normalized.endswith((".jpg", ".jpeg", ".png", ".gif", ".webp", ".mp4", ".tif", ".tiff"))
-        )
+        return is_media_like_section(section_name)
 
     def _build_context(self, document: Document, unit: dict, chunk_total: int) -> ExtractionContext:
         return ExtractionContext(
@@ -359,20 +1012,120 @@ class IngestionService:
             document_version=self._document_version(document),
         )
 
+    async def _extract_units(
+        self,
+        extractor,
+        schema,
+        document: Document,
+        extraction_units: list[dict],
+        on_unit_done=None,
+    ) -> list[tuple]:
+        """
+        Extract all units concurrently, at most `llm_extraction_concurrency` at a time.
+
+        Returns `(context, result, used_stub, from_cache)` per unit in unit
+        order. Units found in the extraction cache skip the LLM; the per-unit
+        timeout only starts once a unit holds a semaphore slot. If a unit
+        fails, the remaining units are cancelled and the error is raised.
+        `on_unit_done(position, context, result, used_stub, from_cache)` is
+        awaited as soon as a unit finishes, so its progress survives a later
+        failure.
+        """
+        settings = get_settings()
+        semaphore = self._unit_semaphore or asyncio.Semaphore(
+            max(int(getattr(settings, "llm_extraction_concurrency", 1)), 1)
+        )
+        contexts = [
+            self._build_context(document=document, unit=unit, chunk_total=len(extraction_units))
+            for unit in extraction_units
+        ]
+
+        cacheable = getattr(extractor, "prompt_version", None) and getattr(extractor, "model", None)
+        cache = get_extraction_cache() if cacheable else None
+        cache_keys: list[str] = []
+        cached: dict[str, dict] = {}
+        if cache is not None:
+            cache_keys = [
+                extraction_cache_key(
+                    text=unit["text"],
+                    schema_type=schema.__name__,
+                    doc_type=context.doc_type,
+                    department=context.department,
+                    prompt_version=extractor.prompt_version,
+                    model=extractor.model,
+                )
+                for unit, context in zip(extraction_units, contexts)
+            ]
+            cached = await self._db(cache.get_many, self.db, cache_keys)
+
+        cache_writes = 0
+
+        async def extract(position: int) -> tuple:
+            nonlocal cache_writes
+            context = contexts[position]
+            if cache is not None and cache_keys[position] in cached:
+                unit_result = (context, deserialize_result(cached[cache_keys[position]], context), False, True)
+                self.metrics.record_unit(context.chunk_index, 0.0, model=extractor.model, from_cache=True)
+            else:
+                async with semaphore:
+                    started_at = time.perf_counter()
+                    result, used_stub = await self._extract_unit_async(
+                        extractor, schema, context, extraction_units[position]["text"]
+                    )
+                    self.metrics.record_unit(
+                        context.chunk_index,
+                        time.perf_counter() - started_at,
+                        usage=getattr(result, "usage", None),
+                        model=getattr(result, "model", None),
+                        used_stub=used_stub,
+                    )
+                unit_result = (context, result, used_stub, False)
+                # Stub fallbacks and empty results are not cached so a later run retries the LLM.
+                # Written as soon as the unit finishes, so a later failure of the document keeps it;
+                # serialized before `on_unit_done` can attribute evidence in place.
+                if cache is not None and not used_stub and (result.records or result.data):
+                    await self._db(cache.put_many, self.db, [{
+                        "cache_key": cache_keys[position],
+                        "schema_type": schema.__name__,
+                        "doc_type": context.doc_type,
+                        "model": extractor.model,
+                        "prompt_version": extractor.prompt_version,
+                        "result_json": serialize_result(result, context),
+                    }], False)
+                    cache_writes += 1
+            if on_unit_done is not None:
+                await on_unit_done(position, *unit_result)
+            return unit_result
+
+        tasks = [asyncio.ensure_future(extract(position)) for position in range(len(extraction_units))]
+        try:
+            unit_results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        if cache_writes:
+            await self._db(cache.evict, self.db)
+        return unit_results
+
     def _extract_unit(self, extractor, schema, context: ExtractionContext, text: str, loop) -> tuple:
+        return loop.run_until_complete(self._extract_unit_async(extractor, schema, context, text))
+
+    async def _extract_unit_async(self, extractor, schema, context: ExtractionContext, text: str) -> tuple:
         settings = get_settings()
         timeout_seconds = max(float(getattr(settings, "llm_timeout_seconds", 120.0)), 1.0)
 
         try:
-            result = loop.run_until_complete(
-                asyncio.wait_for(
-                    extractor.extract(text, schema, context),
-                    timeout=timeout_seconds,
-                )
+            result = await asyncio.wait_for(
+                extractor.extract(text, schema, context),
+                # Gateway-backed extractors time out each API call, not the queueing around it.
+                timeout=None if getattr(extractor, "enforces_call_timeout", False) else timeout_seconds,
             )
         except asyncio.TimeoutError:
             if settings.llm_provider == "claude":
-                fallback_result = loop.run_until_complete(LocalStubExtractor().extract(text, schema, context))
+                fallback_result = await LocalStubExtractor().extract(text, schema, context)
                 if fallback_result.records or fallback_result.data:
                     return fallback_result, True
             raise RuntimeError(
@@ -380,8 +1133,10 @@ class IngestionService:
             )
 
         if self._should_use_stub_fallback(result):
-            fallback_result = loop.run_until_complete(LocalStubExtractor().extract(text, schema, context))
+            fallback_result = await LocalStubExtractor().extract(text, schema, context)
             if fallback_result.records or fallback_result.data:
+                # The tokens of the empty LLM answer were spent all the same.
+                fallback_result.usage = result.usage
                 return fallback_result, True
         return result, False
 
@@ -410,6 +1165,7 @@ class IngestionService:
                         "confidence": extracted_record.confidence,
                         "needs_review": extracted_record.confidence < settings.record_confidence_needs_review_threshold,
                         "source_section": extracted_record.source_section or context.section_path,
+                        "extraction_model": result.model or "stub",
                     }
                 )
 
@@ -427,6 +1183,7 @@ class IngestionService:
                     "confidence": result.confidence,
                     "needs_review": result.needs_review or not result.valid,
                     "source_section": context.section_path,
+                    "extraction_model": result.model or "stub",
                 }
             )
 
@@ -577,80 +1334,117 @@ class IngestionService:
             asyncio.set_event_loop(loop)
             return loop
 
-    def _create_record_from_extraction(
-        self,
-        document: Document,
-        data: dict,
-        schema_type: str,
-        evidence_pointers: list,
-        chunks: list[Chunk],
-        confidence: float | None = None,
-        needs_review: bool = False,
-        source_section: str = None,
-    ):
-        """Create a single record from extracted data."""
-        settings = get_settings()
-        effective_confidence = (
-            confidence
-            if confidence is not None
-            else settings.record_confidence_needs_review_threshold
-        )
-        primary_key = self.merge.compute_primary_key(document.doc_type, data)
+    def _persist_records(self, document: Document, candidates: list[dict], chunks: list[Chunk]) -> int:
+        """
+        Write all candidates of a document in one transaction.
 
-        existing = self.merge.find_existing_record(
+        Existing approved records are looked up with a single query and receive
+        a ProposedUpdate; all other candidates become new records with their
+        evidence. Returns the number of persisted candidates.
+        """
+        settings = get_settings()
+        chunk_ids = {chunk.chunk_index: chunk.id for chunk in chunks}
+        fallback_chunk_id = chunks[0].id if chunks else None
+        primary_keys = [
+            self.merge.compute_primary_key(document.doc_type, candidate["data"])
+            for candidate in candidates
+        ]
+        existing_records = self.merge.find_existing_records(
             self.db,
-            schema_type,
-            primary_key,
+            [(candidate["schema_type"], primary_key) for candidate, primary_key in zip(candidates, primary_keys)],
         )
 
+        for candidate, primary_key in zip(candidates, primary_keys):
+            try:
+                self._add_record_from_extraction(
+                    document=document,
+                    candidate=candidate,
+                    primary_key=primary_key,
+                    existing=existing_records.get((candidate["schema_type"], primary_key)),
+                    chunk_ids=chunk_ids,
+                    fallback_chunk_id=fallback_chunk_id,
+                    needs_review_threshold=settings.record_confidence_needs_review_threshold,
+                )
+            except Exception as exc:
+                self._safe_rollback()
+                record_label = (
+                    candidate["data"].get("title")
+                    or candidate["data"].get("name")
+                    or candidate["source_section"]
+                    or candidate["schema_type"]
+                )
+                raise RuntimeError(
+                    f"Fehler beim Persistieren von Record '{record_label}': {exc}"
+                ) from exc
+
+        try:
+            self.db.commit()
+        except Exception as exc:
+            self._safe_rollback()
+            raise RuntimeError(f"Fehler beim Persistieren der Records: {exc}") from exc
+        return len(candidates)
+
+    def _add_record_from_extraction(
+        self,
+        document: Document,
+        candidate: dict,
+        primary_key: str,
+        existing: Record | None,
+        chunk_ids: dict[int, UUID],
+        fallback_chunk_id: UUID | None,
+        needs_review_threshold: float,
+    ):
+        """Add a record with evidence, or a proposed update for an existing record, to the session."""
+        data = candidate["data"]
         if existing:
-            self.merge.create_proposed_update(
-                self.db,
-                existing,
-                data,
-                document.id,
-            )
+            if getattr(document, "previous_document_id", None) and not self._has_changes(existing.data_json, data):
+                # A re-ingested section produced the approved content again.
+                return
+            self.db.add(self.merge.build_proposed_update(existing, data, document.id))
             return
 
+        confidence = candidate["confidence"]
+        effective_confidence = confidence if confidence is not None else needs_review_threshold
         completeness = self.completeness.calculate_score(document.doc_type, data)
 
         status = RecordStatus.PENDING
-        if needs_review or effective_confidence < settings.record_confidence_needs_review_threshold:
+        if candidate["needs_review"] or effective_confidence < needs_review_threshold:
             status = RecordStatus.NEEDS_REVIEW
 
-        if source_section:
-            data["_source_section"] = source_section
+        if candidate["source_section"]:
+            data["_source_section"] = candidate["source_section"]
 
+        # Client-side ids let the ORM batch all INSERTs of the transaction.
         record = Record(
+            id=uuid4(),
             document_id=document.id,
             department=document.department,
-            schema_type=schema_type,
+            schema_type=candidate["schema_type"],
             primary_key=primary_key,
             data_json=data,
             completeness_score=completeness,
             status=status,
+            extraction_model=candidate.get("extraction_model"),
         )
         self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
 
-        for evidence_pointer in evidence_pointers:
-            chunk = next(
-                (candidate for candidate in chunks if candidate.chunk_index == evidence_pointer.chunk_index),
-                chunks[0] if chunks else None,
-            )
-
-            evidence = Evidence(
+        for evidence_pointer in candidate["evidence_pointers"]:
+            self.db.add(Evidence(
+                id=uuid4(),
                 record_id=record.id,
-                chunk_id=chunk.id if chunk else None,
+                chunk_id=chunk_ids.get(evidence_pointer.chunk_index, fallback_chunk_id),
                 field_path=evidence_pointer.field_path,
                 excerpt=evidence_pointer.excerpt[:1000] if evidence_pointer.excerpt else None,
                 start_offset=evidence_pointer.start_offset,
                 end_offset=evidence_pointer.end_offset,
-            )
-            self.db.add(evidence)
+            ))
 
-        self.db.commit()
+    def _has_changes(self, old_data: dict, new_data: dict) -> bool:
+        """Compare record data without internal fields such as `_source_section`."""
+        def public(data: dict) -> dict:
+            return {key: value for key, value in (data or {}).items() if not key.startswith("_")}
+
+        return public(old_data) != public(new_data)
 
     def _should_use_stub_fallback(self, result) -> bool:
         """Fallback to heuristics only when Claude returns no usable records."""
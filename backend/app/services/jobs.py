@@ -54,10 +54,17 @@ class JobService:
             query = query.filter(Job.job_type.in_(job_types))
         return query.order_by(Job.created_at.asc()).first()
 
-    def mark_succeeded(self, job_id: UUID, result: dict[str, Any] | None = None) -> Job:
+    def mark_succeeded(
+        self,
+        job_id: UUID,
+        result: dict[str, Any] | None = None,
+        metrics: dict[str, Any] | None = None,
+    ) -> Job:
         job = self._get_job(job_id)
         job.status = JobStatus.SUCCEEDED
         job.result_json = result or {}
+        if metrics is not None:
+            job.metrics_json = metrics
         job.error_message = None
         job.finished_at = datetime.utcnow()
         job.locked_by = None
@@ -67,8 +74,16 @@ class JobService:
         self.db.refresh(job)
         return job
 
-    def mark_failed(self, job_id: UUID, error_message: str, retryable: bool = True) -> Job:
+    def mark_failed(
+        self,
+        job_id: UUID,
+        error_message: str,
+        retryable: bool = True,
+        metrics: dict[str, Any] | None = None,
+    ) -> Job:
         job = self._get_job(job_id)
+        if metrics is not None:
+            job.metrics_json = metrics
         if retryable and job.attempts < job.max_attempts:
             job.status = JobStatus.QUEUED
             job.locked_by = None
@@ -0,0 +1,484 @@
+import asyncio
+import time
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, literal, literal_column, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.chunk import Chunk
+from app.models.evidence import Evidence
+from app.models.record import Record, RecordStatus
+from app.services.embeddings import get_embedding_provider
+from app.services.search_index import get_search_index, tokenize
+from app.services.trigram_index import get_trigram_index
+
+
+# Must stay identical to the expression of ix_records_lookup_values_trgm_approved (migration 009).
+FUZZY_LOOKUP_EXPRESSION = (
+    "lower("
+    "coalesce(records.data_json ->> 'artnr', '') || ' ' || "
+    "coalesce(records.data_json ->> 'product_id', '') || ' ' || "
+    "coalesce(records.data_json ->> 'title', '') || ' ' || "
+    "coalesce(records.data_json ->> 'name', '')"
+    ")"
+)
+
+
+class IndexSearchBackend:
+    """Lexical search over the process-local BM25 inverted index."""
+
+    name = "index"
+
+    def search(
+        self,
+        db: Session,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ) -> list[tuple[UUID, float]]:
+        index = get_search_index()
+        index.ensure_loaded(db)
+        return index.search(q, department=department, schema_type=schema_type, limit=limit)
+
+
+class PostgresSearchBackend:
+    """
+    Lexical search pushed down into Postgres.
+
+    Uses the generated `records.search_vector` column (migration 007) and its
+    GIN index. Filtering, `ts_rank_cd` ranking with the completeness boost and
+    the limit all run in a single SQL statement.
+    """
+
+    name = "postgres"
+
+    def __init__(self, text_config: str = "german"):
+        self.text_config = text_config
+
+    def search(
+        self,
+        db: Session,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ) -> list[tuple[UUID, float]]:
+        query = self.build_query(db, q, department, schema_type, limit)
+        if query is None:
+            return []
+        return [(row.id, round(float(row.score), 4)) for row in query.all()]
+
+    def build_query(
+        self,
+        db: Session,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ):
+        # OR the query terms like the BM25 index does; tokenizing first also keeps
+        # user input from being interpreted as tsquery syntax.
+        terms = list(dict.fromkeys(tokenize(q)))
+        if not terms:
+            return None
+
+        search_vector = literal_column("records.search_vector")
+        ts_query = func.to_tsquery(self.text_config, " | ".join(terms))
+        score = (
+            func.ts_rank_cd(search_vector, ts_query) * (0.5 + Record.completeness_score * 0.5)
+        ).label("score")
+
+        query = db.query(Record.id, score).filter(
+            Record.status == RecordStatus.APPROVED,
+            search_vector.op("@@")(ts_query),
+        )
+        if department:
+            query = query.filter(Record.department == department)
+        if schema_type:
+            query = query.filter(Record.schema_type == schema_type)
+
+        return query.order_by(score.desc()).limit(limit)
+
+
+# Upper bound of pgvector's hnsw.ef_search.
+MAX_EF_SEARCH = 1000
+
+
+class SemanticSearchBackend:
+    """
+    Nearest-neighbour search over `chunks.embedding`.
+
+    On Postgres the candidate chunks come from the pgvector ANN index
+    (migration 008) tuned via `hnsw.ef_search` / `ivfflat.probes`; elsewhere an
+    exact cosine scan is used. Chunks map back to APPROVED records through
+    `Evidence.chunk_id`, and each record is scored by its best matching chunk
+    with the same completeness boost as lexical search.
+    """
+
+    name = "semantic"
+
+    def __init__(
+        self,
+        candidate_chunks: int = 100,
+        ef_search: int = 40,
+        ivfflat_probes: int = 10,
+    ):
+        self.candidate_chunks = candidate_chunks
+        self.ef_search = ef_search
+        self.ivfflat_probes = ivfflat_probes
+
+    def search(
+        self,
+        db: Session,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ) -> list[tuple[UUID, float]]:
+        return self.search_vector(db, get_embedding_provider().embed(q), department, schema_type, limit)
+
+    def search_vector(
+        self,
+        db: Session,
+        query_vector: np.ndarray,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ) -> list[tuple[UUID, float]]:
+        """`search` for an already embedded query."""
+        if db.get_bind().dialect.name == "postgresql":
+            chunk_scores = self._nearest_chunks_postgres(db, query_vector, department, schema_type, limit)
+        else:
+            chunk_scores = self._nearest_chunks_exact(db, query_vector, department, schema_type)
+
+        record_scores: dict[UUID, tuple[float, float]] = {}
+        for record_id, similarity, completeness_score in chunk_scores:
+            best = record_scores.get(record_id)
+            if best is None or similarity > best[0]:
+                record_scores[record_id] = (similarity, completeness_score or 0.0)
+
+        ranked = [
+            (record_id, round(similarity * (0.5 + completeness_score * 0.5), 4))
+            for record_id, (similarity, completeness_score) in record_scores.items()
+        ]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def _nearest_chunks_postgres(
+        self,
+        db: Session,
+        query_vector: np.ndarray,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ) -> list[tuple[UUID, float, float]]:
+        """
+        Candidate chunks from the ANN index, restricted to APPROVED records.
+
+        The index filters after scanning `ef_search` (or `probes` lists)
+        candidates, so a selective filter can leave fewer than `limit` records;
+        the scan is then widened up to `MAX_EF_SEARCH` and retried.
+        """
+        ef_search, probes = self.ef_search, self.ivfflat_probes
+        while True:
+            # SET does not accept bind parameters; both values are cast to int.
+            db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+            db.execute(text(f"SET LOCAL ivfflat.probes = {int(probes)}"))
+            rows = self.build_nearest_query(db, query_vector, department, schema_type).all()
+            if len({row[0] for row in rows}) >= limit or ef_search >= MAX_EF_SEARCH:
+                return [(row[0], 1.0 - float(row[1]), row[2]) for row in rows]
+            ef_search = min(ef_search * 4, MAX_EF_SEARCH)
+            probes *= 4
+
+    def build_nearest_query(
+        self,
+        db: Session,
+        query_vector: np.ndarray,
+        department: Optional[str],
+        schema_type: Optional[str],
+    ):
+        # Filters go into the ANN query itself; applied afterwards, chunks of
+        # unapproved or other-department records would take the candidate slots.
+        eligible = (
+            db.query(Evidence.id)
+            .join(Record, Record.id == Evidence.record_id)
+            .filter(Evidence.chunk_id == Chunk.id, Record.status == RecordStatus.APPROVED)
+        )
+        eligible = self._apply_filters(eligible, department, schema_type)
+
+        distance = Chunk.embedding.cosine_distance(query_vector)
+        nearest = (
+            db.query(Chunk.id.label("chunk_id"), distance.label("distance"))
+            .filter(Chunk.embedding.isnot(None), eligible.exists())
+            .order_by(distance)
+            .limit(self.candidate_chunks)
+            .subquery()
+        )
+
+        query = (
+            db.query(Record.id, nearest.c.distance, Record.completeness_score)
+            .join(Evidence, Evidence.record_id == Record.id)
+            .join(nearest, nearest.c.chunk_id == Evidence.chunk_id)
+            .filter(Record.status == RecordStatus.APPROVED)
+        )
+        return self._apply_filters(query, department, schema_type)
+
+    def _nearest_chunks_exact(
+        self,
+        db: Session,
+        query_vector: np.ndarray,
+        department: Optional[str],
+        schema_type: Optional[str],
+    ) -> list[tuple[UUID, float, float]]:
+        query = (
+            db.query(Record.id, Chunk.embedding, Record.completeness_score)
+            .join(Evidence, Evidence.record_id == Record.id)
+            .join(Chunk, Chunk.id == Evidence.chunk_id)
+            .filter(Record.status == RecordStatus.APPROVED, Chunk.embedding.isnot(None))
+        )
+        rows = self._apply_filters(query, department, schema_type).all()
+        if not rows:
+            return []
+
+        embeddings = np.vstack([np.asarray(row[1], dtype=np.float32) for row in rows])
+        norms = np.linalg.norm(embeddings, axis=1) * (np.linalg.norm(query_vector) or 1.0)
+        similarities = embeddings @ query_vector / np.where(norms == 0, 1.0, norms)
+        return [(row[0], float(similarity), row[2]) for row, similarity in zip(rows, similarities)]
+
+    def _apply_filters(self, query, department: Optional[str], schema_type: Optional[str]):
+        if department:
+            query = query.filter(Record.department == department)
+        if schema_type:
+            query = query.filter(Record.schema_type == schema_type)
+        return query
+
+
+class TrigramSearchBackend:
+    """Typo-tolerant lookup over the process-local trigram index (fallback off Postgres)."""
+
+    name = "trigram"
+
+    def __init__(self, min_similarity: float = 0.3):
+        self.min_similarity = min_similarity
+
+    def search(
+        self,
+        db: Session,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ) -> list[tuple[UUID, float]]:
+        index = get_trigram_index()
+        index.ensure_loaded(db)
+        return index.search(
+            q,
+            department=department,
+            schema_type=schema_type,
+            limit=limit,
+            min_similarity=self.min_similarity,
+        )
+
+
+class PostgresFuzzySearchBackend:
+    """
+    Typo-tolerant lookup with pg_trgm.
+
+    Matches `similarity()` against the primary key and `word_similarity()`
+    against the artnr/product_id/title/name values; both predicates are served
+    by the GIN trigram indexes from migration 009. Results are ranked by the
+    better of the two similarities.
+    """
+
+    name = "postgres_fuzzy"
+
+    def __init__(self, min_similarity: float = 0.3):
+        self.min_similarity = min_similarity
+
+    def search(
+        self,
+        db: Session,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ) -> list[tuple[UUID, float]]:
+        query = self.build_query(db, q, department, schema_type, limit)
+        if query is None:
+            return []
+
+        # The `%` / `<%` operators use these thresholds; SET does not accept bind parameters.
+        threshold = float(self.min_similarity)
+        db.execute(text(f"SET LOCAL pg_trgm.similarity_threshold = {threshold}"))
+        db.execute(text(f"SET LOCAL pg_trgm.word_similarity_threshold = {threshold}"))
+        return [(row.id, round(float(row.score), 4)) for row in query.all()]
+
+    def build_query(
+        self,
+        db: Session,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ):
+        term = " ".join(tokenize(q))
+        if not term:
+            return None
+
+        primary_key = func.lower(Record.primary_key)
+        lookup_values = literal_column(FUZZY_LOOKUP_EXPRESSION)
+        term_literal = literal(term)
+        score = func.greatest(
+            func.similarity(primary_key, term_literal),
+            func.word_similarity(term_literal, lookup_values),
+        ).label("score")
+
+        query = db.query(Record.id, score).filter(
+            Record.status == RecordStatus.APPROVED,
+            or_(primary_key.op("%")(term_literal), term_literal.op("<%")(lookup_values)),
+        )
+        if department:
+            query = query.filter(Record.department == department)
+        if schema_type:
+            query = query.filter(Record.schema_type == schema_type)
+
+        return query.order_by(score.desc()).limit(limit)
+
+
+class HybridSearchBackend:
+    """
+    Lexical and semantic retrieval fused with reciprocal rank fusion (RRF).
+
+    Both retrievers run concurrently in worker threads, each with its own
+    session, and return `candidate depth` hits. RRF only looks at ranks, so the
+    completeness boost is applied to the fused score afterwards.
+    """
+
+    name = "hybrid"
+
+    def __init__(
+        self,
+        lexical,
+        semantic: SemanticSearchBackend,
+        lexical_depth: int = 50,
+        semantic_depth: int = 50,
+        rrf_k: int = 60,
+    ):
+        self.lexical = lexical
+        self.semantic = semantic
+        self.lexical_depth = lexical_depth
+        self.semantic_depth = semantic_depth
+        self.rrf_k = rrf_k
+
+    async def search_async(
+        self,
+        db: Session,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        limit: int,
+    ) -> tuple[list[tuple[UUID, float]], dict[str, float]]:
+        bind = db.get_bind()
+        (lexical_hits, lexical_ms), (semantic_hits, semantic_ms) = await asyncio.gather(
+            asyncio.to_thread(self._timed_search, bind, self.lexical, q, department, schema_type, self.lexical_depth),
+            asyncio.to_thread(self._timed_search, bind, self.semantic, q, department, schema_type, self.semantic_depth),
+        )
+
+        fused = self.fuse([lexical_hits, semantic_hits])
+        completeness = {}
+        if fused:
+            completeness = dict(
+                db.query(Record.id, Record.completeness_score).filter(Record.id.in_(list(fused))).all()
+            )
+
+        ranked = [
+            (record_id, round(score * (0.5 + (completeness.get(record_id) or 0.0) * 0.5), 6))
+            for record_id, score in fused.items()
+        ]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:limit], {"lexical": lexical_ms, "semantic": semantic_ms}
+
+    def fuse(self, rankings: list[list[tuple[UUID, float]]]) -> dict[UUID, float]:
+        fused: dict[UUID, float] = {}
+        for ranking in rankings:
+            for rank, (record_id, _score) in enumerate(ranking, start=1):
+                fused[record_id] = fused.get(record_id, 0.0) + 1.0 / (self.rrf_k + rank)
+        return fused
+
+    def _timed_search(
+        self,
+        bind: Engine,
+        backend,
+        q: str,
+        department: Optional[str],
+        schema_type: Optional[str],
+        depth: int,
+    ) -> tuple[list[tuple[UUID, float]], float]:
+        started = time.perf_counter()
+        session = Session(bind=bind)
+        try:
+            hits = backend.search(session, q, department, schema_type, depth)
+        finally:
+            session.close()
+        return hits, _elapsed_ms(started)
+
+
+def get_search_backend(db: Session, mode: str = "lexical", min_similarity: Optional[float] = None):
+    """Return the backend for a search mode; lexical and fuzzy search fall back to in-memory indexes off Postgres."""
+    settings = get_settings()
+    if mode == "fuzzy":
+        if min_similarity is None:
+            min_similarity = settings.fuzzy_search_min_similarity
+        if db.get_bind().dialect.name == "postgresql":
+            return PostgresFuzzySearchBackend(min_similarity=min_similarity)
+        return TrigramSearchBackend(min_similarity=min_similarity)
+    if mode == "hybrid":
+        return HybridSearchBackend(
+            lexical=get_search_backend(db, "lexical"),
+            semantic=get_search_backend(db, "semantic"),
+            lexical_depth=settings.hybrid_search_lexical_depth,
+            semantic_depth=settings.hybrid_search_semantic_depth,
+            rrf_k=settings.hybrid_search_rrf_k,
+        )
+    if mode == "semantic":
+        return SemanticSearchBackend(
+            candidate_chunks=settings.semantic_search_candidate_chunks,
+            ef_search=settings.semantic_search_ef_search,
+            ivfflat_probes=settings.semantic_search_ivfflat_probes,
+        )
+    if settings.search_backend == "postgres" and db.get_bind().dialect.name == "postgresql":
+        return PostgresSearchBackend(text_config=settings.search_text_config)
+    return IndexSearchBackend()
+
+
+async def search_records(
+    db: Session,
+    q: str,
+    mode: str = "lexical",
+    department: Optional[str] = None,
+    schema_type: Optional[str] = None,
+    limit: int = 10,
+    min_similarity: Optional[float] = None,
+) -> tuple[list[tuple[UUID, float]], dict[str, float]]:
+    """Rank approved record ids for a query. Returns the hits and per-retriever timings in milliseconds."""
+    backend = get_search_backend(db, mode, min_similarity=min_similarity)
+    if isinstance(backend, HybridSearchBackend):
+        return await backend.search_async(db, q, department, schema_type, limit)
+
+    started = time.perf_counter()
+    if isinstance(backend, SemanticSearchBackend):
+        # Embedding providers may call an HTTP API; keep that off the event loop.
+        query_vector = await asyncio.to_thread(get_embedding_provider().embed, q)
+        hits = backend.search_vector(db, query_vector, department, schema_type, limit)
+    else:
+        hits = backend.search(db, q, department, schema_type, limit)
+    return hits, {mode: _elapsed_ms(started)}
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
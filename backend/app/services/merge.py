@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.models.record import Record, RecordStatus
 from app.models.proposed_update import ProposedUpdate, UpdateStatus
 from app.schemas.knowledge.registry import get_schema_registry
+from app.services.search_index import sync_approved_records
 from app.models.document import DocType
 
 
@@ -27,6 +28,29 @@ class MergeService:
             Record.status == RecordStatus.APPROVED
         ).first()
 
+    def find_existing_records(
+        self,
+        db: Session,
+        keys: list[tuple[str, str]],
+    ) -> dict[tuple[str, str], Record]:
+        """Find approved records for many `(schema_type, primary_key)` pairs with one query."""
+        wanted = set(keys)
+        if not wanted:
+            return {}
+
+        records = db.query(Record).filter(
+            Record.schema_type.in_({schema_type for schema_type, _ in wanted}),
+            Record.primary_key.in_({primary_key for _, primary_key in wanted}),
+            Record.status == RecordStatus.APPROVED
+        ).all()
+
+        existing: dict[tuple[str, str], Record] = {}
+        for record in records:
+            key = (record.schema_type, record.primary_key)
+            if key in wanted:
+                existing.setdefault(key, record)
+        return existing
+
     def compute_primary_key(self, doc_type: DocType, data: dict) -> str:
         """Compute the stable primary key for a record."""
         schema = self.registry.get_schema(doc_type)
@@ -98,15 +122,7 @@ class MergeService:
         source_document_id: UUID
     ) -> ProposedUpdate:
         """Create a proposed update for an existing record."""
-        diff = self.compute_diff(existing_record.data_json, new_data)
-
-        update = ProposedUpdate(
-            record_id=existing_record.id,
-            source_document_id=source_document_id,
-            new_data_json=new_data,
-            diff_json=diff,
-            status=UpdateStatus.PENDING
-        )
+        update = self.build_proposed_update(existing_record, new_data, source_document_id)
 
         db.add(update)
         db.commit()
@@ -114,6 +130,21 @@ class MergeService:
 
         return update
 
+    def build_proposed_update(
+        self,
+        existing_record: Record,
+        new_data: dict,
+        source_document_id: UUID
+    ) -> ProposedUpdate:
+        """Build a pending proposed update without adding it to a session."""
+        return ProposedUpdate(
+            record_id=existing_record.id,
+            source_document_id=source_document_id,
+            new_data_json=new_data,
+            diff_json=self.compute_diff(existing_record.data_json, new_data),
+            status=UpdateStatus.PENDING
+        )
+
     def apply_update(
         self,
         db: Session,
@@ -137,6 +168,7 @@ class MergeService:
 
         db.commit()
         db.refresh(record)
+        sync_approved_records([record])
 
         return record
 
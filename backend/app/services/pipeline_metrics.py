@@ -0,0 +1,142 @@
+import time
+from contextlib import contextmanager
+
+from app.extractors.claude import USAGE_FIELDS
+
+
+PERCENTILES = (50, 90, 95)
+# Units kept per document; the aggregates above cover all of them.
+MAX_STORED_UNITS = 200
+
+
+class PipelineMetrics:
+    """
+    Wall-clock seconds per ingestion stage and per extraction unit.
+
+    Stages: download, parse, chunk, embed, chunk_insert, triage, extract,
+    aggregate and persist. Every extraction unit records its latency, model
+    and the token counts of the LLM `usage` block.
+
+    A stage that runs more than once, e.g. on a retry or once per streamed
+    window, reports the wall time during which at least one of its runs was
+    active; concurrent windows are not counted twice, so no stage exceeds
+    `total_seconds`. Streamed documents parse, extract and persist windows at
+    the same time, so the sum over all stages can. Their "parse" stage
+    includes chunking, which pulls sections from the parser.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._started_at = clock()
+        self._spans: dict[str, list[tuple[float, float]]] = {}
+        self.units: list[dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        started_at = self._clock()
+        try:
+            yield
+        finally:
+            self._spans.setdefault(name, []).append((started_at, self._clock()))
+
+    @property
+    def stages(self) -> dict[str, float]:
+        """Wall-clock seconds per stage: the length of the union of its spans."""
+        return {name: _covered_seconds(spans) for name, spans in self._spans.items()}
+
+    def record_unit(
+        self,
+        chunk_index: int,
+        seconds: float,
+        usage: dict | None = None,
+        model: str | None = None,
+        used_stub: bool = False,
+        from_cache: bool = False,
+    ) -> None:
+        self.units.append({
+            "chunk_index": chunk_index,
+            "seconds": round(seconds, 4),
+            "model": model or "stub",
+            "used_stub": used_stub,
+            "from_cache": from_cache,
+            **{field: int((usage or {}).get(field, 0) or 0) for field in USAGE_FIELDS},
+        })
+
+    def tokens(self) -> dict[str, int]:
+        return {field: sum(unit[field] for unit in self.units) for field in USAGE_FIELDS}
+
+    def as_dict(self) -> dict:
+        llm_seconds = [unit["seconds"] for unit in self.units if not unit["from_cache"]]
+        return {
+            "total_seconds": round(self._clock() - self._started_at, 4),
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "llm_units": len(llm_seconds),
+            "cached_units": len(self.units) - len(llm_seconds),
+            "llm_seconds": round(sum(llm_seconds), 4),
+            "tokens": self.tokens(),
+            "units": self.units[:MAX_STORED_UNITS],
+        }
+
+
+def _covered_seconds(spans: list[tuple[float, float]]) -> float:
+    covered = 0.0
+    covered_until = float("-inf")
+    for started_at, ended_at in sorted(spans):
+        if ended_at <= covered_until:
+            continue
+        covered += ended_at - max(started_at, covered_until)
+        covered_until = ended_at
+    return covered
+
+
+def percentile(values: list[float], rank: float) -> float | None:
+    """Linear interpolation between closest ranks, like numpy's default."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * rank / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return round(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower), 4)
+
+
+def _distribution(values: list[float]) -> dict:
+    return {f"p{rank}": percentile(values, rank) for rank in PERCENTILES}
+
+
+def summarize_pipeline_metrics(rows: list[tuple[str, dict]]) -> dict[str, dict]:
+    """
+    Per doc type percentiles over `(doc_type, metrics_json)` rows.
+
+    Stage and total durations and token counts are per document; `unit_seconds`
+    is the latency distribution of all LLM units of those documents.
+    """
+    grouped: dict[str, list[dict]] = {}
+    for doc_type, metrics in rows:
+        if metrics:
+            grouped.setdefault(doc_type, []).append(metrics)
+
+    summary: dict[str, dict] = {}
+    for doc_type, documents in sorted(grouped.items()):
+        stage_names = sorted({name for metrics in documents for name in metrics.get("stages", {})})
+        summary[doc_type] = {
+            "documents": len(documents),
+            "total_seconds": _distribution([metrics.get("total_seconds", 0.0) for metrics in documents]),
+            "stages": {
+                name: _distribution([
+                    metrics["stages"][name] for metrics in documents if name in metrics.get("stages", {})
+                ])
+                for name in stage_names
+            },
+            "unit_seconds": _distribution([
+                unit["seconds"]
+                for metrics in documents
+                for unit in metrics.get("units", [])
+                if not unit.get("from_cache")
+            ]),
+            "tokens": {
+                field: _distribution([metrics.get("tokens", {}).get(field, 0) for metrics in documents])
+                for field in USAGE_FIELDS
+            },
+        }
+    return summary
@@ -0,0 +1,61 @@
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.attachment import RecordAttachment
+from app.models.evidence import Evidence
+from app.models.record import Record
+from app.services.source_metadata import attach_source_metadata
+
+
+def hydrate_records(
+    db: Session,
+    records: list[Record],
+    evidence: bool = True,
+    attachments: bool = False,
+    attachment_urls: bool = False,
+    source_metadata: bool = True,
+) -> None:
+    """
+    Bulk-load related data for a page of records.
+
+    Every enabled relation costs one `IN` query regardless of page size (source
+    metadata costs up to two). Relations are stored as committed values, so later
+    serialization does not trigger lazy loads and the session does not see the
+    records as modified.
+    """
+    if not records:
+        return
+
+    record_ids = [record.id for record in records]
+
+    if evidence:
+        evidence_by_record: dict[UUID, list[Evidence]] = {}
+        for item in db.query(Evidence).filter(Evidence.record_id.in_(record_ids)).all():
+            evidence_by_record.setdefault(item.record_id, []).append(item)
+        for record in records:
+            set_committed_value(record, "evidence_items", evidence_by_record.get(record.id, []))
+
+    if attachments:
+        storage = None
+        if attachment_urls:
+            from app.services.storage import get_storage_service
+            storage = get_storage_service()
+
+        attachments_by_record: dict[UUID, list[RecordAttachment]] = {}
+        items = (
+            db.query(RecordAttachment)
+            .filter(RecordAttachment.record_id.in_(record_ids))
+            .order_by(RecordAttachment.created_at.desc())
+            .all()
+        )
+        for item in items:
+            if storage is not None:
+                item.url = storage.get_file_url(item.file_path)
+            attachments_by_record.setdefault(item.record_id, []).append(item)
+        for record in records:
+            set_committed_value(record, "attachments", attachments_by_record.get(record.id, []))
+
+    if source_metadata:
+        attach_source_metadata(db, records)
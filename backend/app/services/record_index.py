@@ -0,0 +1,166 @@
+import copy
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models.record import Record, RecordStatus
+
+
+def enum_value(value) -> str:
+    return str(getattr(value, "value", value))
+
+
+@dataclass(frozen=True)
+class IndexedRow:
+    """The columns of an approved record that the in-memory indexes are built from."""
+
+    id: UUID
+    department: str
+    schema_type: str
+    primary_key: Optional[str]
+    data_json: Any
+    completeness_score: Optional[float]
+
+    @classmethod
+    def from_record(cls, record) -> "IndexedRow":
+        return cls(
+            id=record.id,
+            department=enum_value(record.department),
+            schema_type=record.schema_type,
+            primary_key=record.primary_key,
+            data_json=record.data_json,
+            completeness_score=record.completeness_score,
+        )
+
+
+class RecordIndex:
+    """
+    Base class for in-memory indexes over approved records.
+
+    The index is built from the database on first use and rebuilt once it is
+    older than `max_age_seconds`. A rebuild streams the records into a fresh
+    copy of the index without holding `_lock` and swaps the contents in at
+    the end, so searches keep using the previous contents meanwhile and a
+    failed rebuild leaves them untouched. Record changes synced during a
+    rebuild are replayed on the new contents.
+
+    Subclasses list the attributes set by `_reset` in `_STATE` and implement
+    `_add` and `_remove`, which run under `_lock` except on the fresh copy.
+    """
+
+    _STATE: tuple[str, ...] = ()
+
+    def __init__(self, max_age_seconds: float = 300.0):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        # Set on the fresh copy while a rebuild adds records to it.
+        self._building = False
+        self._pending_syncs: Optional[list[tuple[UUID, Optional[IndexedRow]]]] = None
+        self._loaded_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+    def _add(self, row: IndexedRow) -> None:
+        raise NotImplementedError
+
+    def _remove(self, record_id: UUID) -> bool:
+        raise NotImplementedError
+
+    def _finish_rebuild(self) -> None:
+        """Hook run on the fresh copy after a rebuild added all records, before it is swapped in."""
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def _is_current(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is not None and (
+            self.max_age_seconds <= 0 or time.monotonic() - loaded_at < self.max_age_seconds
+        )
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Build the index from the database on first use or once it is older than `max_age_seconds`."""
+        if self._is_current():
+            return
+        # One caller rebuilds; the others keep searching a stale index instead of waiting for it.
+        if not self._rebuild_lock.acquire(blocking=not self.is_loaded):
+            return
+        try:
+            if not self._is_current():
+                self._rebuild(db)
+        finally:
+            self._rebuild_lock.release()
+
+    def rebuild(self, db: Session) -> None:
+        """Replace the index contents with all currently approved records."""
+        with self._rebuild_lock:
+            self._rebuild(db)
+
+    def _rebuild(self, db: Session) -> None:
+        rows = db.query(
+            Record.id,
+            Record.department,
+            Record.schema_type,
+            Record.primary_key,
+            Record.data_json,
+            Record.completeness_score,
+        ).filter(Record.status == RecordStatus.APPROVED).yield_per(1000)
+
+        with self._lock:
+            self._pending_syncs = []
+        try:
+            fresh = copy.copy(self)
+            fresh._reset()
+            fresh._building = True
+            for row in rows:
+                fresh._add(IndexedRow.from_record(row))
+            fresh._finish_rebuild()
+
+            with self._lock:
+                for name in self._STATE:
+                    setattr(self, name, getattr(fresh, name))
+                for record_id, row in self._pending_syncs:
+                    self._apply(record_id, row)
+                self._loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending_syncs = None
+
+    def sync_record(self, record: Record) -> bool:
+        """
+        Apply a record's current state: index it if approved, drop it otherwise.
+
+        Returns whether search results may have changed, i.e. the record was or
+        is approved. Without a loaded index the previous state is unknown.
+        """
+        row = IndexedRow.from_record(record) if record.status == RecordStatus.APPROVED else None
+        return self._sync(record.id, row)
+
+    def remove(self, record_id: UUID) -> None:
+        self._sync(record_id, None)
+
+    def _sync(self, record_id: UUID, row: Optional[IndexedRow]) -> bool:
+        with self._lock:
+            if self._pending_syncs is not None:
+                self._pending_syncs.append((record_id, row))
+            if not self.is_loaded:
+                # The next search builds the index from the database anyway.
+                return True
+            return self._apply(record_id, row)
+
+    def _apply(self, record_id: UUID, row: Optional[IndexedRow]) -> bool:
+        was_indexed = self._remove(record_id)
+        if row is not None:
+            self._add(row)
+        return was_indexed or row is not None
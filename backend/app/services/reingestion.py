@@ -0,0 +1,92 @@
+import hashlib
+from dataclasses import dataclass, field
+
+
+def section_path_of(section) -> str:
+    """Section path as `ChunkingService` writes it onto the chunks of a section."""
+    if section.title:
+        return f"{section.path} > {section.title}" if section.path else section.title
+    return section.path
+
+
+class SectionHasher:
+    """Incremental `compute_section_hashes` for sections that are streamed."""
+
+    def __init__(self):
+        self._digests = {}
+
+    def update(self, section) -> None:
+        if not (section.content or "").strip():
+            return
+        digest = self._digests.setdefault(section_path_of(section), hashlib.sha256())
+        digest.update(section.content.strip().encode("utf-8"))
+        digest.update(b"\x00")
+
+    def hexdigests(self, raw_text: str = "") -> dict[str, str]:
+        if not self._digests and (raw_text or "").strip():
+            return {"": hashlib.sha256(raw_text.strip().encode("utf-8")).hexdigest()}
+        return {path: digest.hexdigest() for path, digest in self._digests.items()}
+
+
+def compute_section_hashes(parsed_doc) -> dict[str, str]:
+    """
+    Content hash per section path of a parsed document.
+
+    Sections sharing a path are hashed together in document order. A document
+    without sections is a single section with the empty path, the same way
+    chunking falls back to the raw text.
+    """
+    hasher = SectionHasher()
+    for section in parsed_doc.sections:
+        hasher.update(section)
+    return hasher.hexdigests(parsed_doc.raw_text)
+
+
+@dataclass
+class SectionDiff:
+    added: set[str] = field(default_factory=set)
+    changed: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    unchanged: set[str] = field(default_factory=set)
+
+    def needs_extraction(self, section_path: str | None) -> bool:
+        return (section_path or "") in self.added or (section_path or "") in self.changed
+
+    def is_unaffected(self, source_section: str | None) -> bool:
+        """
+        True if nothing at, above or below `source_section` changed.
+
+        Grouped extraction attributes records to a root section, so a change
+        in any of its subsections affects them as well.
+        """
+        if not source_section:
+            return False
+        for path in self.added | self.changed | self.removed:
+            if (
+                path == source_section
+                or path.startswith(f"{source_section} > ")
+                or source_section.startswith(f"{path} > ")
+            ):
+                return False
+        return True
+
+    def as_dict(self) -> dict:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "unchanged": len(self.unchanged),
+        }
+
+
+def diff_sections(previous: dict[str, str], current: dict[str, str]) -> SectionDiff:
+    diff = SectionDiff()
+    for path, content_hash in current.items():
+        if path not in previous:
+            diff.added.add(path)
+        elif previous[path] != content_hash:
+            diff.changed.add(path)
+        else:
+            diff.unchanged.add(path)
+    diff.removed = set(previous) - set(current)
+    return diff
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Hashable, Optional
+
+from app.config import get_settings
+
+
+@dataclass
+class _CacheEntry:
+    generation: int
+    expires_at: float
+    value: Any
+
+
+class SearchCache:
+    """
+    Process-local LRU cache for search responses with TTL expiry.
+
+    Every change to the set of searchable records bumps `generation`, which
+    drops all entries at once. Results computed while a bump happened are not
+    stored, so a response cached after a review action never predates it. The
+    TTL only bounds staleness caused by changes in other processes.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generation != self._generation or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """Store a value computed at `generation`; ignored if records changed in the meantime."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = _CacheEntry(generation, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+def search_cache_key(
+    q: str,
+    department: Optional[str],
+    schema_type: Optional[str],
+    limit: int,
+    mode: str,
+    min_similarity: Optional[float] = None,
+) -> tuple:
+    """Normalize query parameters. Lexical ranking is case-insensitive; embedding models may not be."""
+    normalized = " ".join(q.split())
+    if mode in ("lexical", "fuzzy"):
+        normalized = normalized.casefold()
+    return (normalized, department or None, schema_type or None, limit, mode, min_similarity)
+
+
+@lru_cache()
+def get_search_cache() -> SearchCache:
+    settings = get_settings()
+    return SearchCache(
+        max_entries=settings.search_cache_max_entries,
+        ttl_seconds=settings.search_cache_ttl_seconds,
+    )
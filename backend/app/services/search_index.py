@@ -0,0 +1,217 @@
+import heapq
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from app.config import get_settings
+from app.models.record import Record
+from app.services.record_index import IndexedRow, RecordIndex
+from app.services.search_cache import get_search_cache
+
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Provenance metadata (hashes, timestamps, API endpoints) is not searchable content.
+_IGNORED_DATA_KEYS = {"_source"}
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def iter_string_leaves(value: Any) -> Iterable[str]:
+    """Yield all string leaves of a nested JSON value."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key in _IGNORED_DATA_KEYS:
+                continue
+            yield from iter_string_leaves(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_string_leaves(item)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield str(value)
+
+
+@dataclass
+class _IndexedRecord:
+    department: str
+    schema_type: str
+    completeness_score: float
+    length: float
+    terms: dict[str, float]
+
+
+class SearchIndex(RecordIndex):
+    """
+    In-memory inverted index over approved records with BM25 ranking.
+
+    Postings map each token to the records containing it together with a
+    field-weighted term frequency; primary key tokens count more than tokens
+    from `data_json`. Department and schema filters are applied by intersecting
+    postings with per-filter record sets, so a query only touches records that
+    contain at least one query token.
+    """
+
+    PRIMARY_KEY_WEIGHT = 3.0
+
+    _STATE = ("_postings", "_records", "_by_department", "_by_schema", "_total_length")
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_age_seconds: float = 300.0):
+        self.k1 = k1
+        self.b = b
+        super().__init__(max_age_seconds=max_age_seconds)
+
+    def _reset(self):
+        self._postings: dict[str, dict[UUID, float]] = {}
+        self._records: dict[UUID, _IndexedRecord] = {}
+        self._by_department: dict[str, set[UUID]] = {}
+        self._by_schema: dict[str, set[UUID]] = {}
+        self._total_length = 0.0
+
+    def search(
+        self,
+        query: str,
+        department: Optional[str] = None,
+        schema_type: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[tuple[UUID, float]]:
+        """Return `(record_id, score)` pairs ordered by descending BM25 score."""
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+
+        with self._lock:
+            allowed = self._allowed_records(department, schema_type)
+            if allowed is not None and not allowed:
+                return []
+
+            record_count = len(self._records)
+            average_length = self._total_length / record_count if record_count else 0.0
+            scores: dict[UUID, float] = {}
+
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (record_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                if allowed is not None and len(allowed) < len(postings):
+                    matches = ((record_id, postings[record_id]) for record_id in allowed if record_id in postings)
+                elif allowed is not None:
+                    matches = ((record_id, tf) for record_id, tf in postings.items() if record_id in allowed)
+                else:
+                    matches = postings.items()
+
+                for record_id, tf in matches:
+                    length_ratio = self._records[record_id].length / average_length if average_length else 1.0
+                    norm = self.k1 * (1 - self.b + self.b * length_ratio)
+                    scores[record_id] = scores.get(record_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ranked = [
+                (record_id, round(score * (0.5 + self._records[record_id].completeness_score * 0.5), 4))
+                for record_id, score in scores.items()
+            ]
+
+        return heapq.nlargest(limit, ranked, key=lambda item: item[1])
+
+    def _allowed_records(self, department: Optional[str], schema_type: Optional[str]) -> Optional[set[UUID]]:
+        filters = []
+        if department:
+            filters.append(self._by_department.get(department, set()))
+        if schema_type:
+            filters.append(self._by_schema.get(schema_type, set()))
+        if not filters:
+            return None
+        filters.sort(key=len)
+        return set(filters[0]).intersection(*filters[1:])
+
+    def _add(self, row: IndexedRow) -> None:
+        terms: Counter = Counter()
+        for token in tokenize(row.primary_key or ""):
+            terms[token] += self.PRIMARY_KEY_WEIGHT
+        for leaf in iter_string_leaves(row.data_json or {}):
+            terms.update(tokenize(leaf))
+
+        indexed = _IndexedRecord(
+            department=row.department,
+            schema_type=row.schema_type,
+            completeness_score=row.completeness_score or 0.0,
+            length=float(sum(terms.values())),
+            terms=dict(terms),
+        )
+        self._records[row.id] = indexed
+        self._total_length += indexed.length
+        self._by_department.setdefault(row.department, set()).add(row.id)
+        self._by_schema.setdefault(row.schema_type, set()).add(row.id)
+        for term, frequency in indexed.terms.items():
+            self._postings.setdefault(term, {})[row.id] = frequency
+
+    def _remove(self, record_id: UUID) -> bool:
+        indexed = self._records.pop(record_id, None)
+        if indexed is None:
+            return False
+
+        self._total_length -= indexed.length
+        self._by_department.get(indexed.department, set()).discard(record_id)
+        self._by_schema.get(indexed.schema_type, set()).discard(record_id)
+        for term in indexed.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(record_id, None)
+            if not postings:
+                del self._postings[term]
+        return True
+
+
+@lru_cache()
+def get_search_index() -> SearchIndex:
+    settings = get_settings()
+    return SearchIndex(
+        k1=settings.search_bm25_k1,
+        b=settings.search_bm25_b,
+        max_age_seconds=settings.search_index_max_age_seconds,
+    )
+
+
+def sync_approved_records(records: Iterable[Record]) -> None:
+    """Propagate committed record changes (approval, edit, rejection) to the search structures."""
+    from app.services.suggest_index import get_suggest_index
+    from app.services.trigram_index import get_trigram_index
+
+    index = get_search_index()
+    trigram_index = get_trigram_index()
+    suggest_index = get_suggest_index()
+    changed = False
+    for record in records:
+        trigram_index.sync_record(record)
+        suggest_index.sync_record(record)
+        changed = index.sync_record(record) or changed
+    if changed:
+        get_search_cache().invalidate()
+
+
+def remove_records(record_ids: Iterable[UUID]) -> None:
+    """Drop deleted records, e.g. those of a deleted document, from the search structures."""
+    from app.services.suggest_index import get_suggest_index
+    from app.services.trigram_index import get_trigram_index
+
+    record_ids = list(record_ids)
+    if not record_ids:
+        return
+    index = get_search_index()
+    trigram_index = get_trigram_index()
+    suggest_index = get_suggest_index()
+    for record_id in record_ids:
+        trigram_index.remove(record_id)
+        suggest_index.remove(record_id)
+        index.remove(record_id)
+    get_search_cache().invalidate()
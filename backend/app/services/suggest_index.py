@@ -0,0 +1,139 @@
+import re
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+from uuid import UUID
+
+from app.config import get_settings
+from app.services.record_index import IndexedRow, RecordIndex
+
+
+# Top-level `data_json` fields offered as completions besides the primary key.
+SUGGEST_FIELDS = ("title", "name", "artnr")
+
+_WORD_START = re.compile(r"(?<!\w)\w", re.UNICODE)
+
+# (normalized key, record id, field, original value)
+_Entry = tuple[str, UUID, str, str]
+
+
+def normalize_prefix(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+@dataclass
+class _SuggestRecord:
+    department: str
+    schema_type: str
+    entries: list[_Entry]
+
+
+@dataclass
+class Suggestion:
+    record_id: UUID
+    text: str
+    field: str
+    department: str
+    schema_type: str
+
+
+class SuggestIndex(RecordIndex):
+    """
+    Sorted-array prefix index over completion values of approved records.
+
+    Every value is stored once per word start ("PV-Strip Pro" is found by
+    "pv", "strip" and "pro"), in one sorted list per department and one for
+    all departments. A lookup is a binary search followed by a scan of the
+    matching range, so latency depends on `limit`, not on the corpus size.
+    """
+
+    _STATE = ("_all", "_by_department", "_records")
+
+    def _reset(self):
+        self._all: list[_Entry] = []
+        self._by_department: dict[str, list[_Entry]] = {}
+        self._records: dict[UUID, _SuggestRecord] = {}
+
+    def _finish_rebuild(self) -> None:
+        # One sort per list instead of an insort per entry.
+        self._all.sort()
+        for entries in self._by_department.values():
+            entries.sort()
+
+    def suggest(self, prefix: str, department: Optional[str] = None, limit: int = 10) -> list[Suggestion]:
+        """Return completions for `prefix`, at most one per record, in alphabetical order."""
+        key = normalize_prefix(prefix)
+        if not key:
+            return []
+
+        with self._lock:
+            entries = self._by_department.get(department, []) if department else self._all
+            suggestions: list[Suggestion] = []
+            seen: set[UUID] = set()
+            position = bisect_left(entries, (key,))
+            while position < len(entries) and len(suggestions) < limit:
+                normalized, record_id, field, value = entries[position]
+                if not normalized.startswith(key):
+                    break
+                position += 1
+                if record_id in seen:
+                    continue
+                seen.add(record_id)
+                indexed = self._records[record_id]
+                suggestions.append(
+                    Suggestion(
+                        record_id=record_id,
+                        text=value,
+                        field=field,
+                        department=indexed.department,
+                        schema_type=indexed.schema_type,
+                    )
+                )
+
+        return suggestions
+
+    def _entries(self, record_id: UUID, primary_key: Optional[str], data_json: Any) -> list[_Entry]:
+        values = [("primary_key", primary_key)]
+        if isinstance(data_json, dict):
+            values.extend((field, data_json.get(field)) for field in SUGGEST_FIELDS)
+
+        entries = set()
+        for field, value in values:
+            if isinstance(value, bool) or not isinstance(value, (str, int)):
+                continue
+            value = str(value).strip()
+            normalized = normalize_prefix(value)
+            for match in _WORD_START.finditer(normalized):
+                entries.add((normalized[match.start():], record_id, field, value))
+        return sorted(entries)
+
+    def _add(self, row: IndexedRow) -> None:
+        entries = self._entries(row.id, row.primary_key, row.data_json)
+        self._records[row.id] = _SuggestRecord(row.department, row.schema_type, entries)
+        department_entries = self._by_department.setdefault(row.department, [])
+        if self._building:
+            # Sorted once in `_finish_rebuild`.
+            self._all.extend(entries)
+            department_entries.extend(entries)
+            return
+        for entry in entries:
+            insort(self._all, entry)
+            insort(department_entries, entry)
+
+    def _remove(self, record_id: UUID) -> bool:
+        indexed = self._records.pop(record_id, None)
+        if indexed is None:
+            return False
+        department_entries = self._by_department.get(indexed.department, [])
+        for entry in indexed.entries:
+            for entries in (self._all, department_entries):
+                position = bisect_left(entries, entry)
+                if position < len(entries) and entries[position] == entry:
+                    del entries[position]
+        return True
+
+
+@lru_cache()
+def get_suggest_index() -> SuggestIndex:
+    return SuggestIndex(max_age_seconds=get_settings().search_index_max_age_seconds)
@@ -0,0 +1,140 @@
+import heapq
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+from uuid import UUID
+
+from app.config import get_settings
+from app.services.record_index import IndexedRow, RecordIndex
+from app.services.search_index import tokenize
+
+
+# Top-level `data_json` fields that identify a record besides its primary key.
+FUZZY_LOOKUP_FIELDS = ("artnr", "product_id", "title", "name")
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Word trigrams as generated by pg_trgm: lowercase, two leading and one trailing blank per word."""
+    result = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(result)
+
+
+def trigram_similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    """pg_trgm `similarity()`: shared trigrams over the union of both sets."""
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def lookup_values(primary_key: Optional[str], data_json: Any) -> list[str]:
+    values = [primary_key] if primary_key else []
+    if isinstance(data_json, dict):
+        for field in FUZZY_LOOKUP_FIELDS:
+            value = data_json.get(field)
+            if isinstance(value, (str, int)) and not isinstance(value, bool) and str(value).strip():
+                values.append(str(value))
+    return values
+
+
+@dataclass
+class _FuzzyRecord:
+    department: str
+    schema_type: str
+    # One trigram set per lookup value and per word of multi-word values, so
+    # "strip" matches "Entmanteler PV-Strip Pro" like pg_trgm `word_similarity`.
+    variants: list[frozenset[str]]
+    trigrams: frozenset[str]
+
+
+class TrigramIndex(RecordIndex):
+    """
+    In-memory trigram index over primary keys and lookup fields of approved records.
+
+    Fallback for databases without pg_trgm (SQLite in tests and local
+    development). Candidates are collected from trigram postings and pruned by
+    an upper bound of the similarity before exact scores are computed.
+    """
+
+    _STATE = ("_postings", "_records")
+
+    def _reset(self):
+        self._postings: dict[str, set[UUID]] = {}
+        self._records: dict[UUID, _FuzzyRecord] = {}
+
+    def search(
+        self,
+        query: str,
+        department: Optional[str] = None,
+        schema_type: Optional[str] = None,
+        limit: int = 10,
+        min_similarity: float = 0.3,
+    ) -> list[tuple[UUID, float]]:
+        """Return `(record_id, similarity)` pairs with similarity >= `min_similarity`, best first."""
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return []
+
+        with self._lock:
+            shared_counts: dict[UUID, int] = {}
+            for trigram in query_trigrams:
+                for record_id in self._postings.get(trigram, ()):
+                    shared_counts[record_id] = shared_counts.get(record_id, 0) + 1
+
+            ranked = []
+            for record_id, shared in shared_counts.items():
+                # similarity <= shared / |query trigrams| for every variant.
+                if shared / len(query_trigrams) < min_similarity:
+                    continue
+                indexed = self._records[record_id]
+                if department and indexed.department != department:
+                    continue
+                if schema_type and indexed.schema_type != schema_type:
+                    continue
+                score = max(trigram_similarity(query_trigrams, variant) for variant in indexed.variants)
+                if score >= min_similarity:
+                    ranked.append((record_id, round(score, 4)))
+
+        return heapq.nlargest(limit, ranked, key=lambda item: item[1])
+
+    def _add(self, row: IndexedRow) -> None:
+        variants = []
+        for value in lookup_values(row.primary_key, row.data_json):
+            variants.append(trigrams(value))
+            words = tokenize(value)
+            if len(words) > 1:
+                variants.extend(trigrams(word) for word in words)
+        variants = [variant for variant in dict.fromkeys(variants) if variant]
+        if not variants:
+            return
+
+        indexed = _FuzzyRecord(
+            department=row.department,
+            schema_type=row.schema_type,
+            variants=variants,
+            trigrams=frozenset().union(*variants),
+        )
+        self._records[row.id] = indexed
+        for trigram in indexed.trigrams:
+            self._postings.setdefault(trigram, set()).add(row.id)
+
+    def _remove(self, record_id: UUID) -> bool:
+        indexed = self._records.pop(record_id, None)
+        if indexed is None:
+            return False
+        for trigram in indexed.trigrams:
+            postings = self._postings.get(trigram)
+            if postings is None:
+                continue
+            postings.discard(record_id)
+            if not postings:
+                del self._postings[trigram]
+        return True
+
+
+@lru_cache()
+def get_trigram_index() -> TrigramIndex:
+    return TrigramIndex(max_age_seconds=get_settings().search_index_max_age_seconds)
@@ -1,8 +1,12 @@
 import argparse
+import asyncio
 import socket
+import traceback
 from uuid import UUID
 
+from app.config import get_settings
 from app.database import SessionLocal
+from app.models.document import Document
 from app.models.job import Job, JobType
 from app.schemas.external_ingestion import WebsiteImportRequest
 from app.services.external_ingestion import WebsiteCrawlerImportService
@@ -13,13 +17,13 @@ from app.services.jobs import JobService
 def process_job(job: Job, worker_id: str) -> None:
     db = SessionLocal()
     jobs = JobService(db)
+    running = job
     try:
         running = jobs.mark_running(job.id, worker_id)
         result = _run_job(db, running)
-        jobs.mark_succeeded(running.id, result)
+        jobs.mark_succeeded(running.id, result, metrics=_document_metrics(db, running))
     except Exception as exc:
-        db.rollback()
-        JobService(db).mark_failed(job.id, str(exc), retryable=True)
+        _mark_failed(db, running, str(exc))
         raise
     finally:
         db.close()
@@ -39,6 +43,90 @@ def run_once(worker_id: str, job_types: list[JobType] | None = None) -> bool:
     return True
 
 
+def claim_next_job(worker_id: str, job_types: list[JobType] | None = None) -> Job | None:
+    """Mark the oldest queued job as running and return it detached from its session."""
+    db = SessionLocal()
+    try:
+        jobs = JobService(db)
+        job = jobs.next_queued(job_types)
+        if not job:
+            return None
+        running = jobs.mark_running(job.id, worker_id)
+        db.expunge(running)
+        return running
+    finally:
+        db.close()
+
+
+async def process_claimed_job_async(job: Job) -> None:
+    """
+    Finish a claimed job on the event loop.
+
+    Document ingestion runs as `process_document_async`, so several documents
+    share one process while they wait for the LLM; other job types run in a
+    thread.
+    """
+    db = SessionLocal()
+    try:
+        if job.job_type == JobType.DOCUMENT_INGESTION:
+            document_id = UUID(job.payload_json["document_id"])
+            await IngestionService(db).process_document_async(document_id)
+            result = {"document_id": str(document_id)}
+        else:
+            result = await asyncio.to_thread(_run_job, db, job)
+        metrics = await asyncio.to_thread(_document_metrics, db, job)
+        await asyncio.to_thread(JobService(db).mark_succeeded, job.id, result, metrics)
+    except Exception as exc:
+        await asyncio.to_thread(_mark_failed, db, job, str(exc))
+        raise
+    finally:
+        db.close()
+
+
+async def run_concurrently(worker_id: str, job_types: list[JobType] | None, concurrency: int) -> int:
+    """Process queued jobs with up to `concurrency` jobs in flight until the queue is empty."""
+    claim_lock = asyncio.Lock()
+    processed = 0
+
+    async def slot():
+        nonlocal processed
+        while True:
+            # One claim at a time, otherwise two slots could pick the same job.
+            async with claim_lock:
+                job = await asyncio.to_thread(claim_next_job, worker_id, job_types)
+            if job is None:
+                return
+            try:
+                await process_claimed_job_async(job)
+            except Exception as exc:
+                print(f"Error processing job {job.id}: {exc}")
+                traceback.print_exc()
+            processed += 1
+
+    await asyncio.gather(*(slot() for _ in range(max(concurrency, 1))))
+    return processed
+
+
+def _mark_failed(db, job: Job, error_message: str) -> None:
+    db.rollback()
+    # The failure may come from the payload itself; the metrics lookup must not keep the job RUNNING.
+    try:
+        metrics = _document_metrics(db, job)
+    except Exception:
+        db.rollback()
+        metrics = None
+    JobService(db).mark_failed(job.id, error_message, retryable=True, metrics=metrics)
+
+
+def _document_metrics(db, job: Job) -> dict | None:
+    """Pipeline metrics the ingestion run stored on its document, copied onto the job."""
+    if job.job_type != JobType.DOCUMENT_INGESTION:
+        return None
+    document_id = UUID(job.payload_json["document_id"])
+    row = db.query(Document.metrics_json).filter(Document.id == document_id).first()
+    return row[0] if row else None
+
+
 def _run_job(db, job: Job) -> dict:
     if job.job_type == JobType.DOCUMENT_INGESTION:
         document_id = UUID(job.payload_json["document_id"])
@@ -65,9 +153,20 @@ def main() -> None:
     parser.add_argument("--once", action="store_true", help="Process at most one queued job")
     parser.add_argument("--worker-id", default=socket.gethostname())
     parser.add_argument("--job-type", action="append", choices=[item.value for item in JobType])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=get_settings().ingestion_worker_concurrency,
+        help="Jobs in flight at once; above 1 documents are ingested concurrently on one event loop",
+    )
     args = parser.parse_args()
 
     job_types = parse_job_types(args.job_type)
+    if not args.once and args.concurrency > 1:
+        processed = asyncio.run(run_concurrently(args.worker_id, job_types, args.concurrency))
+        print(f"processed={processed}")
+        return
+
     processed = run_once(args.worker_id, job_types)
     if args.once:
         print("processed=1" if processed else "processed=0")
@@ -0,0 +1,127 @@
+"""
+Chunking benchmark with synthetic PDF text extracts.
+
+Builds one large section per input shape and size, runs
+`ChunkingService.create_chunks` on it and reports the best and median
+wall-clock seconds, throughput and chunk count as JSON.
+
+    python -m benchmarks.chunking_benchmark --sizes 100000 1000000 --repeat 5
+
+Shapes:
+    paragraphs  headings and paragraphs separated by blank lines
+    blank_runs  short lines separated by long runs of blank lines
+    dense_lines short lines without any blank line, i.e. one large block
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime
+from typing import Optional
+
+from app.parsers.base import ParsedDocument, ParsedSection
+from app.services.chunking import ChunkingService
+
+VOCABULARY = [
+    "abisolierzange", "entmanteler", "kabelmesser", "crimpzange", "solarkabel", "koaxialkabel",
+    "rundkabel", "flachkabel", "netzwerkkabel", "aderendhuelse", "klinge", "ersatzklinge",
+    "schnitttiefe", "isolierung", "querschnitt", "leiter", "mantel", "zugentlastung",
+    "sicherheit", "elektriker", "schaltschrank", "photovoltaik", "wallbox", "glasfaser",
+]
+
+SHAPES = ["paragraphs", "blank_runs", "dense_lines"]
+
+
+def _sentence(rng: random.Random, minimum: int, maximum: int) -> str:
+    words = rng.choices(VOCABULARY, k=rng.randint(minimum, maximum))
+    return " ".join(words).capitalize() + "."
+
+
+def build_text(shape: str, size: int, seed: int = 42) -> str:
+    """Synthetic extract of roughly `size` characters."""
+    rng = random.Random(seed)
+    lines: list[str] = []
+    length = 0
+    while length < size:
+        if shape == "paragraphs":
+            heading = f"{rng.randint(1, 20)}.{rng.randint(1, 9)} {rng.choice(VOCABULARY).capitalize()} Serie"
+            paragraph = [_sentence(rng, 8, 20) for _ in range(rng.randint(2, 6))]
+            block = [heading, *paragraph, ""]
+        elif shape == "blank_runs":
+            block = [_sentence(rng, 4, 12), *[""] * rng.randint(50, 300)]
+        elif shape == "dense_lines":
+            block = [_sentence(rng, 3, 10)]
+        else:
+            raise ValueError(f"Unbekannte Form: {shape}")
+        lines.extend(block)
+        length += sum(len(line) + 1 for line in block)
+    return "\n".join(lines)
+
+
+def parsed_document(text: str) -> ParsedDocument:
+    return ParsedDocument(
+        raw_text=text,
+        sections=[
+            ParsedSection(title=None, content=text, level=0, start_offset=0, end_offset=len(text), path="")
+        ],
+        confidence=1.0,
+        file_type="pdf",
+    )
+
+
+def time_chunking(service: ChunkingService, parsed_doc: ParsedDocument, repeat: int) -> dict:
+    timings = []
+    chunk_count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunk_count = len(service.create_chunks(parsed_doc))
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "best_seconds": round(best, 4),
+        "median_seconds": round(statistics.median(timings), 4),
+        "mb_per_second": round(len(parsed_doc.raw_text) / (1024 * 1024) / best, 2) if best else None,
+        "chunks": chunk_count,
+    }
+
+
+def run_benchmark(sizes: list[int], shapes: list[str], repeat: int = 3, seed: int = 42) -> dict:
+    service = ChunkingService()
+    report = {
+        "started_at": datetime.utcnow().isoformat(),
+        "seed": seed,
+        "repeat": repeat,
+        "runs": [],
+    }
+    for size in sizes:
+        for shape in shapes:
+            parsed_doc = parsed_document(build_text(shape, size, seed=seed))
+            report["runs"].append({
+                "size": size,
+                "shape": shape,
+                **time_chunking(service, parsed_doc, repeat),
+            })
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000], help="Characters per input")
+    parser.add_argument("--shapes", nargs="+", default=SHAPES, choices=SHAPES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(sizes=args.sizes, shapes=args.shapes, repeat=args.repeat, seed=args.seed)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Search benchmark with a synthetic knowledge corpus.
+
+Generates approved records with documents, chunks and evidence for every
+schema in the SchemaRegistry, replays a mix of query shapes against
+`search_knowledge` and reports p50/p95/p99 latency, DB round trips per query
+and peak RSS as JSON.
+
+SQLite (schema is created automatically):
+
+    python -m benchmarks.search_benchmark --database-url sqlite:///./bench.db \
+        --sizes 1000 10000 --output bench-sqlite.json
+
+Postgres (database must be migrated with `alembic upgrade head`):
+
+    python -m benchmarks.search_benchmark --database-url postgresql://localhost/bench \
+        --sizes 1000 10000 100000 --reset --output bench-postgres.json
+
+`--reset` deletes all documents, chunks, evidence and records in the target
+database before every corpus size. Never point it at a real database.
+"""
+import argparse
+import asyncio
+import json
+import random
+import resource
+import sys
+import time
+import typing
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.chunk import Chunk
+from app.models.document import Confidentiality, Document, DocumentStatus
+from app.models.evidence import Evidence
+from app.models.record import Record, RecordStatus
+from app.schemas.knowledge.registry import get_schema_registry
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(_type, _compiler, **_kw):
+    return "CHAR(36)"
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(_type, _compiler, **_kw):
+    return "JSON"
+
+
+@compiles(Vector, "sqlite")
+def _compile_vector_sqlite(_type, _compiler, **_kw):
+    return "JSON"
+
+
+VOCABULARY = [
+    "abisolierzange", "entmanteler", "kabelmesser", "crimpzange", "solarkabel", "koaxialkabel",
+    "rundkabel", "flachkabel", "netzwerkkabel", "aderendhuelse", "klinge", "ersatzklinge",
+    "schnitttiefe", "isolierung", "querschnitt", "leiter", "mantel", "zugentlastung",
+    "sicherheit", "schutzbrille", "handschuhe", "elektriker", "installateur", "baustelle",
+    "schaltschrank", "verteiler", "photovoltaik", "wallbox", "glasfaser", "datentechnik",
+    "preis", "qualitaet", "garantie", "lieferzeit", "ergonomie", "zeitersparnis",
+    "schulung", "einwand", "kunde", "haendler", "grosshandel", "fachhandel",
+    "wartung", "reinigung", "einstellung", "anleitung", "fehler", "ursache", "loesung",
+    "norm", "zertifikat", "vde", "ce", "rohs", "reach", "claim", "werbung", "aussage",
+]
+
+ZIPF_WEIGHTS = [1.0 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+QUESTION_STARTS = ["wie", "warum", "wann", "welche", "was", "womit"]
+
+
+@dataclass
+class BenchmarkQuery:
+    shape: str
+    q: str
+    department: Optional[str] = None
+    schema_type: Optional[str] = None
+    mode: str = "lexical"
+
+
+class CorpusGenerator:
+    """Builds schema-conforming synthetic `data_json` payloads with a shared vocabulary."""
+
+    def __init__(self, seed: int = 42):
+        self.random = random.Random(seed)
+        self.article_numbers: list[str] = []
+        self.primary_keys: dict[str, list[str]] = defaultdict(list)
+
+    def words(self, minimum: int, maximum: int) -> str:
+        # Zipf weights so some terms are common and others rare, as in real catalogs.
+        count = self.random.randint(minimum, maximum)
+        return " ".join(self.random.choices(VOCABULARY, weights=ZIPF_WEIGHTS, k=count))
+
+    def article_number(self) -> str:
+        value = str(self.random.randint(10000, 99999))
+        self.article_numbers.append(value)
+        return value
+
+    def field_value(self, name: str, annotation: Any) -> Any:
+        origin = typing.get_origin(annotation)
+        if origin is typing.Union:
+            annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+            origin = typing.get_origin(annotation)
+
+        if name in {"artnr", "product_id", "product_code"}:
+            return self.article_number()
+        if origin is list:
+            return [self.words(2, 6) for _ in range(self.random.randint(1, 4))]
+        if origin is dict or annotation is dict:
+            return {self.random.choice(VOCABULARY): self.words(1, 3) for _ in range(self.random.randint(1, 3))}
+        if annotation in (int, float):
+            return round(self.random.uniform(0, 10), 1)
+        if name in {"id", "version"}:
+            return f"{name.upper()}-{self.random.randint(1, 999999):06d}"
+        if name in {"title", "name", "subject", "category", "scenario", "role", "topic"}:
+            return self.words(2, 4).title()
+        return self.words(8, 40)
+
+    def record_data(self, schema) -> dict:
+        data = {name: self.field_value(name, field.annotation) for name, field in schema.model_fields.items()}
+        primary_key = schema.compute_primary_key(data)
+        self.primary_keys[schema.__name__].append(primary_key)
+        return data
+
+
+def seed_corpus(db: Session, size: int, seed: int = 42, with_embeddings: bool = False, batch_size: int = 2000):
+    """Insert `size` approved records spread evenly over all registered schemas."""
+    registry = get_schema_registry()
+    schemas = []
+    for doc_type, schema in registry._schemas.items():
+        department = next(
+            department
+            for department, doc_types in registry._department_doc_types.items()
+            if doc_type in doc_types
+        )
+        schemas.append((department, doc_type, schema))
+
+    generator = CorpusGenerator(seed)
+    documents = []
+    for department, doc_type, _schema in schemas:
+        documents.append({
+            "id": uuid.uuid4(),
+            "filename": f"synthetic-{doc_type.value}.docx",
+            "department": department,
+            "doc_type": doc_type,
+            "version_date": datetime.utcnow(),
+            "owner": "benchmark",
+            "confidentiality": Confidentiality.INTERNAL,
+            "status": DocumentStatus.COMPLETED,
+            "uploaded_at": datetime.utcnow(),
+        })
+    db.execute(insert(Document), documents)
+
+    embeddings = None
+    if with_embeddings:
+        from app.services.embeddings import get_embedding_provider
+        embeddings = get_embedding_provider()
+
+    now = datetime.utcnow()
+    for start in range(0, size, batch_size):
+        records, chunks, evidence = [], [], []
+        for number in range(start, min(start + batch_size, size)):
+            department, doc_type, schema = schemas[number % len(schemas)]
+            document = documents[number % len(schemas)]
+            data = generator.record_data(schema)
+            record_id, chunk_id = uuid.uuid4(), uuid.uuid4()
+            chunk_text = " ".join(str(value) for value in data.values() if isinstance(value, str))
+
+            records.append({
+                "id": record_id,
+                "document_id": document["id"],
+                "department": department,
+                "schema_type": schema.__name__,
+                "primary_key": schema.compute_primary_key(data),
+                "data_json": data,
+                "completeness_score": registry.compute_completeness_score(doc_type, data),
+                "status": RecordStatus.APPROVED,
+                "version": 1,
+                "created_at": now,
+                "updated_at": now,
+            })
+            chunks.append({
+                "id": chunk_id,
+                "document_id": document["id"],
+                "section_path": schema.__name__,
+                "text": chunk_text,
+                "confidence": 1.0,
+                "chunk_index": number,
+            })
+            for field_path in schema.get_required_fields()[:2]:
+                evidence.append({
+                    "id": uuid.uuid4(),
+                    "record_id": record_id,
+                    "chunk_id": chunk_id,
+                    "field_path": field_path,
+                    "excerpt": str(data.get(field_path, ""))[:500],
+                })
+
+        if embeddings is not None:
+            vectors = embeddings.embed_batch([chunk["text"] for chunk in chunks])
+            for chunk, vector in zip(chunks, vectors):
+                chunk["embedding"] = vector
+
+        db.execute(insert(Chunk), chunks)
+        db.execute(insert(Record), records)
+        db.execute(insert(Evidence), evidence)
+        db.commit()
+
+    return generator
+
+
+def build_queries(generator: CorpusGenerator, count: int, modes: list[str], seed: int = 7) -> list[BenchmarkQuery]:
+    """Mix of query shapes seen from agents and the search UI."""
+    rng = random.Random(seed)
+    registry = get_schema_registry()
+    departments = [department.value for department in registry._department_doc_types]
+    schema_names = list(generator.primary_keys)
+
+    def typo(value: str) -> str:
+        if len(value) < 3:
+            return value
+        position = rng.randrange(1, len(value) - 1)
+        return value[:position] + value[position + 1] + value[position] + value[position + 2:]
+
+    shapes = {
+        "article_number": lambda: BenchmarkQuery("article_number", rng.choice(generator.article_numbers)),
+        "keyword": lambda: BenchmarkQuery("keyword", rng.choice(VOCABULARY)),
+        "phrase": lambda: BenchmarkQuery("phrase", " ".join(rng.sample(VOCABULARY, 3))),
+        "question": lambda: BenchmarkQuery(
+            "question", f"{rng.choice(QUESTION_STARTS)} {' '.join(rng.sample(VOCABULARY, 5))}?"
+        ),
+        "department_filter": lambda: BenchmarkQuery(
+            "department_filter", rng.choice(VOCABULARY), department=rng.choice(departments)
+        ),
+        "schema_filter": lambda: BenchmarkQuery(
+            "schema_filter", " ".join(rng.sample(VOCABULARY, 2)), schema_type=rng.choice(schema_names)
+        ),
+        "primary_key_typo": lambda: BenchmarkQuery(
+            "primary_key_typo", typo(rng.choice(generator.article_numbers)), mode="fuzzy"
+        ),
+    }
+
+    queries = []
+    for _ in range(count):
+        query = rng.choice(list(shapes.values()))()
+        if query.mode == "fuzzy" and "fuzzy" not in modes:
+            continue
+        if query.mode != "fuzzy":
+            query.mode = rng.choice([mode for mode in modes if mode != "fuzzy"] or ["lexical"])
+        queries.append(query)
+    return queries
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Linear interpolation between closest ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies: list[float], round_trips: list[int]) -> dict:
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_round_trips": round(sum(round_trips) / len(round_trips), 2) if round_trips else 0.0,
+        "max_round_trips": max(round_trips, default=0),
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def reset_search_state() -> None:
+    """Drop process-local indexes and caches so every corpus size starts cold."""
+    from app.services.search_cache import get_search_cache
+    from app.services.search_index import get_search_index
+    from app.services.suggest_index import get_suggest_index
+    from app.services.trigram_index import get_trigram_index
+
+    for factory in (get_search_index, get_trigram_index, get_suggest_index, get_search_cache):
+        factory.cache_clear()
+
+
+def run_queries(db: Session, queries: list[BenchmarkQuery], limit: int = 10, use_cache: bool = False) -> dict:
+    """Replay queries through `search_knowledge`; returns summaries per mode and shape."""
+    from app.api.search import search_knowledge
+    from app.models.document import Department
+    from app.services.search_cache import get_search_cache
+
+    round_trips = [0]
+
+    def count_round_trip(*_args):
+        round_trips[0] += 1
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count_round_trip)
+    samples: dict[tuple[str, str], tuple[list[float], list[int]]] = defaultdict(lambda: ([], []))
+    loop = asyncio.new_event_loop()
+    try:
+        # Warm-up: first queries per mode build the in-memory indexes.
+        warmup = {}
+        for mode in dict.fromkeys(query.mode for query in queries):
+            started = time.perf_counter()
+            loop.run_until_complete(search_knowledge(
+                q="benchmark", department=None, schema_type=None, limit=limit,
+                mode=mode, min_similarity=None, db=db,
+            ))
+            warmup[mode] = round((time.perf_counter() - started) * 1000, 3)
+
+        for query in queries:
+            if not use_cache:
+                get_search_cache().invalidate()
+            round_trips[0] = 0
+            started = time.perf_counter()
+            loop.run_until_complete(search_knowledge(
+                q=query.q,
+                department=Department(query.department) if query.department else None,
+                schema_type=query.schema_type,
+                limit=limit,
+                mode=query.mode,
+                min_similarity=None,
+                db=db,
+            ))
+            latencies, trips = samples[(query.mode, query.shape)]
+            latencies.append((time.perf_counter() - started) * 1000)
+            trips.append(round_trips[0])
+            db.rollback()
+    finally:
+        loop.close()
+        event.remove(engine, "before_cursor_execute", count_round_trip)
+
+    modes: dict[str, dict] = {}
+    for (mode, shape), (latencies, trips) in sorted(samples.items()):
+        entry = modes.setdefault(mode, {"warmup_ms": warmup.get(mode), "shapes": {}, "_all": ([], [])})
+        entry["shapes"][shape] = summarize(latencies, trips)
+        entry["_all"][0].extend(latencies)
+        entry["_all"][1].extend(trips)
+    for entry in modes.values():
+        entry["overall"] = summarize(*entry.pop("_all"))
+    return modes
+
+
+def clear_corpus(db: Session) -> None:
+    for model in (Evidence, Record, Chunk, Document):
+        db.query(model).delete(synchronize_session=False)
+    db.commit()
+
+
+def run_benchmark(
+    database_url: str,
+    sizes: list[int],
+    queries_per_size: int,
+    modes: list[str],
+    seed: int = 42,
+    reset: bool = False,
+    with_embeddings: bool = False,
+    use_cache: bool = False,
+) -> dict:
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(bind=engine)
+
+    report = {
+        "database": engine.dialect.name,
+        "started_at": datetime.utcnow().isoformat(),
+        "seed": seed,
+        "modes": modes,
+        "queries_per_size": queries_per_size,
+        "with_embeddings": with_embeddings,
+        "use_cache": use_cache,
+        "runs": [],
+    }
+
+    for size in sizes:
+        with Session(bind=engine) as db:
+            if db.query(Record.id).first() is not None:
+                if not reset:
+                    raise SystemExit("Zieldatenbank enthaelt bereits Records; --reset verwenden")
+                clear_corpus(db)
+
+            started = time.perf_counter()
+            generator = seed_corpus(db, size, seed=seed, with_embeddings=with_embeddings)
+            seed_seconds = round(time.perf_counter() - started, 2)
+
+            reset_search_state()
+            queries = build_queries(generator, queries_per_size, modes, seed=seed + size)
+            report["runs"].append({
+                "size": size,
+                "seed_seconds": seed_seconds,
+                "modes": run_queries(db, queries, use_cache=use_cache),
+                "peak_rss_mb": peak_rss_mb(),
+            })
+
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=500, help="Queries per corpus size")
+    parser.add_argument(
+        "--modes", nargs="+", default=["lexical", "fuzzy"],
+        choices=["lexical", "semantic", "hybrid", "fuzzy"],
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Delete existing corpus data first")
+    parser.add_argument("--with-embeddings", action="store_true", help="Required for semantic/hybrid modes")
+    parser.add_argument("--use-cache", action="store_true", help="Keep the search result cache enabled")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if {"semantic", "hybrid"} & set(args.modes) and not args.with_embeddings:
+        parser.error("--modes semantic/hybrid benoetigen --with-embeddings")
+
+    report = run_benchmark(
+        database_url=args.database_url,
+        sizes=args.sizes,
+        queries_per_size=args.queries,
+        modes=args.modes,
+        seed=args.seed,
+        reset=args.reset,
+        with_embeddings=args.with_embeddings,
+        use_cache=args.use_cache,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -51,6 +51,16 @@ def db_session(engine):
         session.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    """Search results are cached per process; start every test with an empty cache."""
+    from app.services.search_cache import get_search_cache
+
+    get_search_cache.cache_clear()
+    yield
+    get_search_cache.cache_clear()
+
+
 @pytest.fixture
 def sample_docx_content():
     """Sample DOCX-like content for testing."""
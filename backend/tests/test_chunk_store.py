@@ -0,0 +1,74 @@
+from datetime import datetime
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app.models.chunk import Chunk
+from app.models.document import Confidentiality, Department, DocType, Document, DocumentStatus
+from app.services.chunk_store import bulk_insert_chunks, encode_vector
+from app.services.chunking import TextChunk
+from app.services.embeddings import HashingEmbeddingProvider
+
+
+def test_encode_vector_round_trips_float32_exactly():
+    vector = np.random.default_rng(1).standard_normal(1536).astype(np.float32)
+
+    encoded = encode_vector(vector)
+    decoded = np.array(encoded[1:-1].split(","), dtype=np.float32)
+
+    assert encoded.startswith("[") and encoded.endswith("]")
+    assert np.array_equal(decoded, vector)
+
+
+def test_bulk_insert_chunks_uses_one_statement_per_batch_and_maps_chunk_indexes(db_session):
+    document = Document(
+        id=uuid4(),
+        filename="katalog.pdf",
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        version_date=datetime.utcnow(),
+        owner="qa",
+        confidentiality=Confidentiality.INTERNAL,
+        status=DocumentStatus.PARSING,
+    )
+    db_session.add(document)
+    db_session.commit()
+
+    text_chunks = [
+        TextChunk(
+            text=f"Abschnitt {index}",
+            section_path="Katalog",
+            start_offset=index,
+            end_offset=index + 1,
+            chunk_index=index,
+        )
+        for index in range(5)
+    ]
+    embeddings = HashingEmbeddingProvider(dimensions=1536).embed_batch([chunk.text for chunk in text_chunks])
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        chunk_ids = bulk_insert_chunks(db_session, document.id, text_chunks, embeddings, batch_size=2)
+        db_session.commit()
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert len([statement for statement in statements if statement.startswith("INSERT")]) == 3
+    stored = {chunk.chunk_index: chunk for chunk in db_session.query(Chunk).all()}
+    assert {index: chunk.id for index, chunk in stored.items()} == chunk_ids
+    assert np.allclose(np.asarray(stored[3].embedding, dtype=np.float32), embeddings[3])
+
+
+def test_bulk_insert_chunks_sends_compact_vector_text_to_postgres(db_session, monkeypatch):
+    captured = []
+    monkeypatch.setattr(db_session.get_bind().dialect, "name", "postgresql")
+    monkeypatch.setattr(db_session, "execute", lambda statement: captured.append(statement))
+    text_chunks = [TextChunk(text="Kabel", section_path="", start_offset=0, end_offset=5, chunk_index=0)]
+
+    bulk_insert_chunks(db_session, uuid4(), text_chunks, np.ones((1, 1536), dtype=np.float32))
+
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert "CAST(%(param_1)s AS VECTOR(1536))" in sql
@@ -1,5 +1,8 @@
+import pytest
+
 from app.parsers.base import ParsedDocument, ParsedSection
-from app.services.chunking import ChunkingService
+from app.services.chunking import ChunkingService, _TextBlock
+from benchmarks.chunking_benchmark import SHAPES, build_text, parsed_document
 
 
 def test_chunking_splits_multi_entity_text_into_multiple_chunks():
@@ -36,3 +39,131 @@ def test_chunking_splits_multi_entity_text_into_multiple_chunks():
     assert len(chunks) >= 3
     assert any("JOKARI XL" in chunk.text for chunk in chunks)
     assert max(len(chunk.text) for chunk in chunks) <= service.max_chars + service.overlap_chars
+
+
+class LegacyChunkingService(ChunkingService):
+    """
+    Block builder before the single-pass rewrite, kept as a reference.
+
+    It located each block with `normalized.find(block_text, ...)`. The joined
+    block text is not verbatim in the source when its lines were indented, so
+    the search could match a later duplicate block instead; the rewrite keeps
+    the block's own position. Apart from that, the outputs are identical.
+    """
+
+    def _build_blocks(self, text, base_offset):
+        normalized = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines = normalized.split("\n")
+        blocks = []
+        current_lines = []
+        current_start = None
+        search_cursor = 0
+
+        def flush_block():
+            nonlocal current_lines, current_start
+            block_text = "\n".join(current_lines).strip()
+            if not block_text:
+                current_lines = []
+                current_start = None
+                return
+
+            block_position = normalized.find(block_text, current_start if current_start is not None else search_cursor)
+            if block_position < 0:
+                block_position = current_start if current_start is not None else search_cursor
+
+            blocks.append(
+                _TextBlock(
+                    text=block_text,
+                    start_offset=base_offset + block_position,
+                    end_offset=base_offset + block_position + len(block_text),
+                )
+            )
+            current_lines = []
+            current_start = None
+
+        for index, raw_line in enumerate(lines):
+            line = raw_line.strip()
+            next_line = next((candidate.strip() for candidate in lines[index + 1 :] if candidate.strip()), None)
+
+            if not line:
+                flush_block()
+                continue
+
+            line_position = normalized.find(line, search_cursor)
+            if line_position >= 0:
+                search_cursor = line_position + len(line)
+
+            if self._is_heading_like(line, next_line):
+                flush_block()
+                current_lines = [line]
+                current_start = line_position if line_position >= 0 else search_cursor
+                continue
+
+            if current_start is None:
+                current_start = line_position if line_position >= 0 else search_cursor
+
+            current_lines.append(line)
+
+        flush_block()
+        return blocks
+
+
+def _multi_entity_content():
+    return "\n".join(
+        [
+            "Das Entmanteler-Prinzip",
+            " ".join(["Grundlagen und Nutzenargumente fuer die Vertriebsschulung."] * 12),
+            "JOKARI XL",
+            " ".join(["Produktdetails und Verkaufsargumente fuer den JOKARI XL."] * 18),
+            "SECURA No. 15",
+            " ".join(["Einsatzbereich, Zielgruppe und USPs fuer SECURA No. 15."] * 18),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        _multi_entity_content(),
+        _multi_entity_content().replace("\n", "\r\n"),
+        "\n\n\n" + "\n\n\n\n".join(
+            f"  Kapitel {index} Abisolieren  \n"
+            f"   Die Abisolierzange Nr. {index} entfernt den Mantel von Rundkabeln sicher.   "
+            for index in range(40)
+        ) + "\n\n",
+        *(build_text(shape, 20_000, seed=5) for shape in SHAPES),
+    ],
+    ids=["multi_entity", "crlf", "indented", *SHAPES],
+)
+def test_single_pass_block_builder_matches_legacy_output(text):
+    service = ChunkingService(max_chunk_size=80, overlap=10, min_chunk_size=20)
+    legacy = LegacyChunkingService(max_chunk_size=80, overlap=10, min_chunk_size=20)
+
+    assert service._build_blocks(text, 17) == legacy._build_blocks(text, 17)
+    assert service.create_chunks(parsed_document(text)) == legacy.create_chunks(parsed_document(text))
+
+
+def test_block_offsets_point_into_normalized_text():
+    service = ChunkingService()
+    text = "Erste Zeile\r\n  zweite Zeile\r\n\r\n\r\nDritter Absatz mit Text\n"
+    normalized = text.replace("\r\n", "\n")
+
+    blocks = service._build_blocks(text, 0)
+
+    assert [block.text for block in blocks] == ["Erste Zeile\nzweite Zeile", "Dritter Absatz mit Text"]
+    assert normalized[blocks[0].start_offset :].startswith("Erste Zeile")
+    assert normalized[blocks[1].start_offset : blocks[1].end_offset] == "Dritter Absatz mit Text"
+
+
+def test_indented_block_keeps_its_own_offset_when_a_later_block_repeats_it():
+    service = ChunkingService()
+    legacy = LegacyChunkingService()
+    block = "Die Zange entfernt den Mantel\nvon Rundkabeln sicher."
+    text = "Die Zange entfernt den Mantel\n  von Rundkabeln sicher.\n\n" + block + "\n"
+    duplicate_position = text.index(block)
+
+    blocks = service._build_blocks(text, 0)
+
+    assert [(b.text, b.start_offset) for b in blocks] == [(block, 0), (block, duplicate_position)]
+    # The legacy lookup matched the second, unindented copy for both blocks.
+    assert [b.start_offset for b in legacy._build_blocks(text, 0)] == [duplicate_position, duplicate_position]
@@ -0,0 +1,19 @@
+from benchmarks.chunking_benchmark import SHAPES, build_text, run_benchmark
+
+
+def test_build_text_is_deterministic_and_reaches_requested_size():
+    for shape in SHAPES:
+        text = build_text(shape, 5_000, seed=3)
+        assert len(text) >= 4_000
+        assert text == build_text(shape, 5_000, seed=3)
+
+
+def test_benchmark_reports_every_shape_and_size():
+    report = run_benchmark(sizes=[2_000, 8_000], shapes=SHAPES, repeat=2, seed=1)
+
+    assert [(run["size"], run["shape"]) for run in report["runs"]] == [
+        (size, shape) for size in (2_000, 8_000) for shape in SHAPES
+    ]
+    for run in report["runs"]:
+        assert run["chunks"] > 0
+        assert run["best_seconds"] <= run["median_seconds"]
@@ -0,0 +1,90 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.extractors.base import ExtractionContext, describe_schema
+from app.extractors.claude import ClaudeExtractor, is_cacheable_prefix, prompt_cache_min_tokens
+from app.schemas.knowledge.registry import get_schema_registry
+from app.models.document import DocType
+
+
+class FakeMessages:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        text, usage = self.responses.pop(0)
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)], usage=SimpleNamespace(**usage))
+
+
+def _context(chunk_index, filename="katalog.pdf"):
+    return ExtractionContext(
+        department="product",
+        doc_type="product_spec",
+        document_id="doc-1",
+        filename=filename,
+        chunk_index=chunk_index,
+        chunk_total=2,
+        section_path=f"Seite {chunk_index + 1}",
+    )
+
+
+def test_system_prompt_has_one_static_prefix_for_all_units():
+    extractor = ClaudeExtractor()
+    schema = get_schema_registry().get_schema(DocType.PRODUCT_SPEC)
+
+    first = extractor._build_system_prompt(schema, _context(0))
+    second = extractor._build_system_prompt(schema, _context(1, filename="anderer-katalog.pdf"))
+
+    assert first[0]["text"] is second[0]["text"]
+    assert "JSON SCHEMA:" in first[0]["text"]
+    assert "katalog.pdf" not in first[0]["text"]
+    assert "cache_control" not in first[1]
+    assert "- Chunk: 2 von 2" in second[1]["text"]
+    assert describe_schema(schema) is describe_schema(schema)
+
+
+def test_static_prefix_is_only_marked_for_caching_above_the_model_minimum():
+    schema = get_schema_registry().get_schema(DocType.TRAINING_MODULE)
+    context = ExtractionContext(department="sales", doc_type="training_module", document_id="doc-1", filename="schulung.pptx")
+
+    sonnet = ClaudeExtractor(model="claude-sonnet-4-6")._build_system_prompt(schema, context)
+    haiku = ClaudeExtractor(model="claude-haiku-4-5")._build_system_prompt(schema, context)
+
+    assert sonnet[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in haiku[0]
+    assert prompt_cache_min_tokens("claude-haiku-4-5") == 4096
+    assert prompt_cache_min_tokens("claude-3-5-haiku-latest") == 2048
+    assert prompt_cache_min_tokens("claude-sonnet-4-6") == 1024
+    assert not is_cacheable_prefix("x" * 3000, "claude-sonnet-4-6")
+    assert is_cacheable_prefix("x" * 3072, "claude-sonnet-4-6")
+
+
+def test_extract_sums_token_usage_over_retries():
+    extractor = ClaudeExtractor()
+    schema = get_schema_registry().get_schema(DocType.PRODUCT_SPEC)
+    usage = {
+        "input_tokens": 40,
+        "output_tokens": 10,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 1500,
+    }
+    records = {"records": [{"data": {"artnr": "30199", "name": "Entmanteler"}, "evidence": []}]}
+    messages = FakeMessages([
+        ("kein JSON", {**usage, "cache_creation_input_tokens": 1500, "cache_read_input_tokens": 0}),
+        (json.dumps(records), usage),
+    ])
+    extractor.gateway = SimpleNamespace(create_message=messages.create)
+
+    result = asyncio.run(extractor.extract("Art.-Nr. 30199 Entmanteler", schema, _context(0)))
+
+    assert result.records
+    assert len(messages.calls) == 2
+    assert result.usage == {
+        "input_tokens": 80,
+        "output_tokens": 20,
+        "cache_creation_input_tokens": 1500,
+        "cache_read_input_tokens": 1500,
+    }
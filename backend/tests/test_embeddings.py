@@ -0,0 +1,48 @@
+import json
+
+import httpx
+import numpy as np
+
+from app.services.embeddings import HashingEmbeddingProvider, HttpEmbeddingProvider
+
+
+def test_hashing_provider_is_deterministic_normalized_and_batched():
+    provider = HashingEmbeddingProvider(dimensions=64)
+
+    batch = provider.embed_batch(["Abisolierzange fuer Solarkabel", "Solarkabel abisolieren", ""])
+    again = provider.embed("Abisolierzange fuer Solarkabel")
+
+    assert batch.shape == (3, 64)
+    assert batch.dtype == np.float32
+    np.testing.assert_array_equal(batch[0], again)
+    np.testing.assert_allclose(np.linalg.norm(batch[:2], axis=1), [1.0, 1.0], rtol=1e-6)
+    assert not batch[2].any()
+    assert float(batch[0] @ batch[1]) > 0
+
+
+def test_http_provider_sends_batches_and_restores_input_order():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        data = [
+            {"index": index, "embedding": [float(len(text)), float(index)]}
+            for index, text in enumerate(body["input"])
+        ]
+        return httpx.Response(200, json={"data": list(reversed(data))})
+
+    provider = HttpEmbeddingProvider(
+        dimensions=2,
+        api_url="https://embeddings.example/v1/embeddings",
+        api_key="secret",
+        model="voyage-3",
+        batch_size=2,
+    )
+    provider.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    vectors = provider.embed_batch(["a", "bb", "ccc"])
+
+    assert [request["input"] for request in requests] == [["a", "bb"], ["ccc"]]
+    assert requests[0]["model"] == "voyage-3"
+    np.testing.assert_array_equal(vectors, [[1.0, 0.0], [2.0, 1.0], [3.0, 0.0]])
@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.extractors.base import EvidencePointer, ExtractedRecord, ExtractionContext, ExtractionResult
+from app.models.document import Department, DocType
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.services.extraction_cache import (
+    ExtractionCache,
+    deserialize_result,
+    extraction_cache_key,
+    serialize_result,
+)
+from app.services.ingestion import IngestionService
+
+
+class CountingExtractor:
+    prompt_version = "test-1"
+    model = "test-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def extract(self, text, schema, context):
+        self.calls += 1
+        return ExtractionResult(
+            records=[
+                ExtractedRecord(
+                    data={"title": text, "content": "Inhalt"},
+                    schema_type=schema.__name__,
+                    evidence=[EvidencePointer(field_path="title", excerpt=text, chunk_index=context.chunk_index)],
+                    confidence=0.9,
+                )
+            ],
+            valid=True,
+            confidence=0.9,
+        )
+
+
+def _context(chunk_index):
+    return ExtractionContext(
+        department="sales",
+        doc_type="training_module",
+        document_id=str(uuid4()),
+        filename="schulung.docx",
+        chunk_index=chunk_index,
+    )
+
+
+def test_cached_results_are_remapped_to_the_current_unit_position():
+    result = ExtractionResult(
+        records=[
+            ExtractedRecord(
+                data={"title": "JOKARI XL"},
+                schema_type="TrainingModule",
+                evidence=[EvidencePointer(field_path="title", excerpt="JOKARI XL", chunk_index=4)],
+            )
+        ],
+        evidence=[EvidencePointer(field_path="title", excerpt="JOKARI XL", chunk_index=5)],
+        valid=True,
+        raw_response="{...}",
+    )
+
+    payload = serialize_result(result, _context(4))
+    restored = deserialize_result(payload, _context(10))
+
+    assert restored.records[0].evidence[0].chunk_index == 10
+    assert restored.evidence[0].chunk_index == 11
+    assert restored.records[0].data == {"title": "JOKARI XL"}
+    assert restored.raw_response is None
+
+
+def test_cache_key_changes_with_model_and_prompt_version():
+    base = dict(text="Text", schema_type="FAQ", doc_type="faq", department="support")
+    key = extraction_cache_key(**base, prompt_version="1", model="a")
+
+    assert key == extraction_cache_key(**base, prompt_version="1", model="a")
+    assert key != extraction_cache_key(**base, prompt_version="2", model="a")
+    assert key != extraction_cache_key(**base, prompt_version="1", model="b")
+
+
+def test_extract_units_reuses_cached_results_for_unchanged_units(db_session, monkeypatch):
+    cache = ExtractionCache()
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: cache)
+    service = IngestionService(db=db_session)
+    schema = service.registry.get_schema(DocType.TRAINING_MODULE)
+    document = SimpleNamespace(
+        id=uuid4(),
+        department=Department.SALES,
+        doc_type=DocType.TRAINING_MODULE,
+        filename="schulung.docx",
+        version_date=datetime(2021, 2, 25),
+    )
+    extractor = CountingExtractor()
+
+    first_units = [{"text": "Abschnitt A", "chunk_index": 0}, {"text": "Abschnitt B", "chunk_index": 1}]
+    asyncio.run(service._extract_units(extractor, schema, document, first_units))
+
+    # Re-upload with one edited section and the unchanged one moved.
+    second_units = [
+        {"text": "Neu", "chunk_index": 0},
+        {"text": "Abschnitt C", "chunk_index": 1},
+        {"text": "Abschnitt B", "chunk_index": 2},
+    ]
+    results = asyncio.run(service._extract_units(extractor, schema, document, second_units))
+
+    assert extractor.calls == 4
+    assert [from_cache for *_rest, from_cache in results] == [False, False, True]
+    assert results[2][1].records[0].evidence[0].chunk_index == 2
+    assert cache.stats() == {"hits": 1, "misses": 4}
+    assert db_session.query(ExtractionCacheEntry).count() == 4
+
+
+def test_extract_units_caches_finished_units_when_a_later_unit_fails(db_session, monkeypatch):
+    class FailingExtractor(CountingExtractor):
+        async def extract(self, text, schema, context):
+            if text == "Abschnitt B":
+                await asyncio.sleep(0.01)
+                raise RuntimeError("LLM nicht erreichbar")
+            return await super().extract(text, schema, context)
+
+    cache = ExtractionCache()
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: cache)
+    service = IngestionService(db=db_session)
+    schema = service.registry.get_schema(DocType.TRAINING_MODULE)
+    document = SimpleNamespace(
+        id=uuid4(),
+        department=Department.SALES,
+        doc_type=DocType.TRAINING_MODULE,
+        filename="schulung.docx",
+        version_date=datetime(2021, 2, 25),
+    )
+    units = [{"text": "Abschnitt A", "chunk_index": 0}, {"text": "Abschnitt B", "chunk_index": 1}]
+
+    try:
+        asyncio.run(service._extract_units(FailingExtractor(), schema, document, units))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("the failing unit must fail the extraction")
+
+    assert [entry.cache_key for entry in db_session.query(ExtractionCacheEntry)] == [
+        extraction_cache_key(
+            text="Abschnitt A",
+            schema_type=schema.__name__,
+            doc_type="training_module",
+            department="sales",
+            prompt_version="test-1",
+            model="test-model",
+        )
+    ]
+
+
+def test_evict_removes_expired_then_least_recently_used_entries(db_session):
+    now = datetime.utcnow()
+    for number, age_days in enumerate([200, 3, 2, 1]):
+        db_session.add(
+            ExtractionCacheEntry(
+                cache_key=f"{number:064d}",
+                schema_type="FAQ",
+                doc_type="faq",
+                model="m",
+                prompt_version="1",
+                result_json={},
+                last_used_at=now - timedelta(days=age_days),
+            )
+        )
+    db_session.commit()
+
+    removed = ExtractionCache(max_entries=2, max_age_days=90).evict(db_session)
+
+    remaining = {entry.cache_key for entry in db_session.query(ExtractionCacheEntry).all()}
+    assert removed == 2
+    assert remaining == {f"{2:064d}", f"{3:064d}"}
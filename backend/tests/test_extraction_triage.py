@@ -0,0 +1,41 @@
+import pytest
+
+from app.services.extraction_triage import CHEAP, FULL, SKIP, triage_unit
+
+
+@pytest.mark.parametrize(
+    ("text", "section_path", "expected"),
+    [
+        ("   \n ", "Leer", (SKIP, "empty")),
+        ("30199_entmanteler_16.jpg\n30199_anwendung.png", "Produkte > Bilder", (SKIP, "media")),
+        ("[Bild: Anwendung am Kabel]", "Anwendung", (SKIP, "media")),
+        ("Entmanteler No. 16", "Schulung > Titelbild: Entmanteler", (SKIP, "media")),
+        ("Einleitung ........ 3\nProduktuebersicht ....... 5\nAnwendung .... 9", "Start", (SKIP, "table_of_contents")),
+        ("1. Einleitung\n2. Produkte", "Schulung > Inhaltsverzeichnis", (SKIP, "table_of_contents")),
+        ("2.1 Kabeltypen    12\n2.2 Klingen\t14\n3 Anwendung   20", "Katalog > Inhalt", (SKIP, "table_of_contents")),
+        ("Vielen Dank!", "Ende", (SKIP, "divider")),
+        # Spec tables and quantity lists share the "label   number" layout with TOC lines.
+        (
+            "Kabeldurchmesser   8\nLänge   130\nGewicht   60\nArbeitsbereich\t28",
+            "Produkte > Technische Daten",
+            (FULL, "content"),
+        ),
+        ("Entmanteler   1\nErsatzklinge   2\nTasche   1", "Produkte > Lieferumfang", (FULL, "content")),
+        (
+            "Die Schulung behandelt Einsatzbereiche, Zielgruppen und Verkaufsargumente fuer den Entmanteler.",
+            "Schulung > Inhalt",
+            (FULL, "content"),
+        ),
+        ("artnr: 30199\nname: Entmanteler No. 16", "Zeile 1", (CHEAP, "key_value")),
+        (
+            "Der Entmanteler No. 16 isoliert Rundkabel von 8 bis 13 mm sicher ab. "
+            "Die Klinge ist einstellbar.",
+            "Produkte > Entmanteler",
+            (FULL, "content"),
+        ),
+    ],
+)
+def test_triage_unit_classifies_units(text, section_path, expected):
+    decision = triage_unit(text, section_path)
+
+    assert (decision.action, decision.reason) == expected
@@ -0,0 +1,89 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.search import search_knowledge
+from app.models.document import Department
+from app.models.record import Record, RecordStatus
+from app.services.knowledge_search import PostgresFuzzySearchBackend, TrigramSearchBackend, get_search_backend
+from app.services.trigram_index import TrigramIndex, trigram_similarity, trigrams
+
+
+def _record(primary_key, data, status=RecordStatus.APPROVED, department=Department.PRODUCT):
+    return Record(
+        id=uuid4(),
+        department=department,
+        schema_type="ProductSpec",
+        primary_key=primary_key,
+        data_json=data,
+        completeness_score=1.0,
+        status=status,
+    )
+
+
+def test_trigrams_match_pg_trgm_padding():
+    assert trigrams("Cat") == frozenset({"  c", " ca", "cat", "at "})
+    assert trigram_similarity(trigrams("30199"), trigrams("30199")) == 1.0
+    assert 0.3 < trigram_similarity(trigrams("30199"), trigrams("30189")) < 1.0
+
+
+def test_trigram_index_ranks_near_matches_for_typos(db_session):
+    strip = _record("30199", {"artnr": "30199", "name": "Entmanteler PV-Strip Pro"})
+    knife = _record("30200", {"artnr": "30200", "name": "Kabelmesser"})
+    other_department = _record("30198", {"artnr": "30198", "name": "Zange"}, department=Department.SUPPORT)
+    pending = _record("30190", {"artnr": "30190", "name": "Neu"}, status=RecordStatus.PENDING)
+    db_session.add_all([strip, knife, other_department, pending])
+    db_session.commit()
+
+    index = TrigramIndex()
+    index.ensure_loaded(db_session)
+
+    article_hits = index.search("31099", department="product")
+    name_hits = index.search("Entmantler")
+
+    assert [record_id for record_id, _ in index.search("30199", department="product")][0] == strip.id
+    assert all(record_id != other_department.id for record_id, _ in article_hits)
+    assert [record_id for record_id, _ in name_hits] == [strip.id]
+    assert index.search("Entmantler", min_similarity=0.95) == []
+
+    knife.status = RecordStatus.REJECTED
+    index.sync_record(knife)
+    assert all(record_id != knife.id for record_id, _ in index.search("Kabelmeser"))
+
+
+def test_fuzzy_endpoint_uses_trigram_fallback_off_postgres(db_session, monkeypatch):
+    strip = _record("30199", {"artnr": "30199", "name": "Entmanteler PV-Strip Pro"})
+    db_session.add(strip)
+    db_session.commit()
+
+    index = TrigramIndex()
+    monkeypatch.setattr("app.services.knowledge_search.get_trigram_index", lambda: index)
+    assert isinstance(get_search_backend(db_session, "fuzzy"), TrigramSearchBackend)
+
+    response = asyncio.run(
+        search_knowledge(
+            q="PV-Strp",
+            department=None,
+            schema_type=None,
+            limit=10,
+            mode="fuzzy",
+            min_similarity=0.2,
+            db=db_session,
+        )
+    )
+
+    assert [result.record_id for result in response.results] == [strip.id]
+    assert set(response.timings_ms) == {"fuzzy"}
+
+
+def test_postgres_fuzzy_backend_uses_trigram_operators(db_session):
+    query = PostgresFuzzySearchBackend().build_query(db_session, "Entmantler 30199", "product", None, 5)
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    # psycopg2 uses pyformat parameters, so the trigram operators are rendered escaped.
+    assert "lower(records.primary_key) %% %(param_1)s" in sql
+    assert "%(param_1)s <%% lower(coalesce(records.data_json ->> 'artnr', '')" in sql
+    assert "greatest(similarity(lower(records.primary_key)" in sql
+    assert "word_similarity(" in sql
+    assert "LIMIT" in sql
@@ -1,8 +1,12 @@
 import asyncio
+import time
 from datetime import datetime
 from types import SimpleNamespace
 from uuid import uuid4
 
+from fastapi import BackgroundTasks
+
+from app.api.upload import process_document_background
 from app.extractors.base import EvidencePointer, ExtractedRecord, ExtractionResult
 from app.models.document import Department, DocType
 from app.services.ingestion import IngestionService
@@ -88,7 +92,11 @@ def test_ingestion_extracts_per_chunk_and_merges_duplicate_training_records(monk
     service = IngestionService(db=SimpleNamespace())
     created_records = []
 
-    monkeypatch.setattr(service, "_create_record_from_extraction", lambda **kwargs: created_records.append(kwargs))
+    monkeypatch.setattr(
+        service,
+        "_persist_records",
+        lambda _document, candidates, _chunks: created_records.extend(candidates) or len(candidates),
+    )
     monkeypatch.setattr(service, "_create_audit_log", lambda *args, **kwargs: None)
 
     document = SimpleNamespace(
@@ -193,6 +201,55 @@ def test_extract_unit_uses_stub_fallback_on_timeout(monkeypatch):
     assert result.data is not None or result.records
 
 
+def test_extract_unit_leaves_call_timeouts_to_gateway_backed_extractors(monkeypatch):
+    class QueuedExtractor:
+        enforces_call_timeout = True
+
+        async def extract(self, text, schema, context):
+            return ExtractionResult(data={"title": text}, valid=True, confidence=0.9)
+
+    timeouts = []
+    wait_for = asyncio.wait_for
+
+    async def recording_wait_for(awaitable, timeout):
+        timeouts.append(timeout)
+        return await wait_for(awaitable, timeout)
+
+    monkeypatch.setattr(asyncio, "wait_for", recording_wait_for)
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr(
+        "app.services.ingestion.get_settings",
+        lambda: SimpleNamespace(llm_provider="claude", llm_timeout_seconds=0.01),
+    )
+
+    service = IngestionService(db=SimpleNamespace())
+    schema = service.registry.get_schema(DocType.TRAINING_MODULE)
+    context = service._build_context(
+        document=SimpleNamespace(
+            id=uuid4(),
+            department=Department.SALES,
+            doc_type=DocType.TRAINING_MODULE,
+            filename="queued.docx",
+            version_date=datetime(2021, 2, 25),
+        ),
+        unit={"section_path": "JOKARI XL", "chunk_index": 0},
+        chunk_total=1,
+    )
+
+    result, used_stub = service._extract_unit(
+        extractor=QueuedExtractor(),
+        schema=schema,
+        context=context,
+        text="JOKARI XL",
+        loop=service._get_event_loop(),
+    )
+
+    assert used_stub is False
+    assert result.data == {"title": "JOKARI XL"}
+    # Rate-limit waits inside the extractor must not count against the timeout.
+    assert timeouts == [None]
+
+
 def test_build_extraction_units_groups_large_hierarchical_docs_for_non_training_types(monkeypatch):
     monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
     monkeypatch.setattr(
@@ -251,3 +308,827 @@ def test_extract_records_fails_fast_for_likely_wrong_sales_doc_type(monkeypatch)
         assert len(empty_extractor.calls) == 0
     else:
         raise AssertionError("Expected _extract_records to fail for likely mismatched persona upload")
+
+
+class ConcurrencyTrackingExtractor:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def extract(self, text, schema, context):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Later units finish first to prove results keep unit order.
+        await asyncio.sleep(0.01 * (context.chunk_total - context.chunk_index))
+        self.in_flight -= 1
+        return ExtractionResult(data={"title": text}, valid=True, confidence=0.9)
+
+
+def test_extract_units_runs_concurrently_and_preserves_unit_order(monkeypatch):
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr(
+        "app.services.ingestion.get_settings",
+        lambda: SimpleNamespace(llm_provider="claude", llm_timeout_seconds=5, llm_extraction_concurrency=3),
+    )
+    service = IngestionService(db=SimpleNamespace())
+    schema = service.registry.get_schema(DocType.TRAINING_MODULE)
+    document = SimpleNamespace(
+        id=uuid4(),
+        department=Department.SALES,
+        doc_type=DocType.TRAINING_MODULE,
+        filename="schulung.docx",
+        version_date=datetime(2021, 2, 25),
+    )
+    units = [{"text": f"Abschnitt {index}", "chunk_index": index, "section_path": None} for index in range(7)]
+    extractor = ConcurrencyTrackingExtractor()
+
+    results = asyncio.run(service._extract_units(extractor, schema, document, units))
+
+    assert extractor.max_in_flight == 3
+    assert [result.data["title"] for _context, result, _used_stub, _from_cache in results] == [unit["text"] for unit in units]
+    assert [context.chunk_index for context, _result, _used_stub, _from_cache in results] == list(range(7))
+
+
+def test_persist_records_writes_records_evidence_and_updates_in_one_transaction(db_session, monkeypatch):
+    from sqlalchemy import event
+
+    from app.models.chunk import Chunk
+    from app.models.document import Confidentiality, Document, DocumentStatus
+    from app.models.evidence import Evidence
+    from app.models.proposed_update import ProposedUpdate
+    from app.models.record import Record, RecordStatus
+
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    document = Document(
+        id=uuid4(),
+        filename="katalog.pdf",
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        version_date=datetime(2024, 1, 1),
+        owner="qa",
+        confidentiality=Confidentiality.INTERNAL,
+        status=DocumentStatus.EXTRACTING,
+    )
+    chunks = [
+        Chunk(id=uuid4(), document_id=document.id, text=f"Seite {index}", chunk_index=index)
+        for index in range(2)
+    ]
+    existing = Record(
+        id=uuid4(),
+        department=Department.PRODUCT,
+        schema_type="ProductSpec",
+        primary_key="30199",
+        data_json={"artnr": "30199", "name": "Alt"},
+        completeness_score=1.0,
+        status=RecordStatus.APPROVED,
+    )
+    db_session.add_all([document, *chunks, existing])
+    db_session.commit()
+
+    def candidate(artnr, pointers):
+        return {
+            "data": {"artnr": artnr, "name": "Entmanteler"},
+            "schema_type": "ProductSpec",
+            "evidence_pointers": pointers,
+            "confidence": 0.9,
+            "needs_review": False,
+            "source_section": "Katalog",
+            "extraction_model": "claude-haiku-4-5",
+        }
+
+    candidates = [
+        candidate("30199", [EvidencePointer(field_path="name", excerpt="Entmanteler", chunk_index=0)]),
+        candidate(
+            "30200",
+            [
+                EvidencePointer(field_path="artnr", excerpt="30200", chunk_index=1),
+                EvidencePointer(field_path="name", excerpt="Entmanteler", chunk_index=7),
+            ],
+        ),
+    ]
+
+    # Like _create_chunks, hand over detached chunks that need no reload.
+    chunk_ids = [chunk.id for chunk in chunks]
+    chunks = [Chunk(id=chunk_id, text="", chunk_index=index) for index, chunk_id in enumerate(chunk_ids)]
+    existing_id = existing.id
+    document_id = document.id
+    db_session.expunge_all()
+    document = db_session.get(Document, document_id)
+
+    service = IngestionService(db=db_session)
+    commits = []
+    selects = []
+    original_commit = db_session.commit
+    monkeypatch.setattr(db_session, "commit", lambda: commits.append(1) or original_commit())
+    listener = lambda *args: selects.append(args[2]) if args[2].startswith("SELECT") else None
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        persisted = service._persist_records(document, candidates, chunks)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert persisted == 2
+    assert len(commits) == 1
+    assert len(selects) == 1
+    update = db_session.query(ProposedUpdate).one()
+    assert update.record_id == existing_id
+    created = db_session.query(Record).filter(Record.primary_key == "30200").one()
+    assert created.status == RecordStatus.PENDING
+    assert created.data_json["_source_section"] == "Katalog"
+    assert created.extraction_model == "claude-haiku-4-5"
+    evidence = db_session.query(Evidence).filter(Evidence.record_id == created.id).all()
+    evidence_chunks = {item.field_path: item.chunk_id for item in evidence}
+    # Unknown chunk indexes fall back to the first chunk.
+    assert evidence_chunks == {"artnr": chunks[1].id, "name": chunks[0].id}
+
+
+def test_process_document_async_runs_database_calls_on_one_worker_thread(db_session, monkeypatch, tmp_path):
+    import threading
+
+    from sqlalchemy import event
+
+    from app.models.document import Confidentiality, Document, DocumentStatus
+    from app.models.record import Record
+
+    source = tmp_path / "xl.md"
+    source.write_text("# JOKARI XL\n\nProduktueberblick fuer groessere Kabeldurchmesser.\n", encoding="utf-8")
+
+    def download_to_temp(_object_name):
+        copy = tmp_path / "download.md"
+        copy.write_text(source.read_text(encoding="utf-8"), encoding="utf-8")
+        return str(copy)
+
+    fake_extractor = FakeChunkExtractor()
+    monkeypatch.setattr(
+        "app.services.ingestion.get_storage_service",
+        lambda: SimpleNamespace(download_to_temp=download_to_temp),
+    )
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: fake_extractor)
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+
+    document = Document(
+        id=uuid4(),
+        filename="xl.md",
+        file_path="sales/xl.md",
+        department=Department.SALES,
+        doc_type=DocType.TRAINING_MODULE,
+        version_date=datetime(2021, 2, 25),
+        owner="qa",
+        confidentiality=Confidentiality.INTERNAL,
+        status=DocumentStatus.UPLOADING,
+    )
+    db_session.add(document)
+    db_session.commit()
+    document_id = document.id
+
+    statement_threads = set()
+    listener = lambda *_args: statement_threads.add(threading.get_ident())
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        asyncio.run(IngestionService(db_session).process_document_async(document_id))
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert len(statement_threads) == 1
+    assert threading.get_ident() not in statement_threads
+    assert db_session.expire_on_commit is True
+    db_session.refresh(document)
+    assert document.status == DocumentStatus.PENDING_REVIEW
+    assert db_session.query(Record).filter(Record.document_id == document.id).count() == 1
+    assert {"download", "parse", "chunk", "embed", "chunk_insert", "extract", "aggregate", "persist"} <= set(
+        document.metrics_json["stages"]
+    )
+    assert document.metrics_json["llm_units"] == 1
+
+
+def test_process_document_async_overlaps_extraction_of_several_documents(monkeypatch):
+    class SharedTrackingExtractor(FakeChunkExtractor):
+        def __init__(self):
+            super().__init__()
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+        async def extract(self, text, schema, context):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.02)
+            self.in_flight -= 1
+            return await super().extract(text, schema, context)
+
+    extractor = SharedTrackingExtractor()
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: extractor)
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+
+    services = []
+    for index in range(3):
+        document = SimpleNamespace(
+            id=uuid4(),
+            department=Department.SALES,
+            doc_type=DocType.TRAINING_MODULE,
+            filename=f"schulung-{index}.docx",
+            file_path=f"sales/schulung-{index}.docx",
+            version_date=datetime(2021, 2, 25),
+            status=None,
+            error_message=None,
+        )
+        fake_db = FakeDB(document)
+        fake_db.expire_on_commit = True
+        service = IngestionService(db=fake_db)
+        chunks = [SimpleNamespace(id=uuid4(), text="JOKARI XL", section_path="JOKARI XL", chunk_index=0)]
+        monkeypatch.setattr(service, "_parse_file", lambda _path: SimpleNamespace(raw_text="JOKARI XL"))
+        monkeypatch.setattr(service, "_create_chunks", lambda _document, _parsed, chunks=chunks: chunks)
+        monkeypatch.setattr(service, "_persist_records", lambda _document, candidates, _chunks: len(candidates))
+        monkeypatch.setattr(service, "_create_audit_log", lambda *args, **kwargs: None)
+        services.append((service, document))
+
+    async def run_all():
+        await asyncio.gather(*(service.process_document_async(document.id) for service, document in services))
+
+    asyncio.run(run_all())
+
+    assert extractor.max_in_flight == 3
+    assert all(document.status.value == "pending_review" for _service, document in services)
+
+
+def test_upload_background_processing_keeps_the_server_loop_responsive(monkeypatch):
+    class BlockingIngestionService:
+        def __init__(self, db):
+            self.db = db
+
+        async def process_document_async(self, document_id):
+            # Stands in for CPU-bound pipeline steps such as stub extraction.
+            time.sleep(0.3)
+
+    monkeypatch.setattr("app.api.upload.IngestionService", BlockingIngestionService)
+    monkeypatch.setattr("app.api.upload.SessionLocal", lambda: SimpleNamespace(close=lambda: None))
+
+    async def serve():
+        tasks = BackgroundTasks()
+        tasks.add_task(process_document_background, str(uuid4()))
+        ingestion = asyncio.create_task(tasks())
+        ticks = 0
+        while not ingestion.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        return ticks
+
+    # Other requests keep being served while the document is ingested.
+    assert asyncio.run(serve()) >= 10
+
+
+def test_pack_extraction_units_packs_flat_sections_within_budget_and_keeps_root_sections_apart(monkeypatch):
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    service = IngestionService(db=SimpleNamespace())
+
+    def unit(index, section_path, text):
+        return {"text": text, "section_path": section_path, "chunk_index": index, "chunk_spans": [(index, 0, len(text))]}
+
+    rows = [unit(index, f"Zeile {index + 1}", f"artnr: {30000 + index}\nname: Entmanteler") for index in range(5)]
+    packed = service._pack_extraction_units(rows, token_budget=33)
+
+    assert [[span[0] for span in packed_unit["chunk_spans"]] for packed_unit in packed] == [[0, 1, 2], [3, 4]]
+    assert packed[0]["chunk_index"] == 0
+    assert packed[0]["section_path"] == ""
+    assert packed[0]["text"].startswith("### Zeile 1\nartnr: 30000")
+    for packed_unit in packed:
+        for chunk_index, start, end in packed_unit["chunk_spans"]:
+            assert packed_unit["text"][start:end].endswith(rows[chunk_index]["text"])
+
+    sections = [unit(0, "Alpha > Intro", "a"), unit(1, "Alpha > Details", "b"), unit(2, "Beta > Intro", "c")]
+    assert [packed_unit["section_path"] for packed_unit in service._pack_extraction_units(sections, 2000)] == [
+        "Alpha",
+        "Beta > Intro",
+    ]
+    assert service._pack_extraction_units(rows, token_budget=0) == rows
+
+
+def test_extract_records_packs_csv_rows_and_attributes_evidence_to_their_chunks(monkeypatch):
+    from app.config import get_settings
+
+    class RowExtractor:
+        model = "claude-test"
+
+        def __init__(self):
+            self.calls = []
+
+        async def extract(self, text, schema, context):
+            self.calls.append(text)
+            records = []
+            for artnr in ("30001", "30003"):
+                position = text.find(f"artnr: {artnr}")
+                records.append(
+                    ExtractedRecord(
+                        data={"artnr": artnr, "name": "Entmanteler"},
+                        schema_type=schema.__name__,
+                        evidence=[
+                            EvidencePointer(
+                                field_path="artnr",
+                                excerpt=f"artnr: {artnr}",
+                                chunk_index=context.chunk_index,
+                                start_offset=position,
+                                end_offset=position + 12,
+                            ),
+                            EvidencePointer(field_path="name", excerpt="name: Entmanteler 3", chunk_index=context.chunk_index),
+                        ],
+                        confidence=0.9,
+                        source_section=f"Zeile {artnr[-1]}",
+                    )
+                )
+            return ExtractionResult(
+                records=records,
+                valid=True,
+                confidence=0.9,
+                usage={"input_tokens": 900, "cache_read_input_tokens": 1500},
+            )
+
+    extractor = RowExtractor()
+    monkeypatch.setattr(get_settings(), "extraction_triage_enabled", False)
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: extractor)
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+
+    service = IngestionService(db=SimpleNamespace())
+    persisted = []
+    monkeypatch.setattr(
+        service,
+        "_persist_records",
+        lambda _document, candidates, _chunks: persisted.extend(candidates) or len(candidates),
+    )
+    audit_logs = []
+    monkeypatch.setattr(service, "_create_audit_log", lambda action, *_args: audit_logs.append((action, _args[-1])))
+
+    document = SimpleNamespace(
+        id=uuid4(),
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        filename="artikel.csv",
+        version_date=datetime(2024, 1, 1),
+    )
+    chunks = [
+        SimpleNamespace(
+            id=uuid4(),
+            text=f"artnr: 3000{index}\nname: Entmanteler {index}",
+            section_path=f"Zeile {index + 1}",
+            chunk_index=index,
+        )
+        for index in range(5)
+    ]
+
+    service._extract_records(document, chunks, full_text="")
+
+    assert len(extractor.calls) == 1
+    evidence = {
+        candidate["data"]["artnr"]: {pointer.field_path: pointer for pointer in candidate["evidence_pointers"]}
+        for candidate in persisted
+    }
+    assert evidence["30001"]["artnr"].chunk_index == 1
+    assert evidence["30001"]["artnr"].start_offset == 0
+    assert evidence["30003"]["artnr"].chunk_index == 3
+    # Without offsets the excerpt position decides.
+    assert evidence["30003"]["name"].chunk_index == 3
+    details = dict(audit_logs)["records_extracted"]
+    assert details["extraction_units"] == 1
+    assert details["section_units"] == 5
+    assert details["llm_usage"] == {"input_tokens": 900, "cache_read_input_tokens": 1500}
+
+
+def test_extract_records_does_not_pack_units_for_the_heuristic_extractor(monkeypatch):
+    from app.config import get_settings
+    from app.extractors.stub import LocalStubExtractor
+
+    class CountingStubExtractor(LocalStubExtractor):
+        def __init__(self):
+            super().__init__()
+            self.calls = []
+
+        async def extract(self, text, schema, context):
+            self.calls.append(text)
+            return await super().extract(text, schema, context)
+
+    extractor = CountingStubExtractor()
+    monkeypatch.setattr(get_settings(), "extraction_unit_token_budget", 2000)
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: extractor)
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+
+    service = IngestionService(db=SimpleNamespace())
+    monkeypatch.setattr(service, "_create_audit_log", lambda *args, **kwargs: None)
+    document = SimpleNamespace(
+        id=uuid4(),
+        department=Department.SUPPORT,
+        doc_type=DocType.FAQ,
+        filename="artikel.csv",
+        version_date=datetime(2024, 1, 1),
+    )
+    chunks = [
+        SimpleNamespace(
+            id=uuid4(),
+            text=f"artnr: 3000{index}\nname: Entmanteler {index}",
+            section_path=f"Zeile {index + 1}",
+            chunk_index=index,
+        )
+        for index in range(8)
+    ]
+
+    try:
+        service._extract_records(document, chunks, full_text="")
+    except RuntimeError as exc:
+        assert "Keine fachlich brauchbaren Records" in str(exc)
+    else:
+        raise AssertionError("rows without FAQ content must not become records")
+    assert extractor.calls == [chunk.text for chunk in chunks]
+
+
+def test_extract_records_packs_fast_routed_units_below_the_fast_model_cap(monkeypatch):
+    from app.config import get_settings
+    from app.extractors.routing import RoutingExtractor
+
+    class TierExtractor:
+        prompt_version = "3"
+
+        def __init__(self, model):
+            self.model = model
+            self.calls = []
+
+        async def extract(self, text, schema, context):
+            self.calls.append(text)
+            return ExtractionResult(
+                records=[
+                    ExtractedRecord(
+                        data={"question": f"Frage {context.chunk_index}?", "answer": "Antwort."},
+                        schema_type=schema.__name__,
+                        confidence=0.9,
+                    )
+                ],
+                valid=True,
+                confidence=0.9,
+                model=self.model,
+            )
+
+    fast, full = TierExtractor("haiku"), TierExtractor("sonnet")
+    extractor = RoutingExtractor(fast=fast, full=full, fast_doc_types={"faq"}, max_fast_unit_tokens=1500)
+    monkeypatch.setattr(get_settings(), "extraction_unit_token_budget", 2000)
+    monkeypatch.setattr(get_settings(), "extraction_triage_enabled", False)
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: extractor)
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+
+    service = IngestionService(db=SimpleNamespace())
+    monkeypatch.setattr(service, "_persist_records", lambda _document, candidates, _chunks: len(candidates))
+    monkeypatch.setattr(service, "_create_audit_log", lambda *args, **kwargs: None)
+    document = SimpleNamespace(
+        id=uuid4(),
+        department=Department.SUPPORT,
+        doc_type=DocType.FAQ,
+        filename="faq.csv",
+        version_date=datetime(2024, 1, 1),
+    )
+    chunks = [
+        SimpleNamespace(
+            id=uuid4(),
+            text=f"Frage: Wie stelle ich die Klinge {index} ein?\nAntwort: " + "Drehen Sie die Stellschraube. " * 8,
+            section_path=f"Zeile {index + 1}",
+            chunk_index=index,
+        )
+        for index in range(40)
+    ]
+
+    service._extract_records(document, chunks, full_text="")
+
+    assert full.calls == []
+    assert 1 < len(fast.calls) < len(chunks)
+    assert max(len(text) // 4 for text in fast.calls) <= 1500
+
+
+def test_extract_records_triages_units_before_llm_calls(monkeypatch):
+    class ModelExtractor(FakeChunkExtractor):
+        model = "claude-test"
+
+    extractor = ModelExtractor()
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: extractor)
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+
+    service = IngestionService(db=SimpleNamespace())
+    persisted = []
+    monkeypatch.setattr(
+        service,
+        "_persist_records",
+        lambda _document, candidates, _chunks: persisted.extend(candidates) or len(candidates),
+    )
+    audit_logs = []
+    monkeypatch.setattr(service, "_create_audit_log", lambda action, *_args: audit_logs.append((action, _args[-1])))
+
+    document = SimpleNamespace(
+        id=uuid4(),
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        filename="katalog.md",
+        version_date=datetime(2024, 1, 1),
+    )
+    texts = [
+        ("Inhaltsverzeichnis", "Einleitung ..... 2\nEntmanteler ..... 3\nZubehoer ..... 4"),
+        ("Entmanteler", "Der Entmanteler No. 16 isoliert Rundkabel von 8 bis 13 mm sicher ab."),
+        ("Datenblatt", "artnr: 30199\nname: Entmanteler No. 16\nbeschreibung: Abisolierwerkzeug"),
+        ("Bilder", "30199_entmanteler_16.jpg"),
+    ]
+    chunks = [
+        SimpleNamespace(id=uuid4(), text=text, section_path=section_path, chunk_index=index)
+        for index, (section_path, text) in enumerate(texts)
+    ]
+
+    service._extract_records(document, chunks, full_text="")
+
+    assert [text for text, _context in extractor.calls] == [texts[1][1]]
+    assert {candidate["data"].get("artnr") for candidate in persisted} == {None, "30199"}
+    details = dict(audit_logs)["records_extracted"]
+    assert details["cheap_extraction_units"] == 1
+    assert details["skipped_units"] == 2
+    assert details["skipped"] == [
+        {"chunk_index": 0, "section_path": "Inhaltsverzeichnis", "reason": "table_of_contents"},
+        {"chunk_index": 3, "section_path": "Bilder", "reason": "media"},
+    ]
+
+
+def test_process_document_retry_resumes_from_checkpoints_and_reuses_chunks(db_session, monkeypatch, tmp_path):
+    from app.config import get_settings
+    from app.models.chunk import Chunk
+    from app.models.document import Confidentiality, Document, DocumentStatus
+    from app.models.extraction_checkpoint import ExtractionCheckpoint
+    from app.models.record import Record
+
+    class FlakyExtractor:
+        model = "claude-test"
+        prompt_version = "test"
+
+        def __init__(self):
+            self.calls = []
+            self.fail_on = "Zubehoer"
+
+        async def extract(self, text, schema, context):
+            self.calls.append(context.section_path)
+            if self.fail_on and self.fail_on == context.section_path:
+                raise RuntimeError("LLM nicht erreichbar")
+            return ExtractionResult(
+                data={"title": context.section_path, "content": text},
+                valid=True,
+                confidence=0.9,
+                usage={"input_tokens": 10},
+            )
+
+    def download_to_temp(_object_name):
+        copy = tmp_path / "katalog.md"
+        copy.write_text(
+            "# Entmanteler\n\nDer Entmanteler No. 16 isoliert Rundkabel von 8 bis 13 mm sicher ab.\n\n"
+            "# Zubehoer\n\nErsatzmesser und Tiefenanschlag fuer den Entmanteler No. 16.\n",
+            encoding="utf-8",
+        )
+        return str(copy)
+
+    extractor = FlakyExtractor()
+    monkeypatch.setattr(
+        "app.services.ingestion.get_storage_service",
+        lambda: SimpleNamespace(download_to_temp=download_to_temp),
+    )
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: extractor)
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+    monkeypatch.setattr(get_settings(), "extraction_unit_token_budget", 0)
+    monkeypatch.setattr(get_settings(), "extraction_triage_enabled", False)
+
+    document = Document(
+        id=uuid4(),
+        filename="katalog.md",
+        file_path="product/katalog.md",
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        version_date=datetime(2024, 1, 1),
+        owner="qa",
+        confidentiality=Confidentiality.INTERNAL,
+        status=DocumentStatus.UPLOADING,
+    )
+    db_session.add(document)
+    db_session.commit()
+
+    try:
+        IngestionService(db_session).process_document(document.id)
+    except RuntimeError as exc:
+        assert "LLM nicht erreichbar" in str(exc)
+    else:
+        raise AssertionError("the first attempt should fail")
+
+    chunk_ids = {row[0] for row in db_session.query(Chunk.id).filter(Chunk.document_id == document.id).all()}
+    checkpoints = db_session.query(ExtractionCheckpoint).filter(ExtractionCheckpoint.document_id == document.id).all()
+    assert len(chunk_ids) == 2
+    assert [checkpoint.parse_hash for checkpoint in checkpoints] == [document.parse_hash]
+    assert checkpoints[0].candidates_json[0]["data"]["title"] == "Entmanteler"
+
+    extractor.calls.clear()
+    extractor.fail_on = None
+    IngestionService(db_session).process_document(document.id)
+
+    assert extractor.calls == ["Zubehoer"]
+    assert {row[0] for row in db_session.query(Chunk.id).filter(Chunk.document_id == document.id).all()} == chunk_ids
+    assert db_session.query(ExtractionCheckpoint).filter(ExtractionCheckpoint.document_id == document.id).count() == 0
+    titles = {record.data_json["title"] for record in db_session.query(Record).filter(Record.document_id == document.id)}
+    assert titles == {"Entmanteler", "Zubehoer"}
+    db_session.refresh(document)
+    assert document.status == DocumentStatus.PENDING_REVIEW
+
+
+def test_reingestion_extracts_changed_sections_and_carries_unchanged_records_forward(db_session, monkeypatch, tmp_path):
+    from app.config import get_settings
+    from app.models.chunk import Chunk
+    from app.models.evidence import Evidence
+    from app.models.document import Confidentiality, Document, DocumentStatus
+    from app.models.proposed_update import ProposedUpdate
+    from app.models.record import Record, RecordStatus
+
+    class SectionExtractor:
+        def __init__(self):
+            self.calls = []
+
+        async def extract(self, text, schema, context):
+            self.calls.append(context.section_path)
+            return ExtractionResult(
+                data={"artnr": context.section_path, "name": context.section_path, "beschreibung": text},
+                valid=True,
+                evidence=[EvidencePointer(field_path="beschreibung", excerpt=text[:40], chunk_index=context.chunk_index)],
+                confidence=0.9,
+            )
+
+    versions = {
+        "v1.md": "# Entmanteler\n\nIsoliert Rundkabel von 8 bis 13 mm.\n\n# Zubehoer\n\nErsatzmesser No. 16.\n",
+        "v2.md": "# Entmanteler\n\nIsoliert Rundkabel von 8 bis 13 mm.\n\n# Zubehoer\n\nErsatzmesser No. 16 und Tiefenanschlag.\n",
+    }
+
+    def download_to_temp(object_name):
+        copy = tmp_path / object_name
+        copy.write_text(versions[object_name], encoding="utf-8")
+        return str(copy)
+
+    extractor = SectionExtractor()
+    monkeypatch.setattr(
+        "app.services.ingestion.get_storage_service",
+        lambda: SimpleNamespace(download_to_temp=download_to_temp),
+    )
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: extractor)
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+    monkeypatch.setattr(get_settings(), "extraction_unit_token_budget", 0)
+    synced = []
+    monkeypatch.setattr(
+        "app.services.ingestion.sync_approved_records",
+        lambda records: synced.extend(record.id for record in records),
+    )
+
+    def add_document(file_path, previous_document_id=None):
+        document = Document(
+            id=uuid4(),
+            filename="katalog.md",
+            file_path=file_path,
+            department=Department.PRODUCT,
+            doc_type=DocType.PRODUCT_SPEC,
+            version_date=datetime(2024, 1, 1),
+            owner="qa",
+            confidentiality=Confidentiality.INTERNAL,
+            status=DocumentStatus.UPLOADING,
+            previous_document_id=previous_document_id,
+        )
+        db_session.add(document)
+        db_session.commit()
+        return document
+
+    first = add_document("v1.md")
+    IngestionService(db_session).process_document(first.id)
+    assert extractor.calls == ["Entmanteler", "Zubehoer"]
+    for record in db_session.query(Record).all():
+        record.status = RecordStatus.APPROVED
+    db_session.commit()
+
+    extractor.calls.clear()
+    second = add_document("v2.md", previous_document_id=first.id)
+    IngestionService(db_session).process_document(second.id)
+
+    assert extractor.calls == ["Zubehoer"]
+    records = {record.data_json["artnr"]: record for record in db_session.query(Record).all()}
+    assert records["Entmanteler"].document_id == second.id
+    assert records["Zubehoer"].document_id == first.id
+    # Search learns the new source document of the carried records.
+    assert synced == [records["Entmanteler"].id]
+    updates = db_session.query(ProposedUpdate).all()
+    assert [update.record_id for update in updates] == [records["Zubehoer"].id]
+    assert "Tiefenanschlag" in updates[0].new_data_json["beschreibung"]
+
+    second_chunk_ids = {row[0] for row in db_session.query(Chunk.id).filter(Chunk.document_id == second.id)}
+    carried_evidence = db_session.query(Evidence).filter(Evidence.record_id == records["Entmanteler"].id).all()
+    assert carried_evidence
+    assert {evidence.chunk_id for evidence in carried_evidence} <= second_chunk_ids
+
+    # Uploading v2 and deleting v1 must not strip the carried records of their evidence.
+    db_session.expire_all()
+    db_session.delete(db_session.get(Document, first.id))
+    db_session.commit()
+    assert db_session.query(Evidence).filter(Evidence.record_id == records["Entmanteler"].id).count() == len(carried_evidence)
+
+    # The carried records belong to v2 now: deleting v2 deletes them as well.
+    db_session.delete(db_session.get(Document, second.id))
+    db_session.commit()
+    assert db_session.get(Record, records["Entmanteler"].id) is None
+
+
+def test_process_document_streams_windows_and_extracts_before_parsing_finishes(db_session, monkeypatch, tmp_path):
+    from app.config import get_settings
+    from app.models.audit_log import AuditLog
+    from app.models.chunk import Chunk
+    from app.models.document import Confidentiality, Document, DocumentStatus
+    from app.models.record import Record
+    from app.parsers.base import ParsedDocument, ParsedSection
+
+    events = []
+
+    class StreamingParser:
+        supports_streaming = True
+
+        def stream(self, _file_path):
+            def sections():
+                for index in range(6):
+                    events.append(("section", index))
+                    yield ParsedSection(
+                        title=f"Produkt {index}",
+                        content=f"Produkt {index} isoliert Rundkabel von 8 bis 13 mm sicher ab.",
+                        level=1,
+                    )
+
+            return ParsedDocument(raw_text="", sections=sections(), confidence=0.7, file_type="pdf")
+
+    class RecordingExtractor:
+        async def extract(self, text, schema, context):
+            events.append(("extract", context.section_path))
+            return ExtractionResult(
+                data={"artnr": context.section_path, "name": context.section_path, "beschreibung": text},
+                valid=True,
+                confidence=0.9,
+            )
+
+    def download_to_temp(_object_name):
+        copy = tmp_path / "katalog.pdf"
+        copy.write_bytes(b"%PDF-1.4 katalog")
+        return str(copy)
+
+    monkeypatch.setattr(
+        "app.services.ingestion.get_storage_service",
+        lambda: SimpleNamespace(download_to_temp=download_to_temp),
+    )
+    monkeypatch.setattr("app.services.ingestion.get_parser", lambda _path: StreamingParser())
+    monkeypatch.setattr("app.services.ingestion.get_extractor", lambda: RecordingExtractor())
+    monkeypatch.setattr("app.services.ingestion.get_extraction_cache", lambda: None)
+    monkeypatch.setattr(get_settings(), "extraction_unit_token_budget", 0)
+    monkeypatch.setattr(get_settings(), "ingestion_stream_window_chunks", 2)
+    monkeypatch.setattr(get_settings(), "ingestion_stream_windows_in_flight", 2)
+
+    document = Document(
+        id=uuid4(),
+        filename="katalog.pdf",
+        file_path="product/katalog.pdf",
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        version_date=datetime(2024, 1, 1),
+        owner="qa",
+        confidentiality=Confidentiality.INTERNAL,
+        status=DocumentStatus.UPLOADING,
+    )
+    db_session.add(document)
+    db_session.commit()
+
+    IngestionService(db_session).process_document(document.id)
+
+    assert events.index(("extract", "Produkt 0")) < events.index(("section", 5))
+    assert sorted(path for kind, path in events if kind == "extract") == [f"Produkt {index}" for index in range(6)]
+    assert db_session.query(Chunk).filter(Chunk.document_id == document.id).count() == 6
+    assert db_session.query(Record).filter(Record.document_id == document.id).count() == 6
+    db_session.refresh(document)
+    assert document.status == DocumentStatus.PENDING_REVIEW
+    assert document.parse_hash
+    assert set(document.section_hashes_json) == {f"Produkt {index}" for index in range(6)}
+    # Windows overlap; each stage still reports wall time within the document's total.
+    stages = document.metrics_json["stages"]
+    assert {"parse", "extract"} <= set(stages)
+    assert all(seconds <= document.metrics_json["total_seconds"] for seconds in stages.values())
+    details = db_session.query(AuditLog).filter(AuditLog.action == "records_extracted").one().details_json
+    assert details["streamed_batches"] == 3
+    assert details["section_units"] == 6
+
+
+def test_chunk_windows_close_at_root_section_boundaries(monkeypatch):
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    service = IngestionService(db=SimpleNamespace())
+    paths = ["A", "A > 1", "A > 2", "B", "C > 1", "C > 2", "C > 3", "C > 4", "C > 5"]
+    chunks = [SimpleNamespace(section_path=path) for path in paths]
+
+    windows = list(service._iter_chunk_windows(iter(chunks), window_size=2))
+
+    assert [[chunk.section_path for chunk in window] for window in windows] == [
+        ["A", "A > 1", "A > 2"],
+        ["B", "C > 1", "C > 2", "C > 3"],
+        ["C > 4", "C > 5"],
+    ]
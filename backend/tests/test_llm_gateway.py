@@ -0,0 +1,166 @@
+import asyncio
+from types import SimpleNamespace
+
+import anthropic
+import httpx
+
+from app.extractors.llm_gateway import LLMGateway, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _status_error(status_code, retry_after=None):
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    response = httpx.Response(status_code, headers=headers, request=httpx.Request("POST", "https://api.anthropic.com"))
+    error_class = anthropic.RateLimitError if status_code == 429 else anthropic.APIStatusError
+    return error_class("throttled", response=response, body=None)
+
+
+class ScriptedMessages:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def create(self, **_kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _gateway(messages, monkeypatch, **kwargs):
+    gateway = LLMGateway(api_key="test", **kwargs)
+    monkeypatch.setattr(gateway, "client", lambda: SimpleNamespace(messages=messages))
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("app.extractors.llm_gateway.asyncio.sleep", fake_sleep)
+    return gateway, sleeps
+
+
+def test_token_bucket_waits_for_refill_and_accepts_corrections():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=60, clock=clock)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(3) == 3.0
+    clock.now = 3.0
+    bucket.adjust(-2)
+    assert bucket.reserve(2) == 0.0
+
+
+def test_gateway_honours_retry_after_and_pauses_other_callers(monkeypatch):
+    ok = SimpleNamespace(usage=SimpleNamespace(input_tokens=100, output_tokens=20))
+    messages = ScriptedMessages([_status_error(429, retry_after="7"), _status_error(529), ok])
+    gateway, sleeps = _gateway(messages, monkeypatch, backoff_base_seconds=2.0)
+
+    response = asyncio.run(gateway.create_message(model="m", max_tokens=10, messages=[{"role": "user", "content": "x"}]))
+
+    assert response is ok
+    assert messages.calls == 3
+    # Backoff, then the process-wide pause seen by the next acquire (the fake
+    # sleep does not advance time). retry-after is used as is; without it the
+    # delay is jittered below base * 2 ** attempt.
+    assert sleeps[0] == 7.0
+    assert 6.0 < sleeps[1] <= 7.0
+    assert 0.0 <= sleeps[2] <= 4.0
+    metrics = gateway.metrics()
+    assert metrics["throttled"] == 2
+    assert metrics["retries"] == 2
+    assert metrics["output_tokens"] == 20
+    assert metrics["paused_for_seconds"] > 0
+
+
+def test_gateway_raises_non_retryable_errors_immediately(monkeypatch):
+    messages = ScriptedMessages([_status_error(400)])
+    gateway, sleeps = _gateway(messages, monkeypatch)
+
+    try:
+        asyncio.run(gateway.create_message(model="m", max_tokens=10, messages=[]))
+    except anthropic.APIStatusError as exc:
+        assert exc.status_code == 400
+    else:
+        raise AssertionError("Expected the API error to be raised")
+
+    assert messages.calls == 1
+    assert sleeps == []
+    assert gateway.metrics()["failures"] == 1
+
+
+def test_gateway_queues_requests_above_the_rate_limit(monkeypatch):
+    ok = SimpleNamespace(usage=SimpleNamespace(input_tokens=1, output_tokens=1))
+    messages = ScriptedMessages([ok, ok, ok])
+    gateway, sleeps = _gateway(messages, monkeypatch, requests_per_minute=2, tokens_per_minute=0)
+
+    async def run():
+        for _ in range(3):
+            await gateway.create_message(model="m", max_tokens=1, messages=[])
+
+    asyncio.run(run())
+
+    assert len(sleeps) == 1
+    assert 29.0 < sleeps[0] <= 30.0
+    assert gateway.metrics()["max_queue_wait_seconds"] == sleeps[0]
+
+
+def test_gateway_times_out_the_api_call_but_not_the_queue_wait(monkeypatch):
+    class HangingMessages:
+        async def create(self, **_kwargs):
+            await asyncio.Event().wait()
+
+    ok = SimpleNamespace(usage=SimpleNamespace(input_tokens=1, output_tokens=1))
+    gateway, sleeps = _gateway(
+        ScriptedMessages([ok, ok]), monkeypatch, requests_per_minute=1, tokens_per_minute=0, request_timeout_seconds=0.01
+    )
+
+    async def run():
+        await gateway.create_message(model="m", max_tokens=1, messages=[])
+        # Queued for a minute (fake sleep), far beyond the call timeout.
+        return await gateway.create_message(model="m", max_tokens=1, messages=[])
+
+    assert asyncio.run(run()) is ok
+    assert 59.0 < sleeps[0] <= 60.0
+
+    monkeypatch.setattr(gateway, "client", lambda: SimpleNamespace(messages=HangingMessages()))
+    gateway.requests = None
+    try:
+        asyncio.run(gateway.create_message(model="m", max_tokens=1, messages=[]))
+    except asyncio.TimeoutError:
+        pass
+    else:
+        raise AssertionError("a hanging API call must time out")
+    assert gateway.metrics()["failures"] == 1
+
+
+def test_gateway_refunds_the_reservation_of_a_cancelled_queued_call():
+    gateway = LLMGateway(api_key="test", requests_per_minute=60, tokens_per_minute=6000)
+    clock = FakeClock()
+    for bucket in (gateway.requests, gateway.tokens):
+        bucket._clock = clock
+        bucket._updated_at = 0.0
+    gateway.requests._level = 0
+    gateway.tokens._level = 0
+
+    async def run():
+        queued = asyncio.ensure_future(gateway._acquire(3000))
+        await asyncio.sleep(0)
+        queued.cancel()
+        try:
+            await queued
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+
+    # Without the refund the next call would queue behind the cancelled one.
+    assert gateway.requests.reserve(1) == 1.0
+    assert gateway.tokens.reserve(3000) == 30.0
@@ -5,6 +5,7 @@ from docx import Document as WordDocument
 from app.parsers.docx_parser import DocxParser
 from app.parsers.markdown_parser import MarkdownParser
 from app.parsers.csv_parser import CsvParser
+from app.parsers.pdf_parser import PdfParser
 
 
 class TestMarkdownParser:
@@ -159,3 +160,64 @@ class TestDocxParser:
             assert any("Fallback-Parser" in warning for warning in result.warnings)
         finally:
             os.unlink(temp_path)
+
+
+class FakePdfPage:
+    def __init__(self, text, log):
+        self.text = text
+        self.log = log
+
+    def extract_text(self):
+        self.log.append(self.text[:12])
+        return self.text
+
+    def flush_cache(self):
+        pass
+
+
+class FakePdf:
+    def __init__(self, texts, log):
+        self.pages = [FakePdfPage(text, log) for text in texts]
+        self.metadata = {"Title": "Katalog"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+
+class TestPdfParser:
+    """Tests for PDF page streaming."""
+
+    PAGES = [
+        "Entmanteler No. 16\nIsoliert Rundkabel von 8 bis 13 mm sicher und ohne Beschaedigung der Adern ab.",
+        "",
+        "Zubehoer\nErsatzmesser und Tiefenanschlag passen auf alle Entmanteler der Serie.",
+    ]
+
+    def test_stream_yields_the_sections_of_parse_page_by_page(self, monkeypatch):
+        log = []
+        monkeypatch.setattr("app.parsers.pdf_parser.pdfplumber.open", lambda _path: FakePdf(self.PAGES, log))
+        parser = PdfParser()
+
+        parsed = parser.parse("katalog.pdf")
+        log.clear()
+        streamed = parser.stream("katalog.pdf")
+
+        assert parser.supports_streaming is True
+        assert streamed.raw_text == ""
+        assert log == []
+        first = next(iter(streamed.sections))
+        assert log == [self.PAGES[0][:12]]
+        assert [first, *streamed.sections] == parsed.sections
+        assert parsed.metadata == {"title": "Katalog", "page_count": 3}
+
+    def test_stream_raises_read_errors(self, monkeypatch):
+        def broken(_path):
+            raise OSError("kaputt")
+
+        monkeypatch.setattr("app.parsers.pdf_parser.pdfplumber.open", broken)
+
+        with pytest.raises(RuntimeError, match="Fehler beim Lesen der PDF: kaputt"):
+            list(PdfParser().stream("katalog.pdf").sections)
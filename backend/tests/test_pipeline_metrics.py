@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+from app.api.documents import get_pipeline_metrics
+from app.models.document import Confidentiality, Department, DocType, Document, DocumentStatus
+from app.services.pipeline_metrics import PipelineMetrics, percentile, summarize_pipeline_metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_pipeline_metrics_accumulate_stages_and_unit_tokens():
+    clock = FakeClock()
+    metrics = PipelineMetrics(clock=clock)
+
+    with metrics.stage("parse"):
+        clock.now += 1.5
+    with metrics.stage("embed"):
+        clock.now += 0.25
+    with metrics.stage("parse"):
+        clock.now += 0.5
+    metrics.record_unit(0, 2.0, usage={"input_tokens": 900, "output_tokens": 120, "cache_read_input_tokens": 800}, model="claude-test")
+    metrics.record_unit(3, 0.0, model="claude-test", from_cache=True)
+
+    payload = metrics.as_dict()
+
+    assert payload["total_seconds"] == 2.25
+    assert payload["stages"] == {"parse": 2.0, "embed": 0.25}
+    assert payload["llm_units"] == 1
+    assert payload["cached_units"] == 1
+    assert payload["tokens"] == {
+        "input_tokens": 900,
+        "output_tokens": 120,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 800,
+    }
+    assert payload["units"][0]["model"] == "claude-test"
+
+
+def test_pipeline_metrics_report_concurrent_stage_runs_as_wall_time():
+    clock = FakeClock()
+    metrics = PipelineMetrics(clock=clock)
+
+    # Two streamed windows: the second is parsed and extracted while the first is still extracting.
+    with metrics.stage("parse"):
+        clock.now += 1.0
+    first_window = metrics.stage("extract")
+    first_window.__enter__()
+    with metrics.stage("parse"):
+        clock.now += 1.0
+    second_window = metrics.stage("extract")
+    second_window.__enter__()
+    clock.now += 2.0
+    first_window.__exit__(None, None, None)
+    clock.now += 1.0
+    second_window.__exit__(None, None, None)
+
+    payload = metrics.as_dict()
+
+    assert payload["total_seconds"] == 5.0
+    assert payload["stages"] == {"parse": 2.0, "extract": 4.0}
+    assert all(seconds <= payload["total_seconds"] for seconds in payload["stages"].values())
+
+
+def test_summarize_pipeline_metrics_reports_percentiles_per_doc_type():
+    rows = [
+        ("faq", {"total_seconds": float(seconds), "stages": {"parse": seconds / 10}, "units": [{"seconds": seconds}], "tokens": {"input_tokens": seconds * 100}})
+        for seconds in range(1, 11)
+    ]
+    rows.append(("product_spec", {"total_seconds": 4.0, "stages": {"embed": 1.0}, "units": [], "tokens": {}}))
+
+    summary = summarize_pipeline_metrics(rows)
+
+    assert summary["faq"]["documents"] == 10
+    assert summary["faq"]["total_seconds"] == {"p50": 5.5, "p90": 9.1, "p95": 9.55}
+    assert summary["faq"]["stages"]["parse"]["p50"] == 0.55
+    assert summary["faq"]["unit_seconds"]["p90"] == 9.1
+    assert summary["faq"]["tokens"]["input_tokens"]["p50"] == 550
+    assert summary["product_spec"]["unit_seconds"] == {"p50": None, "p90": None, "p95": None}
+    assert percentile([], 50) is None
+
+
+def test_pipeline_metrics_endpoint_filters_by_doc_type(db_session):
+    for doc_type, seconds in ((DocType.FAQ, 2.0), (DocType.FAQ, 4.0), (DocType.PRODUCT_SPEC, 9.0), (DocType.FAQ, None)):
+        db_session.add(
+            Document(
+                id=uuid4(),
+                filename="source.md",
+                department=Department.SUPPORT,
+                doc_type=doc_type,
+                version_date=datetime.utcnow(),
+                owner="qa",
+                confidentiality=Confidentiality.INTERNAL,
+                status=DocumentStatus.PENDING_REVIEW,
+                metrics_json=None if seconds is None else {"total_seconds": seconds, "stages": {"persist": seconds / 2}},
+            )
+        )
+    db_session.commit()
+
+    summary = asyncio.run(get_pipeline_metrics(doc_type=DocType.FAQ, limit=500, db=db_session))
+
+    assert list(summary) == ["faq"]
+    assert summary["faq"]["documents"] == 2
+    assert summary["faq"]["total_seconds"]["p50"] == 3.0
+    assert summary["faq"]["stages"]["persist"]["p95"] == 1.95
@@ -0,0 +1,136 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.api.review import list_review_queue
+from app.api.search import search_knowledge
+from app.models.attachment import RecordAttachment
+from app.models.chunk import Chunk
+from app.models.document import Confidentiality, Department, DocType, Document, DocumentStatus
+from app.models.evidence import Evidence
+from app.models.record import Record, RecordStatus
+from app.services.search_cache import get_search_cache
+from app.services.search_index import SearchIndex
+
+
+@contextmanager
+def _count_queries(db_session):
+    statements = []
+    engine = db_session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _seed(db_session, count, status):
+    document = Document(
+        id=uuid4(),
+        filename="katalog.pdf",
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        version_date=datetime.utcnow(),
+        owner="qa",
+        confidentiality=Confidentiality.INTERNAL,
+        status=DocumentStatus.COMPLETED,
+    )
+    chunk = Chunk(id=uuid4(), document_id=document.id, text="Entmanteler", chunk_index=0)
+    db_session.add_all([document, chunk])
+
+    for number in range(count):
+        record = Record(
+            id=uuid4(),
+            document_id=document.id,
+            department=Department.PRODUCT,
+            schema_type="ProductSpec",
+            primary_key=str(30000 + number),
+            data_json={"artnr": str(30000 + number), "name": "Entmanteler"},
+            completeness_score=1.0,
+            status=status,
+        )
+        db_session.add(record)
+        db_session.flush()
+        db_session.add_all(
+            [
+                Evidence(record_id=record.id, chunk_id=chunk.id, field_path="name", excerpt="Entmanteler"),
+                Evidence(record_id=record.id, chunk_id=chunk.id, field_path="artnr", excerpt=record.primary_key),
+                RecordAttachment(
+                    record_id=record.id,
+                    filename="bild.png",
+                    file_type="image/png",
+                    file_path=f"attachments/{record.id}/bild.png",
+                ),
+            ]
+        )
+    db_session.commit()
+    db_session.expunge_all()
+
+
+def _review_queue_queries(db_session, count):
+    _seed(db_session, count, RecordStatus.PENDING)
+    with _count_queries(db_session) as statements:
+        response = asyncio.run(
+            list_review_queue(
+                department=None,
+                schema_type=None,
+                status=None,
+                sort_by="completeness",
+                page=1,
+                limit=20,
+                db=db_session,
+            )
+        )
+    assert len(response.records) == count
+    assert all(len(record.evidence_items) == 2 and len(record.attachments) == 1 for record in response.records)
+    assert all(record.source_metadata.source_kind == "manual_upload" for record in response.records)
+    return len(statements)
+
+
+def test_review_queue_query_count_does_not_grow_with_page_size(db_session):
+    small_page = _review_queue_queries(db_session, 2)
+    db_session.query(Record).delete()
+    db_session.commit()
+    large_page = _review_queue_queries(db_session, 8)
+
+    assert small_page == large_page
+
+
+def _search_queries(db_session, monkeypatch, count):
+    _seed(db_session, count, RecordStatus.APPROVED)
+    index = SearchIndex()
+    index.ensure_loaded(db_session)
+    monkeypatch.setattr("app.services.knowledge_search.get_search_index", lambda: index)
+
+    with _count_queries(db_session) as statements:
+        response = asyncio.run(
+            search_knowledge(
+                q="Entmanteler",
+                department=None,
+                schema_type=None,
+                limit=20,
+                mode="lexical",
+                min_similarity=None,
+                db=db_session,
+            )
+        )
+    assert len(response.results) == count
+    assert all(len(result.evidence) == 2 for result in response.results)
+    return len(statements)
+
+
+def test_search_query_count_does_not_grow_with_result_count(db_session, monkeypatch):
+    small_page = _search_queries(db_session, monkeypatch, 2)
+    db_session.query(Record).delete()
+    db_session.commit()
+    get_search_cache().invalidate()
+    large_page = _search_queries(db_session, monkeypatch, 8)
+
+    assert small_page == large_page
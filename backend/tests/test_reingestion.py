@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.api.upload import _find_previous_version
+from app.models.document import Confidentiality, Department, DocType, Document, DocumentStatus
+from app.parsers.base import ParsedDocument, ParsedSection
+from app.services.reingestion import compute_section_hashes, diff_sections
+
+
+def _parsed(*sections):
+    return ParsedDocument(
+        raw_text="\n\n".join(content for _path, _title, content in sections),
+        sections=[ParsedSection(title=title, content=content, level=1, path=path) for path, title, content in sections],
+    )
+
+
+def test_section_diff_classifies_added_changed_removed_and_unchanged_paths():
+    previous = compute_section_hashes(_parsed(
+        ("", "Entmanteler", "Isoliert Rundkabel von 8 bis 13 mm."),
+        ("Entmanteler", "Zubehoer", "Ersatzmesser No. 16."),
+        ("", "Sicherheit", "Nicht unter Spannung arbeiten."),
+    ))
+    current = compute_section_hashes(_parsed(
+        ("", "Entmanteler", "Isoliert Rundkabel von 8 bis 13 mm.  "),
+        ("Entmanteler", "Zubehoer", "Ersatzmesser No. 16 und Tiefenanschlag."),
+        ("", "Garantie", "Zwei Jahre."),
+        ("", "Leer", "   "),
+    ))
+
+    diff = diff_sections(previous, current)
+
+    assert diff.unchanged == {"Entmanteler"}
+    assert diff.changed == {"Entmanteler > Zubehoer"}
+    assert diff.added == {"Garantie"}
+    assert diff.removed == {"Sicherheit"}
+    assert diff.needs_extraction("Entmanteler > Zubehoer")
+    assert not diff.needs_extraction("Entmanteler")
+    # A record of the root section covers the changed subsection.
+    assert not diff.is_unaffected("Entmanteler")
+    assert not diff.is_unaffected("Sicherheit")
+    assert not diff.is_unaffected(None)
+    assert diff.is_unaffected("Bedienung")
+
+
+def test_section_hashes_fall_back_to_raw_text_without_sections():
+    assert list(compute_section_hashes(ParsedDocument(raw_text="Nur Fliesstext"))) == [""]
+
+
+def test_find_previous_version_picks_latest_ingested_document_with_same_name(db_session):
+    def add(filename, status, age_days, doc_type=DocType.PRODUCT_SPEC):
+        document = Document(
+            id=uuid4(),
+            filename=filename,
+            department=Department.PRODUCT,
+            doc_type=doc_type,
+            version_date=datetime(2024, 1, 1),
+            owner="qa",
+            confidentiality=Confidentiality.INTERNAL,
+            status=status,
+            uploaded_at=datetime.utcnow() - timedelta(days=age_days),
+        )
+        db_session.add(document)
+        return document
+
+    add("katalog.pdf", DocumentStatus.COMPLETED, 60)
+    expected = add("katalog.pdf", DocumentStatus.PENDING_REVIEW, 30)
+    add("katalog.pdf", DocumentStatus.EXTRACTION_FAILED, 1)
+    add("katalog.pdf", DocumentStatus.COMPLETED, 0, doc_type=DocType.SAFETY_NOTES)
+    db_session.commit()
+
+    assert _find_previous_version(db_session, "katalog.pdf", Department.PRODUCT, DocType.PRODUCT_SPEC).id == expected.id
+    assert _find_previous_version(db_session, "preisliste.pdf", Department.PRODUCT, DocType.PRODUCT_SPEC) is None
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from app.extractors.base import ExtractedRecord, ExtractionContext, ExtractionResult
+from app.extractors.factory import get_extractor
+from app.extractors.routing import RoutingExtractor
+
+
+class Schema(BaseModel):
+    question: str
+
+
+class ScriptedExtractor:
+    prompt_version = "3"
+
+    def __init__(self, model, result):
+        self.model = model
+        self.result = result
+        self.calls = 0
+
+    async def extract(self, text, schema, context):
+        self.calls += 1
+        return ExtractionResult(**{**self.result.__dict__, "usage": dict(self.result.usage)})
+
+
+def _result(model, confidence=0.9, valid=True):
+    return ExtractionResult(
+        records=[ExtractedRecord(data={"question": "Wie?"}, schema_type="FAQ", confidence=confidence)],
+        valid=valid,
+        confidence=confidence,
+        model=model,
+        usage={"input_tokens": 100},
+    )
+
+
+def _context(doc_type="faq"):
+    return ExtractionContext(department="support", doc_type=doc_type, document_id="d", filename="faq.md")
+
+
+def _router(fast_result):
+    fast = ScriptedExtractor("fast", fast_result)
+    full = ScriptedExtractor("full", _result("full"))
+    return RoutingExtractor(fast, full, fast_doc_types={"faq"}, min_confidence=0.7, max_fast_unit_tokens=100), fast, full
+
+
+def test_routing_keeps_confident_fast_results():
+    router, fast, full = _router(_result("fast"))
+
+    result = asyncio.run(router.extract("Wie entmantele ich?", Schema, _context()))
+
+    assert result.model == "fast"
+    assert (fast.calls, full.calls) == (1, 0)
+    assert router.model == "fast>full"
+
+
+def test_routing_escalates_low_confidence_and_sums_usage():
+    router, fast, full = _router(_result("fast", confidence=0.5))
+
+    result = asyncio.run(router.extract("Wie entmantele ich?", Schema, _context()))
+
+    assert result.model == "full"
+    assert (fast.calls, full.calls) == (1, 1)
+    assert result.usage == {"input_tokens": 200}
+
+
+def test_routing_sends_other_doc_types_and_complex_units_to_the_full_model():
+    router, fast, full = _router(_result("fast"))
+
+    asyncio.run(router.extract("Kurz", Schema, _context(doc_type="training_module")))
+    asyncio.run(router.extract("x" * 420, Schema, _context()))
+
+    assert (fast.calls, full.calls) == (0, 2)
+
+
+def test_get_extractor_builds_router_when_fast_model_is_configured(monkeypatch):
+    settings = SimpleNamespace(
+        llm_provider="claude",
+        anthropic_api_key="key",
+        anthropic_model="claude-sonnet-4-6",
+        anthropic_fast_model="claude-haiku-4-5",
+        llm_fast_model_doc_types_list=["faq"],
+        llm_escalation_min_confidence=0.7,
+        llm_fast_model_max_unit_tokens=1500,
+    )
+    monkeypatch.setattr("app.extractors.factory.get_settings", lambda: settings)
+    monkeypatch.setattr("app.extractors.claude.get_settings", lambda: settings)
+
+    extractor = get_extractor()
+
+    assert isinstance(extractor, RoutingExtractor)
+    assert extractor.model == "claude-haiku-4-5>claude-sonnet-4-6"
@@ -0,0 +1,29 @@
+from app.models.record import Record, RecordStatus
+from app.schemas.knowledge.registry import get_schema_registry
+from benchmarks.search_benchmark import build_queries, percentile, reset_search_state, run_queries, seed_corpus
+
+
+def test_percentile_interpolates_between_ranks():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 0.5) == 2.5
+    assert percentile(list(range(1, 101)), 0.99) == 99.01
+
+
+def test_benchmark_seeds_every_schema_and_reports_per_shape(db_session):
+    schema_count = len(get_schema_registry().get_all_schemas())
+    generator = seed_corpus(db_session, schema_count * 3, seed=1)
+
+    rows = db_session.query(Record.schema_type).filter(Record.status == RecordStatus.APPROVED).all()
+    schema_types = {row[0] for row in rows}
+    assert len(schema_types) == schema_count
+
+    reset_search_state()
+    queries = build_queries(generator, 40, ["lexical", "fuzzy"], seed=3)
+    report = run_queries(db_session, queries)
+
+    assert set(report) <= {"lexical", "fuzzy"}
+    lexical = report["lexical"]
+    assert lexical["overall"]["count"] == sum(shape["count"] for shape in lexical["shapes"].values())
+    assert lexical["overall"]["p50_ms"] <= lexical["overall"]["p99_ms"]
+    # Hydration of a result page needs a constant number of statements.
+    assert lexical["overall"]["max_round_trips"] <= 6
@@ -0,0 +1,160 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.api.documents import delete_document
+from app.api.review import approve_record, reject_record
+from app.api.search import search_knowledge
+from app.auth import AuthenticatedUser
+from app.models.document import Confidentiality, Department, DocType, Document, DocumentStatus
+from app.models.record import Record, RecordStatus
+from app.schemas.review import ReviewAction
+from app.services.search_cache import SearchCache, get_search_cache, search_cache_key
+from app.services.search_index import SearchIndex
+from app.services.suggest_index import SuggestIndex
+from app.services.trigram_index import TrigramIndex
+
+
+def _record(primary_key, status=RecordStatus.APPROVED):
+    return Record(
+        id=uuid4(),
+        department=Department.PRODUCT,
+        schema_type="ProductSpec",
+        primary_key=primary_key,
+        data_json={"artnr": primary_key, "name": "Entmanteler"},
+        completeness_score=1.0,
+        status=status,
+    )
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.services.search_cache.time.monotonic", lambda: now[0])
+    cache = SearchCache(max_entries=2, ttl_seconds=10)
+
+    cache.put("a", 1, cache.generation)
+    cache.put("b", 2, cache.generation)
+    assert cache.get("a") == 1
+    cache.put("c", 3, cache.generation)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] += 10
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_cache_drops_results_computed_before_an_invalidation():
+    cache = SearchCache()
+    generation = cache.generation
+    cache.put("a", 1, generation)
+
+    cache.invalidate()
+    cache.put("b", 2, generation)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+
+
+def test_cache_key_normalizes_lexical_queries_only():
+    assert search_cache_key("  Entmanteler   30199 ", None, None, 10, "lexical") == search_cache_key(
+        "entmanteler 30199", None, None, 10, "lexical"
+    )
+    assert search_cache_key("Entmanteler", None, None, 10, "semantic") != search_cache_key(
+        "entmanteler", None, None, 10, "semantic"
+    )
+
+
+def test_search_endpoint_serves_repeats_from_cache_until_review_action(db_session, monkeypatch):
+    approved = _record("30199")
+    pending = _record("30200", status=RecordStatus.PENDING)
+    rejected = _record("30300", status=RecordStatus.REJECTED)
+    db_session.add_all([approved, pending, rejected])
+    db_session.commit()
+
+    index = SearchIndex()
+    monkeypatch.setattr("app.services.knowledge_search.get_search_index", lambda: index)
+    monkeypatch.setattr("app.services.search_index.get_search_index", lambda: index)
+    user = AuthenticatedUser(id="reviewer")
+
+    def search():
+        return asyncio.run(
+            search_knowledge(
+                q="Entmanteler",
+                department=None,
+                schema_type=None,
+                limit=10,
+                mode="lexical",
+                min_similarity=None,
+                db=db_session,
+            )
+        )
+
+    assert [result.record_id for result in search().results] == [approved.id]
+    cached = search()
+    assert set(cached.timings_ms) == {"cache"}
+    assert get_search_cache().hits == 1
+
+    # Rejecting a record that was never searchable does not touch the cache.
+    asyncio.run(reject_record(record_id=rejected.id, action=ReviewAction(), db=db_session, current_user=user))
+    assert set(search().timings_ms) == {"cache"}
+
+    asyncio.run(approve_record(record_id=pending.id, action=ReviewAction(), db=db_session, current_user=user))
+    response = search()
+
+    assert set(response.timings_ms) == {"lexical"}
+    assert {result.record_id for result in response.results} == {approved.id, pending.id}
+
+
+def test_deleting_a_document_removes_its_records_from_search(db_session, monkeypatch):
+    document = Document(
+        id=uuid4(),
+        filename="katalog.pdf",
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        version_date=datetime.utcnow(),
+        owner="qa",
+        confidentiality=Confidentiality.INTERNAL,
+        status=DocumentStatus.COMPLETED,
+        file_path="katalog.pdf",
+    )
+    record = _record("30199")
+    record.document_id = document.id
+    db_session.add_all([document, record])
+    db_session.commit()
+
+    index, trigram_index, suggest_index = SearchIndex(), TrigramIndex(), SuggestIndex()
+    monkeypatch.setattr("app.services.knowledge_search.get_search_index", lambda: index)
+    monkeypatch.setattr("app.services.search_index.get_search_index", lambda: index)
+    monkeypatch.setattr("app.services.trigram_index.get_trigram_index", lambda: trigram_index)
+    monkeypatch.setattr("app.services.suggest_index.get_suggest_index", lambda: suggest_index)
+    monkeypatch.setattr(
+        "app.services.storage.get_storage_service",
+        lambda: SimpleNamespace(delete_file=lambda _path: None),
+    )
+    for structure in (trigram_index, suggest_index):
+        structure.ensure_loaded(db_session)
+
+    def search():
+        return asyncio.run(
+            search_knowledge(
+                q="Entmanteler",
+                department=None,
+                schema_type=None,
+                limit=10,
+                mode="lexical",
+                min_similarity=None,
+                db=db_session,
+            )
+        )
+
+    assert [result.record_id for result in search().results] == [record.id]
+
+    asyncio.run(
+        delete_document(document_id=document.id, db=db_session, current_user=AuthenticatedUser(id="admin"))
+    )
+
+    assert search().results == []
+    assert len(index) == len(trigram_index) == len(suggest_index) == 0
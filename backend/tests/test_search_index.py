@@ -0,0 +1,343 @@
+import asyncio
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.search import search_knowledge
+from app.models.chunk import Chunk
+from app.models.document import Confidentiality, Department, DocType, Document, DocumentStatus
+from app.models.evidence import Evidence
+from app.models.record import Record, RecordStatus
+from app.services.embeddings import HashingEmbeddingProvider
+from app.services.knowledge_search import (
+    IndexSearchBackend,
+    PostgresSearchBackend,
+    SemanticSearchBackend,
+    get_search_backend,
+)
+from app.services.search_index import SearchIndex, tokenize
+
+
+def _record(primary_key, data, status=RecordStatus.APPROVED, department=Department.PRODUCT, schema_type="ProductSpec", completeness=1.0):
+    return Record(
+        id=uuid4(),
+        department=department,
+        schema_type=schema_type,
+        primary_key=primary_key,
+        data_json=data,
+        completeness_score=completeness,
+        status=status,
+    )
+
+
+def test_tokenize_keeps_umlauts_and_article_numbers():
+    assert tokenize("Entmanteler Nr. 30199 für Kabel-Ø") == ["entmanteler", "nr", "30199", "für", "kabel", "ø"]
+
+
+def test_index_ranks_primary_key_matches_first_and_skips_provenance(db_session):
+    strip = _record("30199", {"artnr": "30199", "name": "Entmanteler PV-Strip Pro"})
+    mention = _record("30200", {"artnr": "30200", "name": "Kabelmesser", "compatibility": ["30199"]})
+    provenance_only = _record("40000", {"artnr": "40000", "name": "Zange", "_source": {"source_id": "30199"}})
+    db_session.add_all([strip, mention, provenance_only])
+    db_session.commit()
+
+    index = SearchIndex()
+    index.ensure_loaded(db_session)
+
+    hits = index.search("30199", limit=10)
+
+    assert [record_id for record_id, _ in hits] == [strip.id, mention.id]
+    assert hits[0][1] > hits[1][1]
+
+
+def test_index_applies_filters_and_incremental_removal(db_session):
+    product = _record("30199", {"artnr": "30199", "name": "Entmanteler"})
+    faq = _record(
+        "wie entmantele ich",
+        {"question": "Wie entmantele ich?", "answer": "Mit dem Entmanteler."},
+        department=Department.SUPPORT,
+        schema_type="FAQ",
+    )
+    pending = _record("30300", {"artnr": "30300", "name": "Entmanteler Neu"}, status=RecordStatus.PENDING)
+    db_session.add_all([product, faq, pending])
+    db_session.commit()
+
+    index = SearchIndex()
+    index.ensure_loaded(db_session)
+
+    assert len(index) == 2
+    assert [hit[0] for hit in index.search("entmanteler", department="support")] == [faq.id]
+    assert [hit[0] for hit in index.search("entmanteler", schema_type="ProductSpec")] == [product.id]
+
+    pending.status = RecordStatus.APPROVED
+    product.status = RecordStatus.REJECTED
+    index.sync_record(pending)
+    index.sync_record(product)
+
+    assert {hit[0] for hit in index.search("entmanteler")} == {faq.id, pending.id}
+
+
+class _StreamedRows:
+    """Stands in for the rebuild query; calls `during_stream` between the yielded rows."""
+
+    def __init__(self, rows, during_stream):
+        self.rows = rows
+        self.during_stream = during_stream
+
+    def filter(self, *criteria):
+        return self
+
+    def yield_per(self, count):
+        return self
+
+    def __iter__(self):
+        for row in self.rows:
+            yield row
+            self.during_stream()
+
+
+def _streaming_db(rows, during_stream):
+    return SimpleNamespace(query=lambda *columns: _StreamedRows(rows, during_stream))
+
+
+def test_index_rebuild_keeps_serving_searches_and_replays_syncs(db_session):
+    knife = _record("30200", {"artnr": "30200", "name": "Kabelmesser"})
+    db_session.add(knife)
+    db_session.commit()
+
+    index = SearchIndex()
+    index.ensure_loaded(db_session)
+
+    strip = _record("30199", {"artnr": "30199", "name": "Entmanteler"})
+    seen_during_rebuild = []
+
+    def during_stream():
+        # Searches from other threads are answered from the previous contents.
+        worker = threading.Thread(target=lambda: seen_during_rebuild.append(index.search("30199 30200")))
+        worker.start()
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+        # Rejected while the rebuild streams a snapshot that still lists it as approved.
+        strip.status = RecordStatus.REJECTED
+        index.sync_record(strip)
+
+    index.rebuild(_streaming_db([knife, strip], during_stream))
+
+    assert [[hit[0] for hit in hits] for hits in seen_during_rebuild] == [[knife.id], [knife.id]]
+    assert [hit[0] for hit in index.search("30199 30200")] == [knife.id]
+    assert len(index) == 1
+
+
+def test_index_rebuild_failure_keeps_previous_contents(db_session):
+    knife = _record("30200", {"artnr": "30200", "name": "Kabelmesser"})
+    db_session.add(knife)
+    db_session.commit()
+
+    index = SearchIndex()
+    index.ensure_loaded(db_session)
+
+    def lose_connection():
+        raise RuntimeError("connection lost")
+
+    strip = _record("30199", {"artnr": "30199", "name": "Entmanteler"})
+    with pytest.raises(RuntimeError):
+        index.rebuild(_streaming_db([strip], lose_connection))
+
+    assert [hit[0] for hit in index.search("30199 30200")] == [knife.id]
+    assert index.is_loaded
+
+
+def test_search_endpoint_returns_only_approved_records_with_completeness_boost(db_session, monkeypatch):
+    complete = _record("30199", {"artnr": "30199", "name": "Entmanteler"}, completeness=1.0)
+    incomplete = _record("30200", {"artnr": "30200", "name": "Entmanteler"}, completeness=0.0)
+    rejected = _record("30300", {"artnr": "30300", "name": "Entmanteler"}, status=RecordStatus.REJECTED)
+    db_session.add_all([complete, incomplete, rejected])
+    db_session.commit()
+
+    index = SearchIndex()
+    monkeypatch.setattr("app.services.knowledge_search.get_search_index", lambda: index)
+
+    response = asyncio.run(
+        search_knowledge(
+            q="Entmanteler",
+            department=None,
+            schema_type=None,
+            limit=10,
+            mode="lexical",
+            min_similarity=None,
+            db=db_session,
+        )
+    )
+
+    assert [result.record_id for result in response.results] == [complete.id, incomplete.id]
+    assert response.results[0].relevance_score > response.results[1].relevance_score
+
+
+def test_postgres_backend_pushes_filters_ranking_and_limit_into_sql(db_session, monkeypatch):
+    monkeypatch.setattr(
+        "app.services.knowledge_search.get_settings",
+        lambda: SimpleNamespace(search_backend="postgres", search_text_config="german"),
+    )
+    # SQLite sessions keep using the Python index even when Postgres search is configured.
+    assert isinstance(get_search_backend(db_session), IndexSearchBackend)
+
+    query = PostgresSearchBackend().build_query(db_session, "Entmanteler 30199", "product", "ProductSpec", 5)
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert "ts_rank_cd(records.search_vector, to_tsquery(" in sql
+    assert "records.search_vector @@ to_tsquery(" in sql
+    assert "records.department = " in sql
+    assert "records.schema_type = " in sql
+    assert "LIMIT" in sql
+
+
+def _document():
+    return Document(
+        id=uuid4(),
+        filename="katalog.pdf",
+        department=Department.PRODUCT,
+        doc_type=DocType.PRODUCT_SPEC,
+        version_date=datetime.utcnow(),
+        owner="qa",
+        confidentiality=Confidentiality.INTERNAL,
+        status=DocumentStatus.COMPLETED,
+    )
+
+
+def test_semantic_backend_maps_nearest_chunks_to_approved_records(db_session):
+    document = _document()
+    texts = ["Abisolierzange fuer Solarkabel", "Kabelmesser mit Hakenklinge", "Sicherheitshinweise"]
+    embeddings = HashingEmbeddingProvider(dimensions=1536).embed_batch(texts)
+    chunks = [
+        Chunk(id=uuid4(), document_id=document.id, text=text, embedding=embedding, chunk_index=index)
+        for index, (text, embedding) in enumerate(zip(texts, embeddings))
+    ]
+    solar = _record("30199", {"artnr": "30199", "name": "PV-Strip"})
+    knife = _record("30200", {"artnr": "30200", "name": "Kabelmesser"})
+    pending = _record("30300", {"artnr": "30300", "name": "Neu"}, status=RecordStatus.PENDING)
+    db_session.add_all([document, *chunks, solar, knife, pending])
+    db_session.flush()
+    db_session.add_all(
+        [
+            Evidence(record_id=solar.id, chunk_id=chunks[0].id, field_path="name", excerpt=texts[0]),
+            Evidence(record_id=knife.id, chunk_id=chunks[1].id, field_path="name", excerpt=texts[1]),
+            Evidence(record_id=pending.id, chunk_id=chunks[0].id, field_path="name", excerpt=texts[0]),
+        ]
+    )
+    db_session.commit()
+
+    hits = SemanticSearchBackend().search(db_session, texts[0], department=None, schema_type=None, limit=5)
+
+    assert [record_id for record_id, _ in hits] == [solar.id, knife.id]
+    assert hits[0][1] == 1.0
+
+
+def test_semantic_search_embeds_the_query_off_the_event_loop(db_session, monkeypatch):
+    document = _document()
+    text = "Abisolierzange fuer Solarkabel"
+    provider = HashingEmbeddingProvider(dimensions=1536)
+    chunk = Chunk(id=uuid4(), document_id=document.id, text=text, embedding=provider.embed(text), chunk_index=0)
+    solar = _record("30199", {"artnr": "30199", "name": "PV-Strip"})
+    db_session.add_all([document, chunk, solar])
+    db_session.flush()
+    db_session.add(Evidence(record_id=solar.id, chunk_id=chunk.id, field_path="name", excerpt=text))
+    db_session.commit()
+
+    embedding_threads = []
+
+    def embed(query):
+        embedding_threads.append(threading.current_thread())
+        return provider.embed(query)
+
+    monkeypatch.setattr(
+        "app.services.knowledge_search.get_embedding_provider",
+        lambda: SimpleNamespace(embed=embed),
+    )
+
+    response = asyncio.run(
+        search_knowledge(
+            q=text,
+            department=None,
+            schema_type=None,
+            limit=10,
+            mode="semantic",
+            min_similarity=None,
+            db=db_session,
+        )
+    )
+
+    assert [result.record_id for result in response.results] == [solar.id]
+    assert embedding_threads and threading.main_thread() not in embedding_threads
+
+
+def test_semantic_backend_filters_inside_the_ann_query_and_widens_short_scans(db_session, monkeypatch):
+    backend = SemanticSearchBackend(ef_search=40)
+    query = backend.build_nearest_query(db_session, np.zeros(1536, dtype=np.float32), "product", "ProductSpec")
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    inner = sql[sql.index("FROM chunks"):sql.index("LIMIT")]
+    assert "EXISTS" in inner
+    assert "records.status = " in inner
+    assert "records.department = " in inner
+    assert "records.schema_type = " in inner
+
+    statements = []
+    results = [[(uuid4(), 0.1, 1.0)], [(uuid4(), 0.1, 1.0), (uuid4(), 0.2, 1.0)]]
+    fake_db = SimpleNamespace(execute=lambda statement: statements.append(str(statement)))
+    monkeypatch.setattr(backend, "build_nearest_query", lambda *_args: SimpleNamespace(all=lambda: results.pop(0)))
+
+    rows = backend._nearest_chunks_postgres(fake_db, np.zeros(3), "product", None, limit=2)
+
+    assert len(rows) == 2
+    assert statements == [
+        "SET LOCAL hnsw.ef_search = 40",
+        "SET LOCAL ivfflat.probes = 10",
+        "SET LOCAL hnsw.ef_search = 160",
+        "SET LOCAL ivfflat.probes = 40",
+    ]
+
+
+def test_hybrid_search_fuses_lexical_and_semantic_rankings(db_session, monkeypatch):
+    document = _document()
+    texts = ["Abisolierzange fuer Solarkabel", "Schutzbrille und Handschuhe tragen"]
+    embeddings = HashingEmbeddingProvider(dimensions=1536).embed_batch(texts)
+    chunks = [
+        Chunk(id=uuid4(), document_id=document.id, text=text, embedding=embedding, chunk_index=index)
+        for index, (text, embedding) in enumerate(zip(texts, embeddings))
+    ]
+    both = _record("30199", {"artnr": "30199", "name": "Abisolierzange Solarkabel"})
+    lexical_only = _record("30200", {"artnr": "30200", "name": "Abisolierzange"})
+    semantic_only = _record("30300", {"artnr": "30300", "name": "Sicherheit"})
+    db_session.add_all([document, *chunks, both, lexical_only, semantic_only])
+    db_session.flush()
+    db_session.add_all(
+        [
+            Evidence(record_id=both.id, chunk_id=chunks[0].id, field_path="name", excerpt=texts[0]),
+            Evidence(record_id=semantic_only.id, chunk_id=chunks[1].id, field_path="name", excerpt=texts[1]),
+        ]
+    )
+    db_session.commit()
+
+    index = SearchIndex()
+    monkeypatch.setattr("app.services.knowledge_search.get_search_index", lambda: index)
+
+    response = asyncio.run(
+        search_knowledge(
+            q=texts[0],
+            department=None,
+            schema_type=None,
+            limit=10,
+            mode="hybrid",
+            min_similarity=None,
+            db=db_session,
+        )
+    )
+
+    assert response.results[0].record_id == both.id
+    assert {result.record_id for result in response.results} == {both.id, lexical_only.id, semantic_only.id}
+    assert set(response.timings_ms) == {"lexical", "semantic"}
@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.api.search import suggest_knowledge
+from app.models.document import Department
+from app.models.record import Record, RecordStatus
+from app.services.suggest_index import SuggestIndex
+
+
+def _record(primary_key, data, status=RecordStatus.APPROVED, department=Department.PRODUCT, schema_type="ProductSpec"):
+    return Record(
+        id=uuid4(),
+        department=department,
+        schema_type=schema_type,
+        primary_key=primary_key,
+        data_json=data,
+        completeness_score=1.0,
+        status=status,
+    )
+
+
+def test_suggest_matches_value_and_word_prefixes_once_per_record(db_session):
+    strip = _record("30199", {"artnr": "30199", "name": "Entmanteler PV-Strip Pro"})
+    knife = _record("30200", {"artnr": "30200", "name": "Kabelmesser"})
+    faq = _record(
+        "wie entmantele ich",
+        {"question": "Wie entmantele ich?"},
+        department=Department.SUPPORT,
+        schema_type="FAQ",
+    )
+    pending = _record("30300", {"artnr": "30300", "name": "Entmanteler Neu"}, status=RecordStatus.PENDING)
+    db_session.add_all([strip, knife, faq, pending])
+    db_session.commit()
+
+    index = SuggestIndex()
+    index.ensure_loaded(db_session)
+
+    assert [(s.record_id, s.field) for s in index.suggest("301")] == [(strip.id, "artnr")]
+    assert [s.text for s in index.suggest("Strip")] == ["Entmanteler PV-Strip Pro"]
+    assert {s.record_id for s in index.suggest("entmantel")} == {strip.id, faq.id}
+    assert [s.record_id for s in index.suggest("entmantel", department="support")] == [faq.id]
+    assert len(index.suggest("3", limit=1)) == 1
+    assert index.suggest("   ") == []
+
+
+def test_suggest_index_applies_approval_changes_incrementally(db_session):
+    knife = _record("30200", {"artnr": "30200", "name": "Kabelmesser"})
+    pending = _record("30300", {"artnr": "30300", "name": "Kabelschere"}, status=RecordStatus.PENDING)
+    db_session.add_all([knife, pending])
+    db_session.commit()
+
+    index = SuggestIndex()
+    index.ensure_loaded(db_session)
+
+    pending.status = RecordStatus.APPROVED
+    knife.data_json = {"artnr": "30200", "name": "Messer"}
+    index.sync_record(pending)
+    index.sync_record(knife)
+
+    assert [s.record_id for s in index.suggest("kabel")] == [pending.id]
+    assert [s.record_id for s in index.suggest("mess")] == [knife.id]
+
+    pending.status = RecordStatus.REJECTED
+    index.sync_record(pending)
+    assert index.suggest("kabel") == []
+
+
+def test_suggest_index_keeps_previous_contents_when_a_rebuild_fails(db_session):
+    knife = _record("30200", {"artnr": "30200", "name": "Kabelmesser"})
+    db_session.add(knife)
+    db_session.commit()
+
+    index = SuggestIndex()
+    index.ensure_loaded(db_session)
+
+    def rows():
+        yield _record("30201", {"artnr": "30201", "name": "Kabelschere"})
+        raise RuntimeError("connection lost")
+
+    query = SimpleNamespace(filter=lambda *criteria: SimpleNamespace(yield_per=lambda count: rows()))
+    with pytest.raises(RuntimeError):
+        index.rebuild(SimpleNamespace(query=lambda *columns: query))
+
+    assert [s.record_id for s in index.suggest("kabel")] == [knife.id]
+
+
+def test_suggest_endpoint_returns_completions(db_session, monkeypatch):
+    strip = _record("30199", {"artnr": "30199", "name": "Entmanteler PV-Strip Pro"})
+    db_session.add(strip)
+    db_session.commit()
+
+    index = SuggestIndex()
+    monkeypatch.setattr("app.api.search.get_suggest_index", lambda: index)
+
+    response = asyncio.run(suggest_knowledge(prefix="pv", department=Department.PRODUCT, limit=10, db=db_session))
+
+    assert response.prefix == "pv"
+    assert [(s.record_id, s.text, s.schema_type) for s in response.suggestions] == [
+        (strip.id, "Entmanteler PV-Strip Pro", "ProductSpec")
+    ]
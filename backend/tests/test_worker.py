@@ -1,6 +1,10 @@
-from app.models.job import JobStatus, JobType
+import asyncio
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.job import Job, JobStatus, JobType
 from app.services.jobs import JobService
-from app.worker import parse_job_types
+from app.worker import parse_job_types, process_job, run_concurrently
 
 
 def test_next_queued_returns_oldest_matching_job(db_session):
@@ -16,3 +20,50 @@ def test_next_queued_returns_oldest_matching_job(db_session):
 
 def test_parse_job_types_maps_cli_values():
     assert parse_job_types(["website_import"]) == [JobType.WEBSITE_IMPORT]
+
+
+def test_run_concurrently_overlaps_document_ingestion_jobs(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.ingestion.get_storage_service", lambda: object())
+    monkeypatch.setattr("app.worker.SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=db_session.get_bind()))
+    jobs = JobService(db_session)
+    document_ids = [f"00000000-0000-0000-0000-00000000000{index}" for index in range(4)]
+    for document_id in document_ids:
+        jobs.enqueue(JobType.DOCUMENT_INGESTION, {"document_id": document_id})
+
+    state = {"in_flight": 0, "max_in_flight": 0, "processed": []}
+
+    async def process_document_async(_service, document_id):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.05)
+        state["in_flight"] -= 1
+        state["processed"].append(str(document_id))
+
+    monkeypatch.setattr("app.worker.IngestionService.process_document_async", process_document_async)
+
+    processed = asyncio.run(run_concurrently("worker-1", None, concurrency=2))
+
+    assert processed == 4
+    assert state["max_in_flight"] == 2
+    assert sorted(state["processed"]) == document_ids
+    db_session.expire_all()
+    assert {job.status for job in db_session.query(Job).all()} == {JobStatus.SUCCEEDED}
+
+
+def test_process_job_marks_job_with_invalid_document_id_as_failed(db_session, monkeypatch):
+    monkeypatch.setattr("app.worker.SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=db_session.get_bind()))
+    job = JobService(db_session).enqueue(JobType.DOCUMENT_INGESTION, {"document_id": "kein-uuid"})
+
+    try:
+        process_job(Job(id=job.id), "worker-1")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an invalid document id must fail the job")
+
+    db_session.expire_all()
+    failed = db_session.get(Job, job.id)
+    assert failed.status == JobStatus.QUEUED
+    assert failed.locked_by is None
+    assert failed.error_message
+    assert failed.metrics_json is None